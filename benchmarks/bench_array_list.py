@@ -0,0 +1,51 @@
+"""
+Compare ArrayList bulk methods with NumPy backend and pure Python
+
+run: python -m benchmarks.bench_array_list [amount of items]
+"""
+import random
+import sys
+from time import perf_counter
+
+from data_structures.list import ArrayList, np
+
+OPERATIONS = {
+    'sum': lambda items, mask: items.sum(),
+    'min': lambda items, mask: items.min(),
+    'mean': lambda items, mask: items.mean(),
+    'count': lambda items, mask: items.count(7),
+    'index': lambda items, mask: items.index(-1),
+    'add list': lambda items, mask: items + items,
+    'mul scalar': lambda items, mask: items * 3,
+    'filter': lambda items, mask: items.filter(mask),
+    'sort': lambda items, mask: items.sort(),
+    'search_sorted': lambda items, mask: items.search_sorted(500),
+}
+
+
+def measure(items: ArrayList, mask: ArrayList, operation) -> float:
+    start = perf_counter()
+    operation(items, mask)
+    return perf_counter() - start
+
+
+def main(amount: int) -> None:
+    values = [random.randrange(1000) for _ in range(amount - 1)] + [-1]
+    mask = ArrayList('B', [value % 2 == 0 for value in values])
+    print(f'ArrayList of {amount} int64 items, seconds: python / numpy')
+    for name, operation in OPERATIONS.items():
+        timings = []
+        for use_numpy in (False, True):
+            if use_numpy and np is None:
+                timings.append(float('nan'))
+                continue
+            items = ArrayList('q', values)
+            items.use_numpy = use_numpy
+            timings.append(measure(items, mask, operation))
+        python, numpy = timings
+        print(f'{name:>14}: {python:8.4f} / {numpy:8.4f}'
+              f'  x{python / numpy:.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
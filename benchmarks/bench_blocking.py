@@ -0,0 +1,73 @@
+"""
+Items per second through BlockingQueue and BlockingDeque with
+N producer and M consumer threads, consumers take items one by one
+with remove() or in batches with drain()
+
+run: python -m benchmarks.bench_blocking [producers] [consumers] [items]
+"""
+import sys
+import threading
+from time import perf_counter
+
+from data_structures.blocking import BlockingDeque, BlockingQueue, QueueClosed
+
+MAXLENGTH = 1024
+BATCH = 256
+
+
+def one_by_one(queue) -> None:
+    while True:
+        try:
+            queue.remove()
+        except QueueClosed:
+            return
+
+
+def batches(queue) -> None:
+    while True:
+        try:
+            queue.drain(BATCH)
+        except QueueClosed:
+            return
+
+
+def measure(cls, consume, producers: int, consumers: int,
+            items: int) -> float:
+    """
+    return items per second
+    """
+    queue = cls(maxlength=MAXLENGTH)
+    share = items // producers
+
+    def produce():
+        put = queue.put
+        for item in range(share):
+            put(item)
+
+    producer_threads = [threading.Thread(target=produce)
+                        for _ in range(producers)]
+    consumer_threads = [threading.Thread(target=consume, args=(queue,))
+                        for _ in range(consumers)]
+    start = perf_counter()
+    for thread in producer_threads + consumer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    queue.close()
+    for thread in consumer_threads:
+        thread.join()
+    return share * producers / (perf_counter() - start)
+
+
+def main(producers: int, consumers: int, items: int) -> None:
+    print(f'{producers} producers, {consumers} consumers, {items} items, '
+          f'items per second')
+    for cls in (BlockingQueue, BlockingDeque):
+        for name, consume in (('remove', one_by_one), ('drain', batches)):
+            speed = measure(cls, consume, producers, consumers, items)
+            print(f'{cls.__name__:>14} {name:>7}: {speed:10.0f}')
+
+
+if __name__ == '__main__':
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(*(arguments + [4, 4, 200_000][len(arguments):]))
@@ -0,0 +1,40 @@
+"""
+Compare bulk load of a HashMap with from_items() against put() in a loop
+
+run: python -m benchmarks.bench_bulk_load [amount of keys]
+"""
+import sys
+from time import perf_counter
+
+from data_structures.hash_map import (
+    HashMapCompact, HashMapRobinHood, HashMapSeparateChaining
+)
+
+
+def load_with_put(test_class, items) -> float:
+    start = perf_counter()
+    hm = test_class()
+    for key, value in items:
+        hm.put(key, value)
+    return perf_counter() - start
+
+
+def load_with_from_items(test_class, items) -> float:
+    start = perf_counter()
+    test_class.from_items(items)
+    return perf_counter() - start
+
+
+def main(amount: int) -> None:
+    items = [(i, i) for i in range(amount)]
+    print(f'bulk load of {amount} keys, seconds: put loop / from_items')
+    for test_class in (HashMapSeparateChaining, HashMapRobinHood,
+                       HashMapCompact):
+        loop = load_with_put(test_class, items)
+        bulk = load_with_from_items(test_class, items)
+        print(f'{test_class.__name__:>24}: {loop:7.2f} / {bulk:7.2f}'
+              f'  x{loop / bulk:.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
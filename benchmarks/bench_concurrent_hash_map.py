@@ -0,0 +1,48 @@
+"""
+Measure ConcurrentHashMap throughput for different amount of threads,
+throughput grows with threads only on free-threaded Python builds
+
+run: python -m benchmarks.bench_concurrent_hash_map [operations per thread]
+"""
+import sys
+from threading import Thread
+from time import perf_counter
+
+from data_structures.concurrent_hash_map import ConcurrentHashMap
+
+
+def worker(hm: ConcurrentHashMap, offset: int, amount: int) -> None:
+    # 90% reads, 10% writes
+    for i in range(amount):
+        key = offset + i % 1000
+        if i % 10:
+            hm.get(key)
+        else:
+            hm[key] = i
+
+
+def throughput(threads_amount: int, amount: int) -> float:
+    """
+    return operations per second
+    """
+    hm = ConcurrentHashMap(shards=64)
+    threads = [Thread(target=worker, args=(hm, n * 1000, amount))
+               for n in range(threads_amount)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return threads_amount * amount / (perf_counter() - start)
+
+
+def main(amount: int) -> None:
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'GIL enabled: {gil}')
+    for threads_amount in (1, 2, 4, 8):
+        ops = throughput(threads_amount, amount)
+        print(f'{threads_amount} threads: {ops:12,.0f} ops/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,41 @@
+"""
+Compare lookups of absent keys in a plain HashMap and in FilteredMap
+
+run: python -m benchmarks.bench_filters [amount of keys]
+"""
+import sys
+from time import perf_counter
+
+from data_structures.filters import BloomFilter, CuckooFilter, FilteredMap
+from data_structures.hash_map import (
+    HashMapOpenAddressing, HashMapSeparateChaining
+)
+
+
+def misses(hash_map, keys) -> float:
+    start = perf_counter()
+    get = hash_map.get
+    for key in keys:
+        get(key)
+    return perf_counter() - start
+
+
+def main(amount: int) -> None:
+    present = [f'user:{i:012d}' for i in range(amount)]
+    absent = [f'user:{i:012d}' for i in range(amount, 2 * amount)]
+    print(f'{amount} lookups of absent keys, seconds')
+    for test_class, options in ((HashMapSeparateChaining, {'max_load': 4}),
+                                (HashMapOpenAddressing, {'max_load': 0.95})):
+        hm = test_class.from_items(((key, 1) for key in present), **options)
+        print(f'{test_class.__name__:>24} load {len(hm) / hm.size:.2f}:'
+              f' plain {misses(hm, absent):6.3f}', end='')
+        for filter_class in (BloomFilter, CuckooFilter):
+            fm = FilteredMap(hm, filter_class, capacity=amount)
+            print(f'  {filter_class.__name__} {misses(fm, absent):6.3f}'
+                  f' ({fm.filter.stats()["bits_per_key"]:.1f} bits/key)',
+                  end='')
+        print()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
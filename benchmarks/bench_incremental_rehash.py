@@ -0,0 +1,44 @@
+"""
+Compare per-insert latency of stop-the-world and incremental rehashing
+
+run: python -m benchmarks.bench_incremental_rehash [amount of keys]
+"""
+import gc
+import sys
+from time import perf_counter
+
+from data_structures.hash_map import (
+    HashMapIncremental, HashMapSeparateChaining
+)
+
+
+def insert_latency(hm, amount: int) -> tuple:
+    """
+    return (worst, 99th percentile, mean) insert time in microseconds,
+    garbage collector is disabled like timeit does to not measure its pauses
+    """
+    timings = []
+    gc.disable()
+    try:
+        for key in range(amount):
+            start = perf_counter()
+            hm[key] = key
+            timings.append(perf_counter() - start)
+    finally:
+        gc.enable()
+    timings.sort()
+    return (timings[-1] * 1e6,
+            timings[int(len(timings) * 0.99)] * 1e6,
+            sum(timings) / len(timings) * 1e6)
+
+
+def main(amount: int) -> None:
+    print(f'{amount} inserts, microseconds: worst / p99 / mean')
+    for name, hm in [('stop-the-world', HashMapSeparateChaining()),
+                     ('incremental', HashMapIncremental())]:
+        worst, p99, mean = insert_latency(hm, amount)
+        print(f'{name:>15}: {worst:10.1f} / {p99:6.2f} / {mean:6.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,87 @@
+"""
+Compare positional operations of IndexedList, ArrayList and LinkedList:
+microseconds per random insert, get and pop on sequences of n items
+(LinkedList has insert only, it walks the list, so it does less steps)
+
+The build of millions of nodes is also timed with cyclic GC paused:
+nodes make no cycles, so a caller may wrap a big build in gc.disable()
+and gc.freeze() the result, later GC passes skip frozen objects
+
+run: python -m benchmarks.bench_indexed_list [n ...]
+"""
+import gc
+import random
+import sys
+from time import perf_counter
+
+from data_structures.indexed_list import IndexedList
+from data_structures.list import ArrayList, LinkedList
+
+STEPS = 2000
+LINKED_STEPS = 20
+
+
+def measure(operation, indexes) -> float:
+    """
+    return microseconds per operation call
+    """
+    start = perf_counter()
+    for index in indexes:
+        operation(index)
+    return (perf_counter() - start) / len(indexes) * 1e6
+
+
+def build_indexed_list(amount: int, pause_gc: bool) -> tuple:
+    """
+    return IndexedList of 'amount' items and seconds the build took,
+    'pause_gc' shows the opt-in of the caller: GC is disabled during
+    the build and the nodes are frozen after it
+    """
+    start = perf_counter()
+    if not pause_gc:
+        return IndexedList(range(amount)), perf_counter() - start
+    gc.disable()
+    try:
+        indexed = IndexedList(range(amount))
+    finally:
+        gc.enable()
+    gc.freeze()
+    return indexed, perf_counter() - start
+
+
+def build_linked_list(amount: int) -> LinkedList:
+    linked_list = LinkedList()
+    for item in range(amount):
+        linked_list.add_back(item)
+    return linked_list
+
+
+def main(sizes: list) -> None:
+    rng = random.Random(1)
+    print('microseconds per operation: insert / get / pop')
+    for amount in sizes:
+        indexes = [rng.randrange(amount) for _ in range(STEPS)]
+        indexed, build = build_indexed_list(amount, pause_gc=False)
+        del indexed
+        gc.collect()
+        indexed, paused_build = build_indexed_list(amount, pause_gc=True)
+        array_list = ArrayList('q', range(amount))
+        gc.collect()  # don't time the first full pass over new nodes
+        for name, sequence in (('IndexedList', indexed),
+                               ('ArrayList', array_list)):
+            insert = measure(lambda i: sequence.insert(i, i), indexes)
+            get = measure(sequence.__getitem__, indexes)
+            pop = measure(sequence.pop, indexes)
+            print(f'n={amount:>9} {name:>12}: '
+                  f'{insert:8.2f} / {get:8.2f} / {pop:8.2f}')
+        linked_list = build_linked_list(amount)
+        insert = measure(lambda i: linked_list.insert(i, i),
+                         indexes[:LINKED_STEPS])
+        print(f'n={amount:>9} {"LinkedList":>12}: {insert:8.2f}')
+        print(f'n={amount:>9} IndexedList build: {build:.2f} s, '
+              f'with GC paused: {paused_build:.2f} s')
+        gc.unfreeze()
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or [10 ** 5, 10 ** 6])
@@ -0,0 +1,42 @@
+"""
+Measure batch lookups of IntHashMap against single key lookups
+of HashMapOpenAddressing
+
+run: python -m benchmarks.bench_int_hash_map [amount of keys]
+"""
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from data_structures.hash_map import HashMapOpenAddressing
+from data_structures.int_hash_map import IntHashMap
+
+
+def main(amount: int) -> None:
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 2 ** 62, amount)
+    query = rng.choice(keys, amount)
+
+    start = perf_counter()
+    hm = IntHashMap.from_arrays(keys, np.arange(amount))
+    build = perf_counter() - start
+    start = perf_counter()
+    hm.get_many(query)
+    batch = perf_counter() - start
+    print(f'IntHashMap: put_many {amount / build:14,.0f} keys/s, '
+          f'get_many {amount / batch:14,.0f} lookups/s')
+
+    sample = query[:100_000].tolist()
+    reference = HashMapOpenAddressing.from_items(
+        (key, 0) for key in keys[:100_000].tolist())
+    start = perf_counter()
+    for key in sample:
+        reference.get(key)
+    single = perf_counter() - start
+    print(f'HashMapOpenAddressing: get {len(sample) / single:14,.0f} '
+          'lookups/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
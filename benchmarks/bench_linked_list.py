@@ -0,0 +1,97 @@
+"""
+Compare linked lists before and after tail pointer and __slots__ items
+and unrolled (blocked) lists: memory per item, add_back throughput
+and iteration time
+
+run: python -m benchmarks.bench_linked_list [amount of items]
+"""
+import sys
+import tracemalloc
+from functools import partial
+from time import perf_counter
+
+from data_structures.list import (
+    DoublyLinkedList, LinkedList, UnrolledLinkedList
+)
+
+LEGACY_LIMIT = 20000  # legacy add_back is O(n), keep it short
+
+
+class LegacyItem:
+    """
+    linked list item with __dict__, as it was before __slots__
+    """
+    def __init__(self, data) -> None:
+        self.data = data
+        self.link = None
+
+
+class LegacyLinkedList:
+    """
+    linked list without tail pointer, add_back walks the whole list
+    """
+    def __init__(self) -> None:
+        self._head = None
+
+    def add_back(self, item) -> None:
+        new_tail = LegacyItem(item)
+        if self._head is None:
+            self._head = new_tail
+            return
+        pointer = self._head
+        while pointer.link:
+            pointer = pointer.link
+        pointer.link = new_tail
+
+
+def bytes_per_item(factory, amount: int) -> float:
+    tracemalloc.start()
+    linked_list = factory()
+    for item in range(amount):
+        linked_list.add_back(item)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / amount
+
+
+def appends_per_second(factory, amount: int) -> tuple:
+    """
+    return appends per second and the filled list
+    """
+    linked_list = factory()
+    add_back = linked_list.add_back
+    start = perf_counter()
+    for item in range(amount):
+        add_back(item)
+    return amount / (perf_counter() - start), linked_list
+
+
+def iteration_time(linked_list) -> float:
+    if not hasattr(linked_list, '__iter__'):
+        return float('nan')
+    start = perf_counter()
+    for _ in linked_list:
+        pass
+    return perf_counter() - start
+
+
+def main(amount: int) -> None:
+    legacy = min(amount, LEGACY_LIMIT)
+    print(f'add_back of {amount} ints (legacy: {legacy})')
+    print(f'{"":>18}  bytes/item  appends/s  iteration s')
+    factories = {
+        'legacy': (LegacyLinkedList, legacy),
+        'LinkedList': (LinkedList, amount),
+        'DoublyLinkedList': (DoublyLinkedList, amount),
+        'Unrolled list': (UnrolledLinkedList, amount),
+        'Unrolled q': (partial(UnrolledLinkedList, 'q'), amount),
+    }
+    for name, (factory, count) in factories.items():
+        memory = bytes_per_item(factory, min(count, 10000))
+        speed, linked_list = appends_per_second(factory, count)
+        seconds = iteration_time(linked_list)
+        print(f'{name:>18}: {memory:10.1f} {speed:10.0f} {seconds:12.4f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
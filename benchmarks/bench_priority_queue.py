@@ -0,0 +1,77 @@
+"""
+Compare PriorityQueue on d-ary heap with the former list scanning
+implementation and with plain heapq: seconds to put n random items
+and remove them all (legacy queue is O(n) per remove, so it gets
+at most LEGACY_LIMIT items)
+
+run: python -m benchmarks.bench_priority_queue [amount of items]
+"""
+import heapq
+import random
+import sys
+from time import perf_counter
+
+from data_structures.my_queue import PriorityQueue
+
+LEGACY_LIMIT = 20000
+
+
+class LegacyPriorityQueue:
+    """
+    list with min() scan on every remove, as it was before the heap
+    """
+    def __init__(self) -> None:
+        self._data = []
+
+    def put(self, item) -> None:
+        self._data.append(item)
+
+    def remove(self):
+        value = min(self._data)
+        self._data.remove(value)
+        return value
+
+
+class HeapqQueue:
+    """
+    heapq functions on a list, the lower bound for a Python heap
+    """
+    def __init__(self) -> None:
+        self._data = []
+
+    def put(self, item) -> None:
+        heapq.heappush(self._data, item)
+
+    def remove(self):
+        return heapq.heappop(self._data)
+
+
+def measure(queue, items: list) -> float:
+    put, remove = queue.put, queue.remove
+    start = perf_counter()
+    for item in items:
+        put(item)
+    for _ in items:
+        remove()
+    return perf_counter() - start
+
+
+def main(amount: int) -> None:
+    items = [random.random() for _ in range(amount)]
+    legacy = items[:LEGACY_LIMIT]
+    print(f'put + remove of {amount} floats, seconds')
+    print(f'{"legacy":>16} ({len(legacy)}): '
+          f'{measure(LegacyPriorityQueue(), legacy):8.3f}')
+    print(f'{"heap d=4":>16} ({len(legacy)}): '
+          f'{measure(PriorityQueue(), legacy):8.3f}')
+    for d in (2, 4, 8):
+        elapsed = measure(PriorityQueue(d=d), items)
+        print(f'{f"heap d={d}":>16}: {elapsed:8.3f}')
+    print(f'{"heapq":>16}: {measure(HeapqQueue(), items):8.3f}')
+    start = perf_counter()
+    PriorityQueue(items)
+    print(f'{"heapify":>16}: {perf_counter() - start:8.3f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
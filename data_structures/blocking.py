@@ -0,0 +1,201 @@
+"""
+Thread-safe blocking Queue and Deque for producer/consumer workers
+
+One lock guards the container, two condition variables on it wake
+consumers when items arrive (not_empty) and producers when room
+appears (not_full). Full container blocks producers (backpressure)
+instead of raising BufferError. drain() takes a batch of items under
+a single lock acquisition. close() wakes all waiters: producers get
+QueueClosed at once, consumers get the remaining items first
+"""
+from threading import Condition, Lock
+from typing import Any, Callable
+
+from data_structures.list import Deque
+from data_structures.my_queue import Queue
+
+
+class QueueClosed(Exception):
+    """
+    raised by put to closed queue and by remove from closed empty queue
+    """
+
+
+class _Blocking:
+    """
+    Blocking wrapper of the container, subclasses provide
+    _push, _pop and _take operations of the container
+    :param container: Queue or Deque without maxlength
+    :param maxlength: optional, integer, producers wait while
+        the container has that many items
+    :return: None
+    """
+    def __init__(self, container, maxlength=None) -> None:
+        self._container = container
+        self.maxlength = maxlength
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+        self._closed = False
+
+    def _has_room(self) -> bool:
+        return self._closed or not self.maxlength or \
+            len(self._container) < self.maxlength
+
+    def _has_items(self) -> bool:
+        return self._closed or len(self._container) > 0
+
+    def _put(self, item, timeout: float | None,
+             push: Callable[[Any], None]) -> None:
+        with self._not_full:
+            if not self._not_full.wait_for(self._has_room, timeout):
+                raise TimeoutError(
+                    f'{type(self).__name__}: put timed out')
+            if self._closed:
+                raise QueueClosed(f'{type(self).__name__}: is closed')
+            push(item)
+            self._not_empty.notify()
+
+    def _remove(self, timeout: float | None, pop: Callable[[], Any]) -> Any:
+        with self._not_empty:
+            if not self._not_empty.wait_for(self._has_items, timeout):
+                raise TimeoutError(
+                    f'{type(self).__name__}: remove timed out')
+            if not len(self._container):
+                raise QueueClosed(f'{type(self).__name__}: is closed')
+            item = pop()
+            self._not_full.notify()
+            return item
+
+    def put(self, item, timeout: float | None = None) -> None:
+        """
+        put item to back, wait while the container is full,
+        raise TimeoutError after 'timeout' seconds of waiting
+        and QueueClosed if it's closed
+        """
+        self._put(item, timeout, self._push)
+
+    def remove(self, timeout: float | None = None) -> Any:
+        """
+        remove item from front and return it, wait while there are
+        no items, raise TimeoutError after 'timeout' seconds of waiting
+        and QueueClosed if it's closed and empty
+        """
+        return self._remove(timeout, self._pop)
+
+    def try_put(self, item) -> bool:
+        """
+        put item to back if there is room, return whether it was put,
+        raise QueueClosed if it's closed
+        """
+        with self._lock:
+            if self._closed:
+                raise QueueClosed(f'{type(self).__name__}: is closed')
+            if not self._has_room():
+                return False
+            self._push(item)
+            self._not_empty.notify()
+            return True
+
+    def try_remove(self, default=None) -> Any:
+        """
+        remove item from front and return it,
+        return 'default' if there are no items
+        """
+        with self._lock:
+            if not len(self._container):
+                return default
+            item = self._pop()
+            self._not_full.notify()
+            return item
+
+    def drain(self, max_items: int | None = None,
+              timeout: float | None = None) -> list:
+        """
+        remove up to 'max_items' (all by default) items from front
+        under one lock acquisition and return list of them; wait for
+        the first item up to 'timeout' seconds, return empty list
+        if none came, raise QueueClosed if it's closed and empty
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(self._has_items, timeout):
+                return []
+            length = len(self._container)
+            if not length:
+                raise QueueClosed(f'{type(self).__name__}: is closed')
+            if max_items is None or max_items > length:
+                max_items = length
+            items = self._take(max_items)
+            self._not_full.notify(len(items))
+            return items
+
+    def close(self) -> None:
+        """
+        close the container and wake all waiting threads
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._container)
+
+    def __bool__(self) -> bool:
+        return len(self._container) > 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BlockingQueue(_Blocking):
+    """
+    Thread-safe FIFO Queue with blocking put and remove
+    :param initializer: optional, iterable
+    :param maxlength: optional, integer
+    :return: None
+    """
+    def __init__(self, initializer=None, maxlength=None) -> None:
+        super().__init__(Queue(initializer), maxlength)
+        self._push = self._container.put
+        self._pop = self._container.remove
+
+    def _take(self, amount: int) -> list:
+        return self._container.remove_many(amount)
+
+
+class BlockingDeque(_Blocking):
+    """
+    Thread-safe Deque with blocking operations on both ends,
+    put and remove work as FIFO queue
+    :param initializer: optional, iterable
+    :param maxlength: optional, integer
+    :return: None
+    """
+    def __init__(self, initializer=None, maxlength=None) -> None:
+        super().__init__(Deque(initializer), maxlength)
+        self._push = self._container.add_back
+        self._pop = self._container.pop_front
+
+    def _take(self, amount: int) -> list:
+        return self._container.pop_many(amount)
+
+    def put_front(self, item, timeout: float | None = None) -> None:
+        """
+        put item to front, wait while the deque is full
+        """
+        self._put(item, timeout, self._container.add_front)
+
+    def remove_back(self, timeout: float | None = None) -> Any:
+        """
+        remove item from back and return it, wait while there are
+        no items
+        """
+        return self._remove(timeout, self._container.pop_back)
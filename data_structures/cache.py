@@ -0,0 +1,337 @@
+"""
+Bounded cache type implementation on top of the HashMap types
+"""
+import sys
+from functools import wraps
+from time import monotonic
+from typing import Any, Callable
+
+from data_structures.hash_map import HashMapSeparateChaining
+
+_MISSING = object()
+_KWD_MARK = object()
+
+
+class CacheNode:
+    """
+    Cache entry, also a node of the intrusive doubly linked list
+    """
+    __slots__ = ('key', 'value', 'size', 'expires', 'frequency',
+                 'prev', 'next')
+
+    def __init__(self, key=None, value=None, size=0, expires=None) -> None:
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires  # monotonic time, None - never expires
+        self.frequency = 1
+        self.prev = self  # empty list: sentinel links to itself
+        self.next = self
+
+
+class NodeList:
+    """
+    Intrusive doubly linked list of CacheNode with a sentinel node,
+    all operations are O(1)
+    """
+    def __init__(self) -> None:
+        self._root = CacheNode()
+        self._length = 0
+
+    def append(self, node: CacheNode) -> None:
+        """
+        add node to the back of the list
+        """
+        last = self._root.prev
+        node.prev, node.next = last, self._root
+        last.next = node
+        self._root.prev = node
+        self._length += 1
+
+    def remove(self, node: CacheNode) -> None:
+        """
+        unlink node from the list
+        """
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = node
+        self._length -= 1
+
+    def first(self) -> CacheNode:
+        """
+        return front node of the list
+        """
+        if not self._length:
+            raise IndexError('NodeList: is empty')
+        return self._root.next
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class FIFOPolicy:
+    """
+    Evict the oldest inserted entry, reads don't change the order
+    """
+    def __init__(self) -> None:
+        self._nodes = NodeList()
+
+    def insert(self, node: CacheNode) -> None:
+        self._nodes.append(node)
+
+    def touch(self, node: CacheNode) -> None:
+        pass
+
+    def remove(self, node: CacheNode) -> None:
+        self._nodes.remove(node)
+
+    def victim(self) -> CacheNode:
+        return self._nodes.first()
+
+
+class LRUPolicy(FIFOPolicy):
+    """
+    Evict the least recently used entry
+    """
+    def touch(self, node: CacheNode) -> None:
+        self._nodes.remove(node)
+        self._nodes.append(node)
+
+
+class LFUPolicy:
+    """
+    Evict the least frequently used entry (the least recently used one
+    among entries with the same frequency), O(1) frequency lists
+    """
+    def __init__(self) -> None:
+        self._lists = {}  # frequency -> NodeList
+        self._min_frequency = 0
+
+    def _link(self, node: CacheNode) -> None:
+        nodes = self._lists.get(node.frequency)
+        if nodes is None:
+            nodes = self._lists[node.frequency] = NodeList()
+        nodes.append(node)
+
+    def _unlink(self, node: CacheNode) -> None:
+        nodes = self._lists[node.frequency]
+        nodes.remove(node)
+        if not nodes:
+            del self._lists[node.frequency]
+
+    def insert(self, node: CacheNode) -> None:
+        node.frequency = 1
+        self._link(node)
+        self._min_frequency = 1
+
+    def touch(self, node: CacheNode) -> None:
+        self._unlink(node)
+        if (node.frequency == self._min_frequency
+                and node.frequency not in self._lists):
+            self._min_frequency += 1
+        node.frequency += 1
+        self._link(node)
+
+    def remove(self, node: CacheNode) -> None:
+        self._unlink(node)
+
+    def victim(self) -> CacheNode:
+        if self._min_frequency not in self._lists:
+            # the least frequent entries were removed explicitly
+            self._min_frequency = min(self._lists, default=0)
+        if not self._lists:
+            raise IndexError('LFUPolicy: is empty')
+        return self._lists[self._min_frequency].first()
+
+
+POLICIES = {'lru': LRUPolicy, 'lfu': LFUPolicy, 'fifo': FIFOPolicy}
+
+
+def entry_size(key, value) -> int:
+    """
+    default size of the entry in bytes
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class Cache:
+    """
+    Bounded cache: HashMap of keys to CacheNode plus eviction policy
+    keeping nodes in intrusive linked lists, so get, put and eviction
+    are O(1)
+    :param max_entries: optional, integer, maximum amount of entries
+    :param max_bytes: optional, integer, maximum total size of entries
+    :param ttl: optional, float, default time to live in seconds
+    :param policy: 'lru'|'lfu'|'fifo' or policy object, by default='lru'
+    :param map_class: HashMap class used as index
+    :param size_func: function (key, value) -> entry size in bytes
+    :param clock: function returning current time in seconds
+    :return: None
+    """
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None,
+                 policy='lru', map_class=HashMapSeparateChaining,
+                 size_func: Callable[[Any, Any], int] = entry_size,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        if isinstance(policy, str):
+            policy = POLICIES[policy]()
+        self._policy = policy
+        self._map = map_class()
+        self._size_func = size_func
+        self._clock = clock
+        self._length = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, node: CacheNode) -> None:
+        self._map.pop(node.key)
+        self._policy.remove(node)
+        self._length -= 1
+        self.bytes -= node.size
+
+    def _lookup(self, key) -> CacheNode | None:
+        """
+        return live node for the key, expired node is removed
+        """
+        node = self._map.get(key)
+        if (node is not None and node.expires is not None
+                and node.expires <= self._clock()):
+            self._remove(node)
+            self.expirations += 1
+            node = None
+        return node
+
+    def _evict(self, size: int) -> None:
+        """
+        evict entries until there is space for one more entry of 'size'
+        """
+        while self._length and (
+                (self.max_entries is not None
+                 and self._length >= self.max_entries)
+                or (self.max_bytes is not None
+                    and self.bytes + size > self.max_bytes)):
+            self._remove(self._policy.victim())
+            self.evictions += 1
+
+    def get(self, key, default=None) -> Any:
+        """
+        return value for the provided key,
+        return 'default' if there is no value for key
+        """
+        node = self._lookup(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._policy.touch(node)
+        return node.value
+
+    def put(self, key, value, ttl=None) -> None:
+        """
+        set value for the provided key, evict entries if cache is full,
+        overwriting the key starts a new entry
+        :param ttl: optional, time to live of the entry in seconds,
+            cache ttl is used by default
+        """
+        node = self._lookup(key)
+        if node is not None:
+            self._remove(node)
+        size = self._size_func(key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # entry never fits, don't flush the whole cache
+        if self.max_entries == 0:
+            return
+        self._evict(size)
+        ttl = self.ttl if ttl is None else ttl
+        node = CacheNode(key, value, size,
+                         None if ttl is None else self._clock() + ttl)
+        self._map[key] = node
+        self._policy.insert(node)
+        self._length += 1
+        self.bytes += size
+
+    def pop(self, key, default=None) -> Any:
+        """
+        remove entry for the provided key and return its value,
+        return 'default' if there is no value for key
+        """
+        node = self._lookup(key)
+        if node is None:
+            return default
+        self._remove(node)
+        return node.value
+
+    def stats(self) -> dict:
+        """
+        return dict of cache counters
+        """
+        return {
+            'entries': self._length,
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def __getitem__(self, key) -> Any:
+        """
+        return value for the provided key,
+        raise KeyError if there is no value for key
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self.put(key, value)
+
+    def __contains__(self, key) -> bool:
+        """
+        return true if there is live entry for the key,
+        doesn't change hit/miss counters and entry order
+        """
+        return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        """
+        return amount of entries, expired ones are counted
+        until they are accessed
+        """
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+
+def memoize(cache: Cache | None = None, **cache_kwargs):
+    """
+    Decorator caching function results in the Cache
+    :param cache: optional, Cache object, new one is created by default
+    :param cache_kwargs: arguments of the Cache constructor
+    usage:
+        @memoize(max_entries=1000, ttl=60)
+        def load(user_id): ...
+    """
+    if cache is None:
+        cache = Cache(**cache_kwargs)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + (_KWD_MARK,) + tuple(sorted(kwargs.items())) \
+                if kwargs else args
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,276 @@
+"""
+Thread-safe sharded HashMap type implementation
+"""
+from threading import Lock
+from typing import Any, Callable
+
+from data_structures.hash_map import HashMapSeparateChaining
+from data_structures.hashing import DEFAULT_HASH, HashFunc, mix64
+
+_MISSING = object()
+
+
+class ConcurrentHashMap:
+    """
+    Thread-safe HashMap: keys are split over independent shards,
+    every shard has its own lock (lock striping), so writers of
+    different shards don't wait for each other and every resize
+    touches only one shard.
+    Reads don't take a lock: shard version is checked before and after
+    the read (seqlock), the read is repeated under the lock only when
+    a writer changed the shard meanwhile. Shards whose lookups change
+    the table (HashMapIncremental migrates buckets) are always read
+    under the lock
+    :param shards: int, amount of shards, by default=16
+    :param size: int, initial size of every shard
+    :param hash_func: hash strategy, builtin hash() by default
+    :param shard_class: HashMap class used for shards
+    :return: None
+    """
+    def __init__(self, shards=16, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 shard_class=HashMapSeparateChaining) -> None:
+        self.hash_func = hash_func
+        self._shards = [shard_class(size, hash_func) for _ in range(shards)]
+        self._locked_reads = shard_class._mutating_reads
+        self._locks = [Lock() for _ in range(shards)]
+        # odd version means that writer is changing the shard right now
+        self._versions = [0] * shards
+        self._counts = [0] * shards
+
+    def _shard_index(self, key) -> int:
+        return mix64(self.hash_func(key)) % len(self._shards)
+
+    def _read(self, index: int, key) -> Any:
+        """
+        return value for the key from the shard, _MISSING if there is none
+        """
+        shard = self._shards[index]
+        version = self._versions[index]
+        if not version & 1 and not self._locked_reads:
+            try:
+                value = shard.get(key, _MISSING)
+            except Exception:
+                # torn read of a shard in the middle of resize
+                value = _MISSING
+                version = -1
+            if self._versions[index] == version:
+                return value
+        with self._locks[index]:
+            return shard.get(key, _MISSING)
+
+    def _write(self, index: int, key, value) -> Any:
+        """
+        set value for the key, caller holds the shard lock
+        return previous value, _MISSING if there was none
+        """
+        shard = self._shards[index]
+        self._versions[index] += 1
+        try:
+            previous = shard.get(key, _MISSING)
+            shard[key] = value
+        finally:
+            self._versions[index] += 1
+        if previous is _MISSING:
+            self._counts[index] += 1
+        return previous
+
+    def _delete(self, index: int, key) -> tuple | None:
+        """
+        pop the key from the shard, caller holds the shard lock
+        """
+        self._versions[index] += 1
+        try:
+            element = self._shards[index].pop(key)
+        finally:
+            self._versions[index] += 1
+        if element is not None:
+            self._counts[index] -= 1
+        return element
+
+    def get(self, key, default=None) -> Any:
+        """
+        return value for the provided key,
+        return 'default' if there is no value for key
+        """
+        value = self._read(self._shard_index(key), key)
+        return default if value is _MISSING else value
+
+    def put(self, key, item) -> Any:
+        """
+        set value for the provided key
+        returns value of the previous value if exists, None otherwise
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            previous = self._write(index, key, item)
+        return None if previous is _MISSING else previous
+
+    def pop(self, key) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            return self._delete(index, key)
+
+    def _group(self, keys) -> dict:
+        """
+        return {shard index: [(position, key), ...]} for the keys
+        """
+        groups = {}
+        shard_index = self._shard_index
+        for position, key in enumerate(keys):
+            groups.setdefault(shard_index(key), []).append((position, key))
+        return groups
+
+    def get_many(self, keys, default=None) -> list:
+        """
+        return list of values for the provided keys,
+        'default' for keys without value
+        """
+        keys = list(keys)
+        result = [default] * len(keys)
+        for index, group in self._group(keys).items():
+            with self._locks[index]:
+                get = self._shards[index].get
+                for position, key in group:
+                    result[position] = get(key, default)
+        return result
+
+    def put_many(self, items) -> list:
+        """
+        set values for all (key, value) items, every shard lock is taken
+        once for the whole batch
+        returns list of previous values (None for new keys)
+        """
+        items = list(items)
+        result = [None] * len(items)
+        groups = self._group(key for key, _ in items)
+        for index, group in groups.items():
+            with self._locks[index]:
+                self._versions[index] += 1
+                try:
+                    self._shards[index].reserve(
+                        self._counts[index] + len(group))
+                finally:
+                    self._versions[index] += 1
+                for position, key in group:
+                    previous = self._write(index, key, items[position][1])
+                    if previous is not _MISSING:
+                        result[position] = previous
+        return result
+
+    def update(self, items) -> None:
+        """
+        set values for all (key, value) items or items of other map
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        self.put_many(items)
+
+    def pop_many(self, keys) -> list:
+        """
+        pop all the provided keys, return list of popped elements
+        """
+        keys = list(keys)
+        result = [None] * len(keys)
+        for index, group in self._group(keys).items():
+            with self._locks[index]:
+                for position, key in group:
+                    result[position] = self._delete(index, key)
+        return result
+
+    def compute_if_absent(self, key, factory: Callable[[Any], Any]) -> Any:
+        """
+        return value for the key, if there is no value
+        set factory(key) atomically and return it
+        """
+        index = self._shard_index(key)
+        value = self._read(index, key)
+        if value is not _MISSING:
+            return value
+        with self._locks[index]:
+            value = self._shards[index].get(key, _MISSING)
+            if value is _MISSING:
+                value = factory(key)
+                self._write(index, key, value)
+        return value
+
+    def merge(self, key, value,
+              func: Callable[[Any, Any], Any]) -> Any:
+        """
+        atomically set value for absent key or func(old value, value)
+        for existing one, the key is removed if func returns None
+        return new value
+        """
+        index = self._shard_index(key)
+        with self._locks[index]:
+            old = self._shards[index].get(key, _MISSING)
+            if old is not _MISSING:
+                value = func(old, value)
+            if value is None:
+                self._delete(index, key)
+            else:
+                self._write(index, key, value)
+        return value
+
+    def __getitem__(self, key) -> Any:
+        """
+        return value for the provided key,
+        raise KeyError if there is no value for key
+        """
+        value = self._read(self._shard_index(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        """
+        set value for the provided key
+        """
+        self.put(key, value)
+
+    def __contains__(self, key) -> bool:
+        return self._read(self._shard_index(key), key) is not _MISSING
+
+    def __len__(self) -> int:
+        """
+        return amount of items, shards aren't locked,
+        so the result is a snapshot under concurrent writes
+        """
+        return sum(self._counts)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def _shard_items(self, index: int) -> list:
+        with self._locks[index]:
+            return list(self._shards[index].items())
+
+    def items(self):
+        """
+        return iterator over (key,value) tuples, every shard is copied
+        under its own lock, never the whole map at once
+        """
+        for index in range(len(self._shards)):
+            yield from self._shard_items(index)
+
+    def keys(self):
+        """
+        return iterator over map keys
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        return iterator over map values
+        """
+        for _, value in self.items():
+            yield value
+
+    def __iter__(self):
+        return self.keys()
+
+    def __str__(self) -> str:
+        return str(dict(self.items()))
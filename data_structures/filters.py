@@ -0,0 +1,411 @@
+"""
+Probabilistic membership filters and HashMap front layer
+
+A filter answers 'key may be present' or 'key is absent for sure',
+so a lookup of an absent key is usually rejected without touching
+the map: no chain scan, no probe sequence walk.
+"""
+import math
+from array import array
+from random import Random
+from typing import Any
+
+from data_structures.hash_map import HashMapSeparateChaining, table_size
+from data_structures.hashing import DEFAULT_HASH, HashFunc, mix64
+
+_MISSING = object()
+
+
+class BloomFilter:
+    """
+    Bit array Bloom filter with k bit positions per key computed
+    by double hashing from halves of one 64 bit hash,
+    keys can't be removed
+    :param capacity: int, expected amount of keys
+    :param error_rate: float, false positive rate at full capacity
+    :param hash_func: hash strategy, builtin hash() by default
+    :return: None
+    """
+    def __init__(self, capacity=1024, error_rate=0.01,
+                 hash_func: HashFunc = DEFAULT_HASH) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError('BloomFilter: error_rate must be in (0, 1)')
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.hash_func = hash_func
+        bits = -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        self.bits = max(8, math.ceil(bits / 8) * 8)
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self._array = bytearray(self.bits // 8)
+        self._length = 0
+
+    def _positions(self, key) -> list:
+        item_hash = mix64(self.hash_func(key))
+        position, step = item_hash & 0xffffffff, item_hash >> 32 | 1
+        bits = self.bits
+        return [(position + i * step) % bits for i in range(self.hashes)]
+
+    def add(self, key) -> None:
+        """
+        add the key to the filter
+        """
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self._length += 1
+
+    def __contains__(self, key) -> bool:
+        """
+        return False if the key was never added,
+        true if it was added or on false positive
+        """
+        item_hash = mix64(self.hash_func(key))
+        position, step = item_hash & 0xffffffff, item_hash >> 32 | 1
+        bits = self.bits
+        data = self._array
+        for _ in range(self.hashes):
+            position %= bits
+            if not data[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+        return True
+
+    def __len__(self) -> int:
+        """
+        return amount of add() calls
+        """
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._array)
+
+    def estimated_error_rate(self) -> float:
+        """
+        return expected false positive rate for the current amount of keys
+        """
+        return (1 - math.exp(-self.hashes * self._length / self.bits)) \
+            ** self.hashes
+
+    def stats(self) -> dict:
+        """
+        return dict with sizing of the filter,
+        'bits_per_key' is memory per key at full capacity
+        """
+        return {
+            'capacity': self.capacity,
+            'keys': self._length,
+            'nbytes': self.nbytes,
+            'bits_per_key': 8 * self.nbytes / self.capacity,
+            'error_rate': self.error_rate,
+            'estimated_error_rate': self.estimated_error_rate(),
+        }
+
+
+class CuckooFilter:
+    """
+    Cuckoo filter: buckets of 4 fingerprints, every key has two
+    candidate buckets (partial-key cuckoo hashing), so keys can be
+    removed. Fingerprint which can't be placed after 'max_kicks'
+    relocations is kept aside, next add() to such filter fails
+    :param capacity: int, expected amount of keys
+    :param error_rate: float, false positive rate at full capacity
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_kicks: int, relocations tried by add() on full buckets
+    :param seed: optional, seed of the relocation victims choice
+    :return: None
+    """
+    bucket_size = 4
+
+    def __init__(self, capacity=1024, error_rate=0.01,
+                 hash_func: HashFunc = DEFAULT_HASH, max_kicks=500,
+                 seed=None) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError('CuckooFilter: error_rate must be in (0, 1)')
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.hash_func = hash_func
+        self.max_kicks = max_kicks
+        fingerprint_bits = math.ceil(
+            math.log2(2 * self.bucket_size / error_rate))
+        self.fingerprint_bits = min(fingerprint_bits, 32)
+        self._fingerprint_mask = (1 << self.fingerprint_bits) - 1
+        # buckets are filled up to 95% at full capacity
+        self.buckets = table_size(
+            math.ceil(self.capacity / (self.bucket_size * 0.95)))
+        self._mask = self.buckets - 1
+        typecode = 'B' if self.fingerprint_bits <= 8 else \
+            'H' if self.fingerprint_bits <= 16 else 'I'
+        self._table = array(typecode, [0]) * (self.buckets
+                                              * self.bucket_size)
+        self._victim = None  # (bucket, fingerprint) which didn't fit
+        self._random = Random(seed)
+        self._length = 0
+
+    def _locate(self, key) -> tuple:
+        """
+        return (fingerprint, first bucket, second bucket) of the key,
+        0 fingerprint marks empty slot, so it's never used
+        """
+        item_hash = mix64(self.hash_func(key))
+        fingerprint = (item_hash >> 32) & self._fingerprint_mask or 1
+        first = item_hash & self._mask
+        return fingerprint, first, self._alternate(first, fingerprint)
+
+    def _alternate(self, bucket: int, fingerprint: int) -> int:
+        # multiplicative hash of the fingerprint (MurmurHash2 constant)
+        return (bucket ^ fingerprint * 0x5bd1e995) & self._mask
+
+    def _put(self, bucket: int, fingerprint: int) -> bool:
+        """
+        put fingerprint to the free slot of the bucket,
+        return False if the bucket is full
+        """
+        start = bucket * self.bucket_size
+        for index in range(start, start + self.bucket_size):
+            if not self._table[index]:
+                self._table[index] = fingerprint
+                return True
+        return False
+
+    def _insert(self, fingerprint: int, first: int, second: int) -> None:
+        if self._put(first, fingerprint) or self._put(second, fingerprint):
+            return
+        bucket = self._random.choice((first, second))
+        for _ in range(self.max_kicks):
+            # take a random slot, move its fingerprint to its other bucket
+            index = bucket * self.bucket_size + self._random.randrange(
+                self.bucket_size)
+            fingerprint, self._table[index] = self._table[index], fingerprint
+            bucket = self._alternate(bucket, fingerprint)
+            if self._put(bucket, fingerprint):
+                return
+        self._victim = (bucket, fingerprint)
+
+    def add(self, key) -> None:
+        """
+        add the key to the filter, adding the same key twice stores
+        it twice, raise OverflowError if the filter is full
+        """
+        if self._victim is not None:
+            raise OverflowError('CuckooFilter: is full')
+        self._insert(*self._locate(key))
+        self._length += 1
+
+    def __contains__(self, key) -> bool:
+        """
+        return False if the key isn't in the filter,
+        true if it is there or on false positive
+        """
+        item_hash = mix64(self.hash_func(key))
+        fingerprint = (item_hash >> 32) & self._fingerprint_mask or 1
+        first = item_hash & self._mask
+        second = (first ^ fingerprint * 0x5bd1e995) & self._mask
+        size = self.bucket_size
+        table = self._table
+        if (fingerprint in table[first * size:first * size + size]
+                or fingerprint in table[second * size:second * size + size]):
+            return True
+        victim = self._victim
+        return victim is not None and victim[1] == fingerprint and (
+            victim[0] == first or victim[0] == second)
+
+    def remove(self, key) -> bool:
+        """
+        remove the key added before, return False if it isn't found,
+        removing a key which was never added may remove other key
+        """
+        fingerprint, first, second = self._locate(key)
+        victim = self._victim
+        if victim is not None and victim[1] == fingerprint and (
+                victim[0] == first or victim[0] == second):
+            self._victim = None
+            self._length -= 1
+            return True
+        for bucket in (first, second):
+            start = bucket * self.bucket_size
+            for index in range(start, start + self.bucket_size):
+                if self._table[index] == fingerprint:
+                    self._table[index] = 0
+                    self._length -= 1
+                    if victim is not None:
+                        # there is a free slot now, retry the victim
+                        self._victim = None
+                        self._insert(victim[1], victim[0],
+                                     self._alternate(*victim))
+                    return True
+        return False
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.itemsize * len(self._table)
+
+    def estimated_error_rate(self) -> float:
+        """
+        return expected false positive rate for the current amount of keys
+        """
+        load = self._length / len(self._table)
+        return 1 - (1 - 2 ** -self.fingerprint_bits) ** (
+            2 * self.bucket_size * load)
+
+    def stats(self) -> dict:
+        """
+        return dict with sizing of the filter,
+        'bits_per_key' is memory per key at full capacity
+        """
+        return {
+            'capacity': self.capacity,
+            'keys': self._length,
+            'nbytes': self.nbytes,
+            'bits_per_key': 8 * self.nbytes / self.capacity,
+            'error_rate': self.error_rate,
+            'estimated_error_rate': self.estimated_error_rate(),
+        }
+
+
+class FilteredMap:
+    """
+    Membership filter in front of any HashMap: lookups of absent keys
+    are answered by the filter before the map probes its table.
+    The filter is rebuilt from the map keys with doubled capacity
+    when the map outgrows it. BloomFilter can't remove keys, keys popped
+    from such map stay in the filter until the next rebuild
+    :param hash_map: map from data_structures.hash_map,
+        empty HashMapSeparateChaining by default
+    :param filter_class: CuckooFilter or BloomFilter
+    :param capacity: int, initial capacity of the filter
+    :param error_rate: float, false positive rate of the filter
+    :return: None
+    """
+    def __init__(self, hash_map=None, filter_class=CuckooFilter,
+                 capacity=1024, error_rate=0.01) -> None:
+        self._map = HashMapSeparateChaining() if hash_map is None \
+            else hash_map
+        self.filter_class = filter_class
+        self.error_rate = error_rate
+        self.rejections = 0  # lookups answered by the filter
+        self.false_positives = 0  # lookups passed to the map in vain
+        self._stale = 0  # popped keys left in the filter
+        self._rebuild(max(capacity, len(self._map)))
+
+    def _rebuild(self, capacity: int) -> None:
+        """
+        create new filter and add all map keys to it
+        """
+        self.filter = self.filter_class(capacity, self.error_rate,
+                                        self._map.hash_func)
+        add = self.filter.add
+        for key in self._map.keys():
+            add(key)
+        self._stale = 0
+
+    def get(self, key, default=None) -> Any:
+        """
+        return value for the provided key,
+        return 'default' if there is no value for key
+        """
+        if key not in self.filter:
+            self.rejections += 1
+            return default
+        value = self._map.get(key, _MISSING)
+        if value is _MISSING:
+            self.false_positives += 1
+            return default
+        return value
+
+    def put(self, key, item) -> Any:
+        """
+        set value for the provided key
+        returns value of the previous value if exists, None otherwise
+        """
+        value = self.get(key)
+        self[key] = item
+        return value
+
+    def __getitem__(self, key) -> Any:
+        """
+        return value for the provided key,
+        raise KeyError if there is no value for key
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        """
+        set value for the provided key
+        """
+        length = len(self._map)
+        self._map[key] = value
+        if len(self._map) == length:
+            return
+        if length + self._stale >= self.filter.capacity:
+            # drop popped keys, double capacity if the map needs it
+            self._rebuild(max(self.filter.capacity, 2 * len(self._map)))
+            return
+        try:
+            self.filter.add(key)
+        except OverflowError:
+            self._rebuild(2 * self.filter.capacity)
+
+    def pop(self, key) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        if key not in self.filter:
+            self.rejections += 1
+            return None
+        element = self._map.pop(key)
+        if element is None:
+            self.false_positives += 1
+        elif hasattr(self.filter, 'remove'):
+            self.filter.remove(key)
+        else:
+            self._stale += 1
+        return element
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __bool__(self) -> bool:
+        return bool(self._map)
+
+    def items(self):
+        """
+        return live view of (key,value) tuples of the map
+        """
+        return self._map.items()
+
+    def keys(self):
+        """
+        return live view of the map keys
+        """
+        return self._map.keys()
+
+    def values(self):
+        """
+        return live view of the map values
+        """
+        return self._map.values()
+
+    def __iter__(self):
+        return iter(self._map)
+
+    def stats(self) -> dict:
+        """
+        return filter stats plus 'rejections' and 'false_positives'
+        counters of the lookups
+        """
+        stats = self.filter.stats()
+        stats['rejections'] = self.rejections
+        stats['false_positives'] = self.false_positives
+        return stats
+
+    def __str__(self) -> str:
+        return str(dict(self._map.items()))
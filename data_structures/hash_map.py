@@ -1,273 +1,1227 @@
+import itertools
+from array import array
+from collections.abc import ItemsView, KeysView, ValuesView
+from operator import is_not
+from time import perf_counter
 from typing import Any
 
+from data_structures.hashing import (
+    DEFAULT_HASH, HashFunc, distribution_report
+)
 
-def my_hash(size: int, value: Any) -> int:
+_MISSING = object()
+
+
+def my_hash(size: int, value: Any,
+            hash_func: HashFunc = DEFAULT_HASH) -> int:
     """
-    Return hash for any object witch has str method
+    Return table index for any hashable object
     :param size: result will be more than zero and less than size
-    :param value: any object having str method
+    :param value: any hashable object
+    :param hash_func: hash strategy from data_structures.hashing
     :return: int
     """
-    result = 0
-    for char in str(value):
-        result += ord(char)
-    return result % size
+    return hash_func(value) % size
+
+
+def table_size(size: int) -> int:
+    """
+    Return the smallest power of two not less than size,
+    so table index is 'hash & (size - 1)' instead of modulo
+    """
+    return 1 << max(size - 1, 0).bit_length()
+
+
+class HashMapKeysView(KeysView):
+    """
+    Live view of the HashMap keys, len() and 'in' are O(1)
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        for key, _ in self._mapping._entries():
+            yield key
+
+
+class HashMapValuesView(ValuesView):
+    """
+    Live view of the HashMap values
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        for _, value in self._mapping._entries():
+            yield value
+
+    def __contains__(self, value) -> bool:
+        for item in self:
+            if item is value or item == value:
+                return True
+        return False
+
+
+class HashMapItemsView(ItemsView):
+    """
+    Live view of the HashMap (key, value) tuples, len() and 'in' are O(1)
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._entries()
+
+
+class HashMapStats:
+    """
+    Statistics collected by a HashMap created with stats=True:
+    probe length of every lookup (get, [], in and pop) and every resize.
+    Probe length is the amount of entries passed before the key
+    (or the end of its probe sequence) is reached, 0 means home slot
+    """
+    def __init__(self) -> None:
+        self.probes = {}  # probe length -> amount of lookups
+        self.resizes = []  # (old size, new size, seconds)
+
+    def record_probe(self, length: int) -> None:
+        self.probes[length] = self.probes.get(length, 0) + 1
+
+    def record_resize(self, old_size: int, new_size: int,
+                      elapsed: float) -> None:
+        self.resizes.append((old_size, new_size, elapsed))
+
+    def reset(self) -> None:
+        self.probes.clear()
+        self.resizes.clear()
+
+    def report(self) -> dict:
+        """
+        return dict with
+            'lookups' - amount of recorded lookups,
+            'probes' - {probe length: amount of lookups},
+            'max_probe', 'mean_probe' - longest and mean probe length,
+            'resizes' - amount of resizes,
+            'resize_time' - seconds spent in resizes
+        """
+        lookups = sum(self.probes.values())
+        total = sum(length * count for length, count in self.probes.items())
+        return {
+            'lookups': lookups,
+            'probes': dict(sorted(self.probes.items())),
+            'max_probe': max(self.probes, default=0),
+            'mean_probe': total / lookups if lookups else 0.0,
+            'resizes': len(self.resizes),
+            'resize_time': sum(elapsed for *_, elapsed in self.resizes),
+        }
 
 
 class HashMapCollision:
     """
-    HashMap implementation without collision handling
-    :param size: int, hashmap size, by default=5
+    HashMap implementation without collision handling.
+    Slots keep (key, value, hash): hash is computed once per key, resize
+    reuses it and lookups compare hashes before calling key __eq__
+    :param size: int, hashmap size rounded up to power of two, by default=5
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_load: optional float, load factor which causes expansion,
+        class default is used if omitted
+    :param min_load: optional float, table is halved when pop leaves
+        less load, never below the initial size, 0 disables shrinking;
+        class default is used if omitted
+    :param stats: bool, collect HashMapStats in 'stats', by default
+        'stats' is None and nothing is recorded
     :return: None
     """
-    def __init__(self, size=5) -> None:
-        self.size = size
-        self.hash_map = [None] * size
-        self.filled = 0
-        self._index = 0
+    max_load = 0.75  # expand hash table if it's filled more than 75%
+    min_load = 0.0  # rebuild loses colliding items, so never shrink
+    _open_addressing = False  # probing needs at least one empty slot
+    _mutating_reads = False  # lookups change the table
+
+    def __init__(self, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 max_load=None, min_load=None, stats=False) -> None:
+        self.size = table_size(size)
+        self._min_size = self.size
+        self.hash_func = hash_func
+        self._set_loads(max_load, min_load)
+        self.stats = HashMapStats() if stats else None
+        self.hash_map = [None] * self.size
+        self.filled = 0  # used slots, load factor is filled / size
+        self._length = 0
+        self._version = 0  # changed by insertion, deletion and resize
+
+    def _set_loads(self, max_load, min_load) -> None:
+        """
+        set load factors, class defaults are kept for omitted ones;
+        full table of open addressing map makes probing endless and
+        min_load of max_load / 2 or more makes shrink undo the growth
+        """
+        if max_load is not None:
+            self.max_load = max_load
+        if min_load is not None:
+            self.min_load = min_load
+        if self.max_load <= 0 or \
+                self._open_addressing and self.max_load >= 1:
+            limit = '(0, 1)' if self._open_addressing else '> 0'
+            raise ValueError(f'{type(self).__name__}: max_load must be '
+                             f'in {limit}')
+        if not 0 <= self.min_load < self.max_load / 2:
+            raise ValueError(f'{type(self).__name__}: min_load must be '
+                             f'in [0, max_load / 2)')
+
+    @classmethod
+    def from_items(cls, items, **kwargs):
+        """
+        return new map with (key, value) items,
+        hash table is sized once for all items
+        :param items: iterable of (key, value) tuples or other map
+        :param kwargs: arguments of the map constructor
+        """
+        hash_map = cls(**kwargs)
+        hash_map.update(items)
+        return hash_map
 
     def get(self, key, default=None):
         """
         return value for the provided key,
         return 'default' if there is no value for key
         """
-        try:
-            value = self[key]
-        except KeyError:
-            value = default
-        return value
+        return self._get_hashed(key, self.hash_func(key), default)
 
     def put(self, key, item):
         """
         set value for the provided key
         returns value of the previous value if exists, None otherwise
         """
-        value = self.get(key)
-        self[key] = item
-        return value
+        return self._set_hashed(key, item, self.hash_func(key))
+
+    def reserve(self, amount: int) -> None:
+        """
+        expand hash table at once, so it can hold 'amount' items
+        without further expansions
+        """
+        size = self.size
+        while amount >= self.max_load * size:
+            size *= 2
+        if size != self.size:
+            self._resize(size)
+
+    def update(self, items) -> None:
+        """
+        set values for all (key, value) items or items of other map,
+        hash table is expanded once before insertion
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        if not hasattr(items, '__len__'):
+            items = list(items)
+        self.reserve(len(self) + len(items))
+        hash_func, set_hashed = self.hash_func, self._set_hashed
+        for key, value in items:
+            set_hashed(key, value, hash_func(key))
+
+    def get_many(self, keys, default=None) -> list:
+        """
+        return list of values for the provided keys,
+        'default' for keys without value
+        """
+        hash_func, get_hashed = self.hash_func, self._get_hashed
+        return [get_hashed(key, hash_func(key), default) for key in keys]
+
+    def put_many(self, items) -> list:
+        """
+        set values for all (key, value) items
+        returns list of previous values (None for new keys)
+        """
+        if not hasattr(items, '__len__'):
+            items = list(items)
+        self.reserve(len(self) + len(items))
+        hash_func, set_hashed = self.hash_func, self._set_hashed
+        return [set_hashed(key, item, hash_func(key))
+                for key, item in items]
+
+    def pop_many(self, keys) -> list:
+        """
+        pop all the provided keys, return list of popped elements
+        """
+        pop = self.pop
+        return [pop(key) for key in keys]
 
     def pop(self, key):
         """
         return element for the provided key and pops it from the map
         """
-        index = my_hash(self.size, key)
+        item_hash = self.hash_func(key)
+        index = item_hash & (self.size - 1)
         element = self.hash_map[index]
+        if self.stats is not None:
+            self.stats.record_probe(0)
+        if element is None or element[2] != item_hash or element[0] != key:
+            return None
         self.hash_map[index] = None
-        return element
+        self.filled -= 1
+        self._length -= 1
+        self._version += 1
+        if self._length < self.min_load * self.size:
+            self._shrink()
+        return element[:2]
 
     def __bool__(self):
         """
         return true if map isn't empty, False otherwise
         """
-        return any(self.hash_map)
+        return self._length > 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, key) -> bool:
+        return self._get_hashed(key, self.hash_func(key),
+                                _MISSING) is not _MISSING
 
-    def items(self):
+    def _entries(self):
         """
-        return sequence of (key,value) tuples
+        generator of (key, value) tuples walking the hash table,
+        raise RuntimeError if the map is changed during iteration
         """
-        return [(item[0], item[1]) for item in self.hash_map if item]
+        version = self._version
+        for item in self.hash_map:
+            if item:
+                yield item[0], item[1]
+                if self._version != version:
+                    raise RuntimeError('HashMap changed during iteration')
 
-    def keys(self):
+    def _stored_entries(self):
         """
-        return sequence of map keys
+        return iterator of stored entry tuples (key, value, ..., hash),
+        the map must not be changed until it's exhausted
         """
-        return [item[0] for item in self.hash_map if item]
+        return filter(None, self.hash_map)
 
-    def values(self):
+    def _restore(self, entries) -> None:
         """
-        return sequence of map values
+        put (key, value, hash) entries of unique keys which aren't
+        in the map yet, stored hashes are used as is and the table
+        isn't expanded: call reserve() before
         """
-        return [item[1] for item in self.hash_map if item]
+        mask = self.size - 1
+        for item in entries:
+            if self.hash_map[item[2] & mask] is None:
+                self.filled += 1
+                self._length += 1
+            self.hash_map[item[2] & mask] = item
+        self._version += 1
+
+    def items(self) -> HashMapItemsView:
+        """
+        return live view of (key,value) tuples
+        """
+        return HashMapItemsView(self)
+
+    def keys(self) -> HashMapKeysView:
+        """
+        return live view of map keys
+        """
+        return HashMapKeysView(self)
+
+    def values(self) -> HashMapValuesView:
+        """
+        return live view of map values
+        """
+        return HashMapValuesView(self)
 
     def __getitem__(self, key):
         """
         return value for the provided key,
         raise KeyError if there is no value for key
         """
-        item = self.hash_map[my_hash(self.size, key)]
-        if not item:
-            raise KeyError
+        value = self._get_hashed(key, self.hash_func(key), _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def _get_hashed(self, key, item_hash: int, default):
+        """
+        return value for the key with already computed hash,
+        'default' if there is no value for key
+        """
+        item = self.hash_map[item_hash & (self.size - 1)]
+        if self.stats is not None:
+            self.stats.record_probe(0)
+        if not item or item[2] != item_hash or item[0] != key:
+            return default
         return item[1]
 
+    def _resize(self, size: int) -> None:
+        """
+        rebuild hash table with the new size, the rebuild is timed
+        when stats are collected
+        """
+        if self.stats is None:
+            self._rebuild(size)
+            return
+        old_size = self.size
+        start = perf_counter()
+        self._rebuild(size)
+        self.stats.record_resize(old_size, self.size, perf_counter() - start)
+
+    def _shrink(self) -> None:
+        """
+        halve hash table while less than min_load of it is used,
+        but not below the initial size
+        """
+        size = self.size
+        while size > self._min_size and self._length < self.min_load * size:
+            size //= 2
+        if size != self.size:
+            self._resize(size)
+
+    def _rebuild(self, size: int) -> None:
+        """
+        rebuild hash table with the new size using stored hashes
+        """
+        items = [item for item in self.hash_map if item]
+        self.size = size
+        self.hash_map = [None] * size
+        mask = size - 1
+        for item in items:
+            self.hash_map[item[2] & mask] = item
+        # there is no collision handling, colliding items are lost
+        self.filled = self._length = sum(1 for item in self.hash_map
+                                         if item)
+        self._version += 1
+
     def __setitem__(self, key, value):
         """
         set value for the provided key
         """
-        index = my_hash(self.size, key)
-        if not self.hash_map[index]:
+        self._set_hashed(key, value, self.hash_func(key))
+
+    def _set_hashed(self, key, value, item_hash: int):
+        """
+        set value for the key with already computed hash,
+        return the previous value of the key, None if there was no one
+        """
+        index = item_hash & (self.size - 1)
+        item = self.hash_map[index]
+        if not item and self.filled + 1 >= self.max_load * self.size:
+            self._resize(self.size * 2)
+            index = item_hash & (self.size - 1)
+            item = self.hash_map[index]
+        previous = None
+        if not item:
             self.filled += 1
-        if self.filled >= 0.75 * self.size:
-            # expand hash table if it's filled more than 75%
-            items = self.items()
-            items.append((key, value))
-            self.size *= 2
-            self.hash_map = [None] * self.size
-            for k, v in items:
-                self.hash_map[my_hash(self.size, k)] = (k, v)
+            self._length += 1
+            self._version += 1
+        elif item[2] != item_hash or item[0] != key:
+            self._version += 1
         else:
-            self.hash_map[index] = (key, value)
+            previous = item[1]
+        self.hash_map[index] = (key, value, item_hash)
+        return previous
 
     def __iter__(self):
-        return iter(self.keys())
-
-    def __next__(self):
-        while True:
-            if self._index == self.size:
-                raise StopIteration
-            if self.hash_map[self._index]:
-                break
-            self._index += 1
-        key = self.hash_map[self._index][0]
-        self._index += 1
-        return key
+        for key, _ in self._entries():
+            yield key
 
     def __str__(self):
         return str(self.hash_map)
 
+    def distribution(self) -> dict:
+        """
+        return distribution report of the current keys for the current size
+        (see data_structures.hashing.distribution_report)
+        """
+        return distribution_report(self.keys(), self.size, self.hash_func)
+
+    def stats_report(self) -> dict:
+        """
+        return current load of the map: 'length', 'size', 'load_factor',
+        'tombstones' (deleted entries still taking space), 'max_load',
+        'min_load', plus HashMapStats.report() if stats are collected
+        """
+        report = {
+            'length': len(self),
+            'size': self.size,
+            'load_factor': len(self) / self.size,
+            'tombstones': self.filled - len(self),
+            'max_load': self.max_load,
+            'min_load': self.min_load,
+        }
+        if self.stats is not None:
+            report.update(self.stats.report())
+        return report
+
 
 class HashMapOpenAddressing(HashMapCollision):
     """
     HashMap implementation with open addressing
-    :param size: int, hashmap size, by default=5
+    :param size: int, hashmap size rounded up to power of two, by default=5
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_load: optional float, load factor which causes expansion
+    :param min_load: optional float, load factor which causes shrinking
+    :param stats: bool, collect HashMapStats in 'stats'
     :return: None
     """
-    def __init__(self, size=5) -> None:
-        super().__init__(size)
+    min_load = 0.1
+    _open_addressing = True
+
+    def __init__(self, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 max_load=None, min_load=None, stats=False) -> None:
+        super().__init__(size, hash_func, max_load, min_load, stats)
 
-    def __getitem__(self, key) -> Any:
+    def _probe(self, key, item_hash: int) -> int:
         """
-        return value for the provided key,
-        raise KeyError if there is no value for key
+        return slot index of the key or index of the empty slot
+        where the key has to be placed (linear probing)
         """
-        index = my_hash(self.size, key)
-        if not self.hash_map[index]:
-            raise KeyError
-        pointer = index
-        while self.hash_map[pointer][0] != key:
-            pointer += 1
-            if pointer == index:
-                raise KeyError
-            if pointer == len(self.hash_map) - 1:
-                pointer = 0
-        return self.hash_map[pointer][1]
-
-    def _add_to_hash_table(self, key, value) -> None:
-        index = my_hash(self.size, key)
-        while self.hash_map[index] and self.hash_map[index][0] != key:
-            index += 1
-            if index == len(self.hash_map) - 1:
-                index = 0
-        self.hash_map[index] = (key, value)
+        mask = self.size - 1
+        index = item_hash & mask
+        while True:
+            item = self.hash_map[index]
+            if item is None or (item[2] == item_hash
+                                and (item[0] is key or item[0] == key)):
+                return index
+            index = (index + 1) & mask
 
-    def __setitem__(self, key, value):
+    def _get_hashed(self, key, item_hash: int, default) -> Any:
+        index = self._probe(key, item_hash)
+        if self.stats is not None:
+            self.stats.record_probe((index - item_hash) & (self.size - 1))
+        item = self.hash_map[index]
+        if item is None:
+            return default
+        return item[1]
+
+    def _rebuild(self, size: int) -> None:
         """
-        set value for the provided key
+        rebuild hash table with the new size using stored hashes,
+        keys are unique so they are never compared
         """
-        self.filled += 1
-        if self.filled >= 0.75 * self.size:
-            items = self.items()
-            items.append((key, value))
-            self.size *= 2
-            self.hash_map = [None] * self.size
-            for k, v in items:
-                self._add_to_hash_table(k, v)
-        else:
-            self._add_to_hash_table(key, value)
+        items = [item for item in self.hash_map if item]
+        self.size = size
+        self.hash_map = [None] * size
+        mask = size - 1
+        for item in items:
+            index = item[2] & mask
+            while self.hash_map[index] is not None:
+                index = (index + 1) & mask
+            self.hash_map[index] = item
+        self._version += 1
+
+    def _restore(self, entries) -> None:
+        mask = self.size - 1
+        for item in entries:
+            index = item[2] & mask
+            while self.hash_map[index] is not None:
+                index = (index + 1) & mask
+            self.hash_map[index] = item
+            self.filled += 1
+            self._length += 1
+        self._version += 1
+
+    def _set_hashed(self, key, value, item_hash: int) -> Any:
+        index = self._probe(key, item_hash)
+        item = self.hash_map[index]
+        if item is None:
+            self.filled += 1
+            self._length += 1
+            self._version += 1
+            if self.filled >= self.max_load * self.size:
+                self._resize(self.size * 2)
+                index = self._probe(key, item_hash)
+        self.hash_map[index] = (key, value, item_hash)
+        return item[1] if item is not None else None
+
+    def pop(self, key) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        item_hash = self.hash_func(key)
+        index = self._probe(key, item_hash)
+        mask = self.size - 1
+        if self.stats is not None:
+            self.stats.record_probe((index - item_hash) & mask)
+        element = self.hash_map[index]
+        if element is None:
+            return None
+        self.hash_map[index] = None
+        following = index
+        while True:
+            # move back entries which can't be found behind the hole
+            following = (following + 1) & mask
+            item = self.hash_map[following]
+            if item is None:
+                break
+            home = item[2] & mask
+            if index <= following:
+                stays = index < home <= following
+            else:
+                stays = home <= following or home > index
+            if not stays:
+                self.hash_map[index] = item
+                self.hash_map[following] = None
+                index = following
+        self.filled -= 1
+        self._length -= 1
+        self._version += 1
+        if self._length < self.min_load * self.size:
+            self._shrink()
+        return element[:2]
 
 
 class HashMapSeparateChaining(HashMapCollision):
     """
-    HashMap implementation with Separate chaining
-    :param size: int, hashmap size, by default=5
+    HashMap implementation with Separate chaining,
+    'filled' counts entries, so load factor is mean chain length
+    :param size: int, hashmap size rounded up to power of two, by default=5
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_load: optional float, load factor which causes expansion
+    :param min_load: optional float, load factor which causes shrinking
+    :param stats: bool, collect HashMapStats in 'stats'
     :return: None
     """
-    def __init__(self, size=5) -> None:
-        super().__init__(size)
+    min_load = 0.1
+
+    def __init__(self, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 max_load=None, min_load=None, stats=False) -> None:
+        super().__init__(size, hash_func, max_load, min_load, stats)
         self.hash_map = [[] for _ in range(self.size)]
 
-    def _add_to_chain(self, key, value) -> None:
-        index = my_hash(self.size, key)
-        chain = self.hash_map[index]
-        if chain:
-            item_to_replace = None
-            for k, v in chain:
-                if k == key:
-                    item_to_replace = (k, v)
-                    break
-            if item_to_replace:
-                chain.remove(item_to_replace)
-        chain.append((key, value))
+    def _set_hashed(self, key, value, item_hash: int) -> Any:
+        chain = self.hash_map[item_hash & (self.size - 1)]
+        for position, item in enumerate(chain):
+            if item[2] == item_hash and (item[0] is key or item[0] == key):
+                chain[position] = (key, value, item_hash)
+                return item[1]
+        chain.append((key, value, item_hash))
+        self.filled += 1
+        self._length += 1
+        self._version += 1
+        if self.filled >= self.max_load * self.size:
+            self._resize(self.size * 2)
+        return None
 
-    def __setitem__(self, key, value):
+    def _rebuild(self, size: int) -> None:
         """
-        set value for the provided key
+        rebuild hash table with the new size using stored hashes
         """
-        if not self.hash_map[my_hash(self.size, key)]:
+        items = [item for chain in self.hash_map for item in chain]
+        self.size = size
+        self.hash_map = [[] for _ in range(size)]
+        mask = size - 1
+        for item in items:
+            self.hash_map[item[2] & mask].append(item)
+        self._version += 1
+
+    def _restore(self, entries) -> None:
+        table = self.hash_map
+        mask = self.size - 1
+        for item in entries:
+            chain = table[item[2] & mask]
+            if chain is None:
+                table[item[2] & mask] = [item]
+            else:
+                chain.append(item)
             self.filled += 1
-        if self.filled >= 0.75 * self.size:
-            items = self.items()
-            items.append((key, value))
-            self.size *= 2
-            self.hash_map = [[] for _ in range(self.size)]
-            for k, v in items:
-                self._add_to_chain(k, v)
-        else:
-            self._add_to_chain(key, value)
+            self._length += 1
+        self._version += 1
+
+    def _stored_entries(self):
+        return itertools.chain.from_iterable(filter(None, self.hash_map))
+
+    def _get_hashed(self, key, item_hash: int, default) -> Any:
+        chain = self.hash_map[item_hash & (self.size - 1)]
+        for item in chain:
+            if item[2] == item_hash and (item[0] is key or item[0] == key):
+                if self.stats is not None:
+                    self.stats.record_probe(chain.index(item))
+                return item[1]
+        if self.stats is not None:
+            self.stats.record_probe(len(chain))
+        return default
 
-    def __getitem__(self, key) -> Any:
+    def pop(self, key) -> tuple | None:
         """
-        return value for the provided key,
-        raise KeyError if there is no value for key
+        return element for the provided key and pops it from the map
+        """
+        item_hash = self.hash_func(key)
+        chain = self.hash_map[item_hash & (self.size - 1)]
+        for position, item in enumerate(chain):
+            if item[2] == item_hash and (item[0] is key or item[0] == key):
+                if self.stats is not None:
+                    self.stats.record_probe(position)
+                del chain[position]
+                self.filled -= 1
+                self._length -= 1
+                self._version += 1
+                if self._length < self.min_load * self.size:
+                    self._shrink()
+                return item[:2]
+        if self.stats is not None:
+            self.stats.record_probe(len(chain))
+        return None
+
+    def _entries(self):
+        """
+        generator of (key, value) tuples walking the chains,
+        raise RuntimeError if the map is changed during iteration
+        """
+        version = self._version
+        for chain in self.hash_map:
+            for item in chain:
+                yield item[0], item[1]
+                if self._version != version:
+                    raise RuntimeError('HashMap changed during iteration')
+
+
+class HashMapRobinHood(HashMapOpenAddressing):
+    """
+    HashMap implementation with Robin Hood open addressing:
+    every slot keeps (key, value, probe distance, hash), insertion takes
+    the slot from entries closer to their home, lookups stop as soon as
+    probe distance is exceeded and deletion shifts following entries
+    back (no tombstones). Probe lengths stay short up to 0.9 load
+    :param size: int, hashmap size rounded up to power of two, by default=5
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_load: float, load factor which causes table expansion
+    :param min_load: optional float, load factor which causes shrinking
+    :param stats: bool, collect HashMapStats in 'stats'
+    :return: None
+    """
+    def __init__(self, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 max_load=0.9, min_load=None, stats=False) -> None:
+        super().__init__(size, hash_func, max_load, min_load, stats)
+
+    def _find(self, key, item_hash: int, record=True) -> int:
+        """
+        return slot index of the key, -1 if there is no such key,
+        probe length goes to stats if 'record' is true
+        """
+        mask = self.size - 1
+        index = item_hash & mask
+        distance = 0
+        while True:
+            slot = self.hash_map[index]
+            if slot is None or slot[2] < distance:
+                index = -1
+                break
+            if slot[3] == item_hash and (slot[0] is key or slot[0] == key):
+                break
+            index = (index + 1) & mask
+            distance += 1
+        if record and self.stats is not None:
+            self.stats.record_probe(distance)
+        return index
+
+    def _add_to_hash_table(self, key, value, item_hash: int):
+        """
+        put item to the table, return the overwritten slot of the key,
+        None if new slot is used
+        """
+        mask = self.size - 1
+        index = item_hash & mask
+        distance = 0
+        owner = True  # still carrying the key passed by caller
+        while True:
+            slot = self.hash_map[index]
+            if slot is None:
+                self.hash_map[index] = (key, value, distance, item_hash)
+                return None
+            if owner and slot[3] == item_hash and (slot[0] is key
+                                                   or slot[0] == key):
+                self.hash_map[index] = (key, value, slot[2], item_hash)
+                return slot
+            if slot[2] < distance:
+                # take the slot from the entry closer to its home
+                self.hash_map[index] = (key, value, distance, item_hash)
+                key, value, distance, item_hash = slot
+                owner = False
+            index = (index + 1) & mask
+            distance += 1
+
+    def _rebuild(self, size: int) -> None:
         """
-        chain = self.hash_map[my_hash(self.size, key)]
-        for k, v in chain:
-            if k == key:
-                return v
-        raise KeyError
+        rebuild hash table with the new size using stored hashes
+        """
+        items = [slot for slot in self.hash_map if slot]
+        self.size = size
+        self.hash_map = [None] * size
+        for slot in items:
+            self._add_to_hash_table(slot[0], slot[1], slot[3])
+        self._version += 1
+
+    def _restore(self, entries) -> None:
+        for key, value, item_hash in entries:
+            self._add_to_hash_table(key, value, item_hash)
+            self.filled += 1
+            self._length += 1
+        self._version += 1
+
+    def _get_hashed(self, key, item_hash: int, default) -> Any:
+        index = self._find(key, item_hash)
+        if index < 0:
+            return default
+        return self.hash_map[index][1]
+
+    def _set_hashed(self, key, value, item_hash: int) -> Any:
+        if (self.filled + 1 > self.max_load * self.size
+                and self._find(key, item_hash, False) < 0):
+            self._resize(self.size * 2)
+        replaced = self._add_to_hash_table(key, value, item_hash)
+        if replaced is not None:
+            return replaced[1]
+        self.filled += 1
+        self._length += 1
+        self._version += 1
+        return None
 
     def pop(self, key) -> tuple | None:
         """
         return element for the provided key and pops it from the map
         """
-        found_item = None
-        chain = self.hash_map[my_hash(self.size, key)]
-        for k, v in chain:
-            if k == key:
-                found_item = (k, v)
+        index = self._find(key, self.hash_func(key))
+        if index < 0:
+            return None
+        element = self.hash_map[index][:2]
+        mask = self.size - 1
+        while True:
+            # backward shift: move following entries one slot closer home
+            following = (index + 1) & mask
+            slot = self.hash_map[following]
+            if slot is None or slot[2] == 0:
+                self.hash_map[index] = None
                 break
-        if found_item:
-            chain.remove(found_item)
-        return found_item
+            self.hash_map[index] = (slot[0], slot[1], slot[2] - 1, slot[3])
+            index = following
+        self.filled -= 1
+        self._length -= 1
+        self._version += 1
+        if self._length < self.min_load * self.size:
+            self._shrink()
+        return element
 
-    def items(self) -> list:
+
+class HashMapIncremental(HashMapSeparateChaining):
+    """
+    HashMap implementation with Separate chaining and incremental
+    (Redis-like) rehashing: on resize old and new tables coexist and
+    every operation moves a few buckets to the new table,
+    so there is no O(n) stop-the-world rebuild
+    :param size: int, hashmap size rounded up to power of two, by default=5
+    :param hash_func: hash strategy, builtin hash() by default
+    :param rehash_step: int, buckets migrated by every operation
+    :param track_latency: bool, collect per-operation timing in 'latency'
+    :param max_load: optional float, load factor which starts rehashing
+    :param min_load: optional float, load factor which causes shrinking,
+        shrinking rebuilds the table at once
+    :param stats: bool, collect HashMapStats in 'stats', resize time
+        is the allocation of the new table, migration is spread
+        over operations (see track_latency)
+    :return: None
+    """
+    _mutating_reads = True  # lookups migrate buckets too
+    def __init__(self, size=5, hash_func: HashFunc = DEFAULT_HASH,
+                 rehash_step=1, track_latency=False, max_load=None,
+                 min_load=None, stats=False) -> None:
+        super().__init__(size, hash_func, max_load, min_load, stats)
+        self.rehash_step = rehash_step
+        self._new_map = None
+        self._new_size = 0
+        self._rehash_index = 0
+        self.latency = None
+        if track_latency:
+            self.latency = {'operations': 0, 'total': 0.0, 'max': 0.0}
+
+    @property
+    def rehashing(self) -> bool:
         """
-        return sequence of (key,value) tuples
+        return true while old table is being migrated to the new one
         """
-        items = []
-        for chain in self.hash_map:
-            for item in chain:
-                items.append(item)
-        return items
+        return self._new_map is not None
 
-    def keys(self) -> list:
+    def _timed(self, method, *args):
         """
-        return sequence of map keys
+        call method and store its duration in 'latency'
         """
-        keys = []
-        for chain in self.hash_map:
-            for item in chain:
-                keys.append(item[0])
-        return keys
+        start = perf_counter()
+        result = method(*args)
+        elapsed = perf_counter() - start
+        self.latency['operations'] += 1
+        self.latency['total'] += elapsed
+        self.latency['max'] = max(self.latency['max'], elapsed)
+        return result
 
-    def values(self) -> list:
+    def _rebuild(self, size: int) -> None:
         """
-        return sequence of map values
+        rebuild hash table with the new size at once,
+        used only for explicit reserve() and shrinking
         """
-        values = []
-        for chain in self.hash_map:
-            for item in chain:
-                values.append(item[1])
-        return values
+        items = [item for table in (self.hash_map, self._new_map or ())
+                 for chain in table for item in chain or ()]
+        self._new_map = None
+        self._new_size = 0
+        self.size = size
+        self.hash_map = [None] * size
+        for item in items:
+            index = item[2] & (size - 1)
+            if self.hash_map[index] is None:
+                self.hash_map[index] = [item]
+            else:
+                self.hash_map[index].append(item)
+        self._version += 1
+
+    def _stored_entries(self):
+        return itertools.chain.from_iterable(filter(
+            None, itertools.chain(self.hash_map, self._new_map or ())))
+
+    def _restore(self, entries) -> None:
+        if self._new_map is not None:
+            self._rebuild(self.size)  # finish migration at once
+        super()._restore(entries)
+
+    def _start_rehash(self) -> None:
+        # chains of the new table are created lazily, so allocation
+        # of the table is a single C level call
+        start = perf_counter()
+        self._new_size = self.size * 2
+        self._new_map = [None] * self._new_size
+        self._rehash_index = 0
+        if self.stats is not None:
+            self.stats.record_resize(self.size, self._new_size,
+                                     perf_counter() - start)
+
+    def _rehash(self) -> None:
+        """
+        move up to rehash_step non empty buckets to the new table,
+        visit not more than 10 * rehash_step empty buckets
+        """
+        moved = 0
+        visits = self.rehash_step * 10
+        mask = self._new_size - 1
+        while (moved < self.rehash_step and visits
+               and self._rehash_index < self.size):
+            chain = self.hash_map[self._rehash_index]
+            if chain:
+                for item in chain:
+                    index = item[2] & mask
+                    if self._new_map[index] is None:
+                        self._new_map[index] = [item]
+                    else:
+                        self._new_map[index].append(item)
+                moved += 1
+            self.hash_map[self._rehash_index] = None
+            self._rehash_index += 1
+            visits -= 1
+        if self._rehash_index == self.size:
+            self.hash_map, self.size = self._new_map, self._new_size
+            self._new_map = None
+            self._new_size = 0
+
+    def _locate(self, item_hash: int) -> tuple:
+        """
+        return (table, index) of the bucket where the key is stored
+        (or has to be stored), buckets before the rehash index
+        are already moved to the new table
+        """
+        index = item_hash & (self.size - 1)
+        if self._new_map is not None and index < self._rehash_index:
+            return self._new_map, item_hash & (self._new_size - 1)
+        return self.hash_map, index
+
+    def _get(self, key, item_hash: int, default) -> Any:
+        if self._new_map is not None:
+            self._rehash()
+        table, index = self._locate(item_hash)
+        chain = table[index] or ()
+        for item in chain:
+            if item[2] == item_hash and (item[0] is key or item[0] == key):
+                if self.stats is not None:
+                    self.stats.record_probe(chain.index(item))
+                return item[1]
+        if self.stats is not None:
+            self.stats.record_probe(len(chain))
+        return default
+
+    def _set(self, key, value, item_hash: int) -> Any:
+        if self._new_map is not None:
+            self._rehash()
+        table, index = self._locate(item_hash)
+        chain = table[index]
+        if chain is None:
+            table[index] = [(key, value, item_hash)]
+        else:
+            for position, item in enumerate(chain):
+                if item[2] == item_hash and (item[0] is key
+                                             or item[0] == key):
+                    chain[position] = (key, value, item_hash)
+                    return item[1]
+            chain.append((key, value, item_hash))
+        self.filled += 1
+        self._length += 1
+        self._version += 1
+        if self._new_map is None and self.filled >= self.max_load * self.size:
+            self._start_rehash()
+        return None
+
+    def _pop(self, key) -> tuple | None:
+        if self._new_map is not None:
+            self._rehash()
+        item_hash = self.hash_func(key)
+        table, index = self._locate(item_hash)
+        chain = table[index] or []
+        for position, item in enumerate(chain):
+            if item[2] == item_hash and (item[0] is key or item[0] == key):
+                if self.stats is not None:
+                    self.stats.record_probe(position)
+                del chain[position]
+                self.filled -= 1
+                self._length -= 1
+                self._version += 1
+                if self._length < self.min_load * self.size:
+                    self._shrink()
+                return item[:2]
+        if self.stats is not None:
+            self.stats.record_probe(len(chain))
+        return None
+
+    def _get_hashed(self, key, item_hash: int, default) -> Any:
+        if self.latency is None:
+            return self._get(key, item_hash, default)
+        return self._timed(self._get, key, item_hash, default)
+
+    def _set_hashed(self, key, value, item_hash: int) -> Any:
+        if self.latency is None:
+            return self._set(key, value, item_hash)
+        return self._timed(self._set, key, value, item_hash)
+
+    def pop(self, key) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        if self.latency is None:
+            return self._pop(key)
+        return self._timed(self._pop, key)
+
+    def _entries(self):
+        """
+        generator of (key, value) tuples walking buckets of the table,
+        raise RuntimeError if the map is changed during iteration.
+        Lookups keep migrating buckets meanwhile: bucket 'i' of the old
+        table moves as a whole to buckets 'i' and 'i + size' of the new
+        one, so every bucket is read where it is when the walk reaches
+        it and every item is yielded once
+        """
+        version = self._version
+        size = self.size
+        rehashing = self._new_map is not None
+        for index in range(size):
+            if not rehashing or (self._new_map is not None
+                                 and index >= self._rehash_index):
+                chains = (self.hash_map[index],)
+            else:
+                table = self._new_map or self.hash_map
+                chains = (table[index], table[index + size])
+            for chain in chains:
+                for item in chain or ():
+                    yield item[0], item[1]
+                    if self._version != version:
+                        raise RuntimeError(
+                            'HashMap changed during iteration')
+
+
+class HashMapCompact(HashMapCollision):
+    """
+    Insertion ordered HashMap in the CPython 3.6+ compact dict style:
+    sparse index table of small ints points into dense arrays
+    of hashes, keys and values
+    :param size: int, index table size, rounded up to power of two
+    :param hash_func: hash strategy, builtin hash() by default
+    :param max_load: optional float, used entries (deleted ones too)
+        per index slot which cause rebuild
+    :param min_load: optional float, load factor which causes shrinking
+    :param stats: bool, collect HashMapStats in 'stats'
+    :return: None
+    """
+    _EMPTY = -1
+    _DUMMY = -2
+    max_load = 2 / 3
+    min_load = 0.1
+    _open_addressing = True
+    _DELETED = object()  # marks deleted entry in the dense arrays
+
+    def __init__(self, size=8, hash_func: HashFunc = DEFAULT_HASH,
+                 max_load=None, min_load=None, stats=False) -> None:
+        self.hash_func = hash_func
+        self._set_loads(max_load, min_load)
+        self.stats = HashMapStats() if stats else None
+        self._length = 0
+        self._version = 0
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+        self._build_index(size)
+        self._min_size = self.size
+
+    @staticmethod
+    def _index_typecode(size: int) -> str:
+        """
+        return the smallest signed array typecode able to address size
+        """
+        for typecode in 'bhiq':
+            if size <= 1 << (8 * array(typecode).itemsize - 1):
+                return typecode
+        raise OverflowError('HashMapCompact: size is too big')
+
+    def _build_index(self, size: int) -> None:
+        """
+        allocate index table of at least 'size' slots and fill it
+        from the dense arrays
+        """
+        self.size = 8
+        while self.size < size:
+            self.size *= 2
+        self._indices = array(self._index_typecode(self.size),
+                              [self._EMPTY]) * self.size
+        mask = self.size - 1
+        for entry, item_hash in enumerate(self._hashes):
+            self._indices[self._free_slot(item_hash, mask)] = entry
+
+    @property
+    def filled(self) -> int:
+        """
+        amount of used entries in the dense arrays (deleted ones too)
+        """
+        return len(self._keys)
+
+    def _free_slot(self, item_hash: int, mask: int) -> int:
+        """
+        return first empty index slot in the probe sequence
+        """
+        slot = item_hash & mask
+        perturb = item_hash
+        while self._indices[slot] != self._EMPTY:
+            perturb >>= 5
+            slot = (slot * 5 + perturb + 1) & mask
+        return slot
+
+    def _lookup(self, key, item_hash: int) -> tuple:
+        """
+        return (index slot, entry) for the key,
+        entry is _EMPTY and slot is the free one if there is no such key
+        """
+        mask = self.size - 1
+        slot = item_hash & mask
+        perturb = item_hash
+        while True:
+            entry = self._indices[slot]
+            if entry == self._EMPTY:
+                return slot, entry
+            if entry >= 0 and self._hashes[entry] == item_hash:
+                found = self._keys[entry]
+                if found is key or found == key:
+                    return slot, entry
+            perturb >>= 5
+            slot = (slot * 5 + perturb + 1) & mask
+
+    def _probe_length(self, item_hash: int, slot: int) -> int:
+        """
+        return position of the index slot in the probe sequence,
+        used only for stats, so lookups don't count steps
+        """
+        mask = self.size - 1
+        current = item_hash & mask
+        perturb = item_hash
+        length = 0
+        while current != slot:
+            perturb >>= 5
+            current = (current * 5 + perturb + 1) & mask
+            length += 1
+        return length
+
+    def _rebuild(self, size: int) -> None:
+        """
+        drop deleted entries and rebuild index with the new size
+        """
+        live = [entry for entry, key in enumerate(self._keys)
+                if key is not self._DELETED]
+        self._hashes = array('Q', [self._hashes[i] for i in live])
+        self._keys = [self._keys[i] for i in live]
+        self._values = [self._values[i] for i in live]
+        self._build_index(size)
+        self._version += 1
+
+    def _stored_entries(self):
+        return itertools.compress(
+            zip(self._keys, self._values, self._hashes),
+            map(is_not, self._keys, itertools.repeat(self._DELETED)))
+
+    def _restore(self, entries) -> None:
+        mask = self.size - 1
+        for key, value, item_hash in entries:
+            self._indices[self._free_slot(item_hash, mask)] = len(self._keys)
+            self._hashes.append(item_hash)
+            self._keys.append(key)
+            self._values.append(value)
+            self._length += 1
+        self._version += 1
+
+    def _get_hashed(self, key, item_hash: int, default) -> Any:
+        slot, entry = self._lookup(key, item_hash)
+        if self.stats is not None:
+            self.stats.record_probe(self._probe_length(item_hash, slot))
+        if entry < 0:
+            return default
+        return self._values[entry]
+
+    def _set_hashed(self, key, value, item_hash: int) -> Any:
+        slot, entry = self._lookup(key, item_hash)
+        if entry >= 0:
+            previous = self._values[entry]
+            self._values[entry] = value
+            return previous
+        if self.filled + 1 > self.max_load * self.size:
+            # new table is filled by half of max_load (3x for 2/3)
+            self._resize(int(2 * (self._length + 1) / self.max_load))
+            slot = self._free_slot(item_hash, self.size - 1)
+        self._indices[slot] = len(self._keys)
+        self._hashes.append(item_hash)
+        self._keys.append(key)
+        self._values.append(value)
+        self._length += 1
+        self._version += 1
+        return None
+
+    def pop(self, key) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        item_hash = self.hash_func(key)
+        slot, entry = self._lookup(key, item_hash)
+        if self.stats is not None:
+            self.stats.record_probe(self._probe_length(item_hash, slot))
+        if entry < 0:
+            return None
+        item = (self._keys[entry], self._values[entry])
+        self._indices[slot] = self._DUMMY
+        self._keys[entry] = self._DELETED
+        self._values[entry] = None
+        self._length -= 1
+        self._version += 1
+        if self._length < self.min_load * self.size:
+            self._shrink()
+        return item
+
+    def _entries(self):
+        """
+        generator of (key, value) tuples in insertion order,
+        raise RuntimeError if the map is changed during iteration
+        """
+        version = self._version
+        for key, value in zip(self._keys, self._values):
+            if key is not self._DELETED:
+                yield key, value
+                if self._version != version:
+                    raise RuntimeError('HashMap changed during iteration')
+
+    def __str__(self) -> str:
+        return str(dict(self.items()))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,154 @@
+"""
+Hash functions (hash strategies) for the HashMap types
+
+Every strategy takes a key and returns a non-negative 64 bit integer,
+the map reduces it to a table index by itself.
+"""
+import numbers
+from hashlib import blake2b
+from typing import Any, Callable, Iterable
+
+MASK_64 = (1 << 64) - 1
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+
+HashFunc = Callable[[Any], int]
+
+
+def mix64(value: int) -> int:
+    """
+    splitmix64 finalizer: spread every input bit over the whole word
+    :param value: int, only low 64 bits are used
+    :return: int in range [0, 2**64)
+    """
+    value &= MASK_64
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & MASK_64
+    return value ^ (value >> 31)
+
+
+def builtin_hash(value: Any) -> int:
+    """
+    Return builtin hash() of the value as unsigned 64 bit integer.
+    str and bytes are hashed with SipHash, int hashes to itself,
+    so dense ranges of int keys never collide
+    """
+    return hash(value) & MASK_64
+
+
+def mixed_hash(value: Any) -> int:
+    """
+    Return builtin hash() passed through the mix64 finalizer,
+    use it for int keys with a common stride (ids multiple of 8 etc.)
+    """
+    return mix64(hash(value))
+
+
+def int_hash(value: int) -> int:
+    """
+    Integer finalizer, works only for int keys
+    """
+    return mix64(value)
+
+
+def _to_bytes(value: Any) -> bytes:
+    """
+    Return stable byte representation of the value, keys that are
+    equal get equal bytes like they get equal hash(): integral numbers
+    (1.0, True, Fraction(1), 1+0j) are encoded as int, other numbers
+    by their builtin hash() which doesn't depend on PYTHONHASHSEED,
+    tuples item by item; other types raise TypeError, their repr()
+    may differ for equal keys
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, str):
+        return value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, tuple):
+        parts = [_to_bytes(item) for item in value]
+        return b''.join(len(part).to_bytes(8, 'little') + part
+                        for part in parts)
+    if isinstance(value, numbers.Number) and not isinstance(value, int):
+        if isinstance(value, complex) and not value.imag:
+            value = value.real
+        try:
+            integral = int(value)
+        except (TypeError, ValueError, OverflowError):
+            integral = None
+        value = integral if integral == value else hash(value)
+    if isinstance(value, int):
+        length = (value.bit_length() + 8) // 8
+        return value.to_bytes(length, 'little', signed=True)
+    raise TypeError(f'hashing: {type(value).__name__} is not supported, '
+                    f'use str, bytes, numbers or tuples of them')
+
+
+def fnv1a_hash(value: Any) -> int:
+    """
+    Return 64 bit FNV-1a hash of the value bytes.
+    Unlike builtin hash() result doesn't depend on PYTHONHASHSEED,
+    so it's the same across processes and runs
+    """
+    result = FNV_OFFSET_BASIS
+    for byte in _to_bytes(value):
+        result = ((result ^ byte) * FNV_PRIME) & MASK_64
+    return result
+
+
+def blake2_hash(value: Any) -> int:
+    """
+    Return 64 bit BLAKE2b digest of the value bytes.
+    Stable across processes like fnv1a_hash, but computed in C,
+    so it's much faster for long keys
+    """
+    return int.from_bytes(blake2b(_to_bytes(value), digest_size=8).digest(),
+                          'little')
+
+
+DEFAULT_HASH = builtin_hash
+
+
+def distribution_report(keys: Iterable,
+                        size: int,
+                        hash_func: HashFunc = DEFAULT_HASH) -> dict:
+    """
+    Show how the keys are spread over a table of the given size
+    :param keys: iterable of keys to check
+    :param size: int, table size
+    :param hash_func: hash strategy to check
+    :return: dict with
+        'keys' - amount of keys,
+        'load_factor' - keys / size,
+        'occupancy' - {keys in bucket: amount of such buckets},
+        'collisions' - keys which don't get their own bucket,
+        'max_chain' - longest chain for separate chaining,
+        'max_probe' - longest probe sequence for linear probing,
+            None if the keys don't fit into the table
+    """
+    buckets = [0] * size
+    indexes = []
+    for key in keys:
+        index = hash_func(key) % size
+        buckets[index] += 1
+        indexes.append(index)
+    occupancy = {}
+    for chain in buckets:
+        occupancy[chain] = occupancy.get(chain, 0) + 1
+    max_probe = None
+    if len(indexes) <= size:
+        slots = [False] * size
+        max_probe = 0
+        for index in indexes:
+            probe = 0
+            while slots[(index + probe) % size]:
+                probe += 1
+            slots[(index + probe) % size] = True
+            max_probe = max(max_probe, probe)
+    return {
+        'keys': len(indexes),
+        'load_factor': len(indexes) / size,
+        'occupancy': dict(sorted(occupancy.items())),
+        'collisions': len(indexes) - (size - occupancy.get(0, 0)),
+        'max_chain': max(buckets, default=0),
+        'max_probe': max_probe,
+    }
@@ -0,0 +1,277 @@
+"""
+Indexed sequence type implementation (implicit treap)
+
+The tree is ordered by position: a node doesn't store its index, it's
+the size of everything on the left, so every node keeps the size of its
+subtree. Random priorities keep the tree balanced in expectation
+(max-heap by priority), which makes positional insert, pop, get, set,
+split and concat O(log n)
+"""
+import random
+from typing import Any
+
+
+class IndexedListItem:
+    """
+    Node of the implicit treap, contains data, random priority,
+    size of the subtree and links to the children
+    """
+    __slots__ = ('data', 'priority', 'size', 'left', 'right')
+
+    def __init__(self, data: Any, priority: float) -> None:
+        self.data = data
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _size(node: IndexedListItem | None) -> int:
+    return node.size if node is not None else 0
+
+
+def _split(node: IndexedListItem | None, index: int) -> tuple:
+    """
+    split the subtree into (first 'index' items, the rest)
+    """
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if index <= left_size:
+        left, node.left = _split(node.left, index)
+        node.size -= _size(left)
+        return left, node
+    node.right, right = _split(node.right, index - left_size - 1)
+    node.size -= _size(right)
+    return node, right
+
+
+def _merge(left: IndexedListItem | None,
+           right: IndexedListItem | None) -> IndexedListItem | None:
+    """
+    return subtree of all items of 'left' followed by all of 'right'
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.size += right.size
+        left.right = _merge(left.right, right)
+        return left
+    right.size += left.size
+    right.left = _merge(left, right.left)
+    return right
+
+
+def _post_order(root: IndexedListItem):
+    """
+    return nodes of the subtree, children go before their parent
+    """
+    stack = [root]
+    result = []
+    while stack:
+        node = stack.pop()
+        result.append(node)
+        if node.left is not None:
+            stack.append(node.left)
+        if node.right is not None:
+            stack.append(node.right)
+    return reversed(result)
+
+
+class IndexedList:
+    """
+    Sequence with O(log n) insert, pop, get and set by index and
+    O(log n) split and concat, alternative to LinkedList and ArrayList
+    for heavy positional inserts into large sequences
+    :param initializer: optional, iterable, the tree is built in O(n)
+    :param seed: optional, seed of the priorities generator
+    :return: None
+    """
+    def __init__(self, initializer=None, seed=None) -> None:
+        self._random = random.Random(seed).random
+        self._root = None
+        if initializer:
+            self._root = self._build(initializer)
+
+    def _build(self, items) -> IndexedListItem | None:
+        """
+        return treap of the items: Cartesian tree is built with a stack
+        of the right spine, then sizes are counted bottom-up
+        """
+        spine = []
+        for item in items:
+            node = IndexedListItem(item, self._random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        if not spine:
+            return None
+        # children come before parents in post-order, so sizes are ready
+        for node in _post_order(spine[0]):
+            node.size = 1 + _size(node.left) + _size(node.right)
+        return spine[0]
+
+    def _check_index(self, index: int) -> int:
+        """
+        return non-negative index, negative one counts from the end
+        """
+        length = _size(self._root)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('IndexedList: index error')
+        return index
+
+    def _node_at(self, index: int) -> IndexedListItem:
+        node = self._root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def insert(self, item, index):
+        """
+        add new item in front of the item with the index,
+        index equal to length adds item to back
+        raise exception if index is out of list size
+        """
+        if not 0 <= index <= _size(self._root):
+            raise IndexError('IndexedList: insert index error')
+        new_item = IndexedListItem(item, self._random())
+        parent, node, to_left = None, self._root, False
+        # descend while nodes stay above the new one in the heap
+        while node is not None and node.priority > new_item.priority:
+            node.size += 1
+            left_size = _size(node.left)
+            parent = node
+            to_left = index <= left_size
+            if to_left:
+                node = node.left
+            else:
+                index -= left_size + 1
+                node = node.right
+        new_item.size += _size(node)
+        new_item.left, new_item.right = _split(node, index)
+        if parent is None:
+            self._root = new_item
+        elif to_left:
+            parent.left = new_item
+        else:
+            parent.right = new_item
+
+    def add_front(self, item):
+        """
+        add item to front of the list (create new head)
+        """
+        self.insert(item, 0)
+
+    def add_back(self, item):
+        """
+        add item to back of the list (create new tail)
+        """
+        self.insert(item, _size(self._root))
+
+    def pop(self, index=-1):
+        """
+        remove item from position index and return it
+        """
+        try:
+            index = self._check_index(index)
+        except IndexError:
+            raise IndexError('IndexedList: pop index error') from None
+        parent, node, to_left = None, self._root, False
+        while True:
+            left_size = _size(node.left)
+            if index == left_size:
+                break
+            node.size -= 1
+            parent = node
+            to_left = index < left_size
+            if to_left:
+                node = node.left
+            else:
+                index -= left_size + 1
+                node = node.right
+        rest = _merge(node.left, node.right)
+        if parent is None:
+            self._root = rest
+        elif to_left:
+            parent.left = rest
+        else:
+            parent.right = rest
+        return node.data
+
+    def split(self, index: int) -> 'IndexedList':
+        """
+        cut the list at the index: this list keeps items before it,
+        the rest are moved to new list which is returned
+        """
+        if not 0 <= index <= len(self):
+            raise IndexError('IndexedList: split index error')
+        result = IndexedList()
+        result._random = self._random
+        self._root, result._root = _split(self._root, index)
+        return result
+
+    def concat(self, other: 'IndexedList') -> None:
+        """
+        move all items of the other list to back of this list,
+        the other list becomes empty
+        """
+        if other is self:
+            raise ValueError('IndexedList: can not concat itself')
+        self._root = _merge(self._root, other._root)
+        other._root = None
+
+    def head(self):
+        """
+        return head of the list
+        """
+        if self._root is None:
+            raise IndexError('IndexedList: is empty')
+        return self._node_at(0).data
+
+    def tail(self):
+        """
+        return tail of the list
+        """
+        if self._root is None:
+            raise IndexError('IndexedList: is empty')
+        return self._node_at(self._root.size - 1).data
+
+    def __getitem__(self, index: int):
+        """
+        return item by index
+        """
+        return self._node_at(self._check_index(index)).data
+
+    def __setitem__(self, index: int, value) -> None:
+        """
+        set item by index
+        """
+        self._node_at(self._check_index(index)).data = value
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __iter__(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.data
+            node = node.right
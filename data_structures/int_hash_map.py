@@ -0,0 +1,311 @@
+"""
+HashMap for int64 keys and numeric values backed by NumPy arrays,
+batch operations hash and probe the whole batch with vectorized code
+"""
+from typing import Any
+
+from data_structures.hash_map import (
+    HashMapItemsView, HashMapKeysView, HashMapValuesView, table_size
+)
+from data_structures.hashing import int_hash
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only IntHashMap needs it
+    np = None
+
+_MIX_1 = 0xbf58476d1ce4e5b9
+_MIX_2 = 0x94d049bb133111eb
+
+
+def int_hash_many(keys) -> Any:
+    """
+    Vectorized data_structures.hashing.int_hash (splitmix64 finalizer)
+    :param keys: int64 ndarray
+    :return: uint64 ndarray
+    """
+    value = keys.astype(np.uint64)
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(_MIX_1)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(_MIX_2)
+    return value ^ (value >> np.uint64(31))
+
+
+class IntHashMap:
+    """
+    Open addressing (linear probing) HashMap for int64 keys and numeric
+    values stored in NumPy arrays. Single key API is the same as
+    HashMapOpenAddressing has, get_many/put_many/contains_many/pop_many
+    work on whole ndarrays: every probe step is done for all unresolved
+    keys of the batch at once
+    :param size: int, hashmap size rounded up to power of two, by default=8
+    :param dtype: NumPy dtype of values, by default=float64
+    :return: None
+    """
+    max_load = 0.5
+
+    def __init__(self, size=8, dtype=None) -> None:
+        if np is None:
+            raise ImportError('IntHashMap: numpy is required')
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self._length = 0
+        self._version = 0
+        self._allocate(table_size(size))
+
+    def _allocate(self, size: int) -> None:
+        self.size = size
+        self._mask = size - 1
+        self._keys = np.zeros(size, dtype=np.int64)
+        self._values = np.zeros(size, dtype=self.dtype)
+        self._used = np.zeros(size, dtype=bool)
+
+    @classmethod
+    def from_arrays(cls, keys, values, dtype=None):
+        """
+        return new map with keys and values from the arrays
+        """
+        hash_map = cls(dtype=dtype)
+        hash_map.put_many(keys, values)
+        return hash_map
+
+    def _home(self, key: int) -> int:
+        return int_hash(key) & self._mask
+
+    def _probe(self, key: int) -> int:
+        """
+        return slot index of the key or index of the empty slot
+        where the key has to be placed
+        """
+        index = self._home(key)
+        used, keys = self._used, self._keys
+        while used[index] and keys[index] != key:
+            index = (index + 1) & self._mask
+        return index
+
+    def _find_many(self, keys) -> tuple:
+        """
+        return (slots, found) arrays: slot of every key and whether
+        the key is there, slot of absent key is the empty slot
+        which ends its probe sequence
+        """
+        slots = (int_hash_many(keys) & np.uint64(self._mask)).astype(np.intp)
+        found = np.zeros(len(keys), dtype=bool)
+        pending = np.arange(len(keys))
+        while pending.size:
+            current = slots[pending]
+            used = self._used[current]
+            hit = used & (self._keys[current] == keys[pending])
+            found[pending[hit]] = True
+            pending = pending[used & ~hit]
+            slots[pending] = (slots[pending] + 1) & self._mask
+        return slots, found
+
+    def _place_many(self, keys, values) -> None:
+        """
+        put new unique keys to the table, in every round each pending
+        key either takes its free slot (one key per slot wins)
+        or moves to the next slot
+        """
+        positions = (int_hash_many(keys)
+                     & np.uint64(self._mask)).astype(np.intp)
+        while keys.size:
+            free = np.flatnonzero(~self._used[positions])
+            _, first = np.unique(positions[free], return_index=True)
+            winners = free[first]
+            slots = positions[winners]
+            self._keys[slots] = keys[winners]
+            self._values[slots] = values[winners]
+            self._used[slots] = True
+            rest = np.ones(keys.size, dtype=bool)
+            rest[winners] = False
+            keys, values = keys[rest], values[rest]
+            positions = (positions[rest] + 1) & self._mask
+
+    def _resize(self, size: int) -> None:
+        """
+        rebuild hash table with the new size
+        """
+        keys, values = self._keys[self._used], self._values[self._used]
+        self._allocate(size)
+        self._place_many(keys, values)
+        self._version += 1
+
+    def reserve(self, amount: int) -> None:
+        """
+        expand hash table at once, so it can hold 'amount' items
+        without further expansions
+        """
+        size = self.size
+        while amount >= self.max_load * size:
+            size *= 2
+        if size != self.size:
+            self._resize(size)
+
+    def get(self, key: int, default=None) -> Any:
+        """
+        return value for the provided key,
+        return 'default' if there is no value for key
+        """
+        index = self._probe(key)
+        if not self._used[index]:
+            return default
+        return self._values[index].item()
+
+    def put(self, key: int, item) -> Any:
+        """
+        set value for the provided key
+        returns value of the previous value if exists, None otherwise
+        """
+        previous = self.get(key)
+        self[key] = item
+        return previous
+
+    def __getitem__(self, key: int) -> Any:
+        """
+        return value for the provided key,
+        raise KeyError if there is no value for key
+        """
+        index = self._probe(key)
+        if not self._used[index]:
+            raise KeyError(key)
+        return self._values[index].item()
+
+    def __setitem__(self, key: int, value) -> None:
+        """
+        set value for the provided key
+        """
+        index = self._probe(key)
+        if not self._used[index]:
+            if self._length + 1 >= self.max_load * self.size:
+                self._resize(self.size * 2)
+                index = self._probe(key)
+            self._keys[index] = key
+            self._used[index] = True
+            self._length += 1
+            self._version += 1
+        self._values[index] = value
+
+    def pop(self, key: int) -> tuple | None:
+        """
+        return element for the provided key and pops it from the map
+        """
+        index = self._probe(key)
+        if not self._used[index]:
+            return None
+        element = (key, self._values[index].item())
+        self._used[index] = False
+        following = index
+        while True:
+            # move back entries which can't be found behind the hole
+            following = (following + 1) & self._mask
+            if not self._used[following]:
+                break
+            home = self._home(int(self._keys[following]))
+            if index <= following:
+                stays = index < home <= following
+            else:
+                stays = home <= following or home > index
+            if not stays:
+                self._keys[index] = self._keys[following]
+                self._values[index] = self._values[following]
+                self._used[index] = True
+                self._used[following] = False
+                index = following
+        self._length -= 1
+        self._version += 1
+        return element
+
+    def get_many(self, keys, default=0) -> Any:
+        """
+        return ndarray of values for the keys ndarray,
+        'default' for keys without value
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        slots, found = self._find_many(keys)
+        result = np.full(len(keys), default, dtype=self.dtype)
+        result[found] = self._values[slots[found]]
+        return result
+
+    def contains_many(self, keys) -> Any:
+        """
+        return bool ndarray, true for keys present in the map
+        """
+        return self._find_many(np.asarray(keys, dtype=np.int64))[1]
+
+    def put_many(self, keys, values) -> None:
+        """
+        set values for the keys, both are ndarrays (or sequences),
+        the last value wins for repeated keys
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=self.dtype)
+        if keys.shape != values.shape:
+            raise ValueError('IntHashMap: keys and values shapes differ')
+        # keep the last occurrence of repeated keys
+        keys, last = np.unique(keys[::-1], return_index=True)
+        values = values[::-1][last]
+        self.reserve(self._length + keys.size)
+        slots, found = self._find_many(keys)
+        self._values[slots[found]] = values[found]
+        new = ~found
+        if new.any():
+            self._place_many(keys[new], values[new])
+            self._length += int(new.sum())
+            self._version += 1
+
+    def pop_many(self, keys) -> list:
+        """
+        pop all the provided keys, return list of popped elements
+        """
+        pop = self.pop
+        return [pop(int(key)) for key in np.asarray(keys, dtype=np.int64)]
+
+    def __contains__(self, key: int) -> bool:
+        return bool(self._used[self._probe(key)])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def _entries(self):
+        """
+        generator of (key, value) tuples in table order,
+        raise RuntimeError if the map is changed during iteration
+        """
+        version = self._version
+        for index in np.flatnonzero(self._used):
+            yield self._keys[index].item(), self._values[index].item()
+            if self._version != version:
+                raise RuntimeError('HashMap changed during iteration')
+
+    def items(self) -> HashMapItemsView:
+        """
+        return live view of (key,value) tuples
+        """
+        return HashMapItemsView(self)
+
+    def keys(self) -> HashMapKeysView:
+        """
+        return live view of map keys
+        """
+        return HashMapKeysView(self)
+
+    def values(self) -> HashMapValuesView:
+        """
+        return live view of map values
+        """
+        return HashMapValuesView(self)
+
+    def __iter__(self):
+        for key, _ in self._entries():
+            yield key
+
+    def arrays(self) -> tuple:
+        """
+        return (keys, values) ndarrays copies in table order
+        """
+        return self._keys[self._used], self._values[self._used]
+
+    def __str__(self) -> str:
+        return str(dict(self._entries()))
@@ -1,12 +1,30 @@
+import operator
 from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain, compress, islice, repeat
+from math import isqrt
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, ArrayList bulk methods use it
+    np = None
+
 
 class ArrayList:
     """
     use 'array' module to create array data structure
     this list works only with items with the same type
+    the array keeps spare capacity which grows geometrically,
+    so add_back and pop from the back are amortized O(1)
+    bulk methods (sum, sort, arithmetic, ...) work on NumPy view
+    of the array memory when NumPy is installed and 'use_numpy'
+    is true, pure Python fallback gives the same results, except
+    that NumPy integer sums and arithmetic wrap around on overflow
+    and float sums may differ in the last bits
     """
+    min_capacity = 8
+    use_numpy = np is not None
 
     def __init__(self, typecode: str, initializer=None) -> None:
         """
@@ -17,18 +35,84 @@ class ArrayList:
         """
         self._data = array(typecode, initializer if initializer else [])
         self._typecode = typecode
+        self._length = len(self._data)
+
+    @property
+    def capacity(self) -> int:
+        """
+        amount of items the list can hold without reallocation
+        """
+        return len(self._data)
+
+    def _set_capacity(self, capacity: int) -> None:
+        """
+        grow or cut the array, items beyond length are spare slots
+        """
+        current = len(self._data)
+        try:
+            if capacity > current:
+                self._data.frombytes(
+                    bytes((capacity - current) * self._data.itemsize))
+            elif capacity < current:
+                del self._data[capacity:]
+        except BufferError:
+            raise BufferError('ArrayList: can not resize while memoryview '
+                              'of the list exists') from None
+
+    def _grow(self, amount: int) -> None:
+        """
+        make room for 'amount' more items, capacity grows at least 1.5x
+        """
+        needed = self._length + amount
+        capacity = len(self._data)
+        if needed > capacity:
+            self._set_capacity(max(needed, capacity + capacity // 2,
+                                   self.min_capacity))
+
+    def reserve(self, amount: int) -> None:
+        """
+        expand capacity at once, so the list can hold 'amount' items
+        without further reallocations
+        """
+        if amount > len(self._data):
+            self._set_capacity(amount)
+
+    def shrink_to_fit(self) -> None:
+        """
+        release spare capacity
+        """
+        self._set_capacity(self._length)
+
+    def _check_index(self, index: int, length: int) -> int:
+        """
+        return non-negative index, negative one counts from the end
+        """
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ArrayList: index error')
+        return index
 
     def insert(self, item, index):
         """
         add new item to the middle of linked list
         raise exception if index is out of list size
         """
+        length = self._length
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+        self._grow(1)
+        data = self._data
         try:
-            item_arr = array(self._typecode, [item])
+            # spare slot takes the item first, so wrong type changes nothing
+            data[length] = item
         except TypeError:
             raise TypeError('ArrayList: Item insertion type error')
-        new_array = self._data[:index] + item_arr + self._data[index:]
-        self._data = new_array
+        if index < length:
+            data[index + 1:length + 1] = data[index:length]
+            data[index] = item
+        self._length = length + 1
 
     def add_front(self, item):
         """
@@ -40,45 +124,364 @@ class ArrayList:
         """
         add item to back of the list (create new tail)
         """
-        self.insert(item, -1)
+        if self._length == len(self._data):
+            self._grow(1)
+        try:
+            self._data[self._length] = item
+        except TypeError:
+            raise TypeError('ArrayList: Item insertion type error')
+        self._length += 1
+
+    def extend(self, items) -> None:
+        """
+        add all items to back of the list, array of the same type
+        is copied as a buffer
+        """
+        if isinstance(items, array) and items.typecode == self._typecode:
+            self.extend_from_buffer(items)
+            return
+        try:
+            extra = array(self._typecode, items)
+        except TypeError:
+            raise TypeError('ArrayList: Item insertion type error')
+        self.extend_from_buffer(extra)
+
+    def extend_from_buffer(self, buffer) -> None:
+        """
+        add items from raw bytes of the buffer (bytes, array, mmap, ...)
+        to back of the list, bytes are copied without conversion
+        """
+        with memoryview(buffer) as source, source.cast('B') as source:
+            itemsize = self._data.itemsize
+            if source.nbytes % itemsize:
+                raise ValueError('ArrayList: buffer size is not a multiple '
+                                 'of item size')
+            self._grow(source.nbytes // itemsize)
+            start = self._length * itemsize
+            with memoryview(self._data) as target, \
+                    target.cast('B') as target:
+                target[start:start + source.nbytes] = source
+            self._length += source.nbytes // itemsize
 
     def pop(self, pos=-1):
         """
         remove element from position pos and return it
         """
+        length = self._length
         try:
-            item = self._data[pos]
+            pos = self._check_index(pos, length)
         except IndexError:
             raise IndexError('ArrayList: pop index error')
-        if pos == -1:
-            self._data = self._data[:-1]
-        else:
-            self._data = self._data[:pos] + self._data[pos + 1:]
+        data = self._data
+        item = data[pos]
+        if pos < length - 1:
+            data[pos:length - 1] = data[pos + 1:length]
+        self._length = length - 1
         return item
 
     def head(self):
         """
         return head of linked list
         """
-        try:
-            return self._data[0]
-        except IndexError:
+        if not self._length:
             raise IndexError('ArrayList: is empty')
+        return self._data[0]
 
     def tail(self):
         """
         return tail of linked list
         """
-        try:
-            return self._data[-1]
-        except IndexError:
+        if not self._length:
             raise IndexError('ArrayList: is empty')
+        return self._data[self._length - 1]
 
     def __len__(self):
-        return self._data.buffer_info()[1]
+        return self._length
+
+    def memoryview(self) -> memoryview:
+        """
+        return memoryview of the items sharing memory with the list,
+        the list can't grow beyond capacity while the view is alive:
+        release() the view or use it in 'with' block
+        """
+        with memoryview(self._data) as view:
+            return view[:self._length]
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """
+        buffer protocol (Python 3.12+): memoryview(array_list),
+        bytes(array_list), file.write(array_list) don't copy items
+        """
+        return self.memoryview()
+
+    def __release_buffer__(self, view: memoryview) -> None:
+        view.release()
+
+    def __getitem__(self, index):
+        """
+        return item by index, slice returns memoryview sharing
+        memory with the list instead of a copy
+        """
+        if isinstance(index, slice):
+            return self.memoryview()[index]
+        try:
+            return self._data[self._check_index(index, self._length)]
+        except IndexError:
+            raise IndexError('ArrayList: index error') from None
+
+    def __setitem__(self, index, value) -> None:
+        """
+        set item by index, slice is set in place from an iterable
+        or a buffer of the same length
+        """
+        if isinstance(index, slice):
+            if not isinstance(value, array) or \
+                    value.typecode != self._typecode:
+                value = array(self._typecode, value)
+            with self.memoryview() as view:
+                view[index] = value
+            return
+        self._data[self._check_index(index, self._length)] = value
+
+    def tobytes(self) -> bytes:
+        """
+        return raw bytes of the items
+        """
+        with self.memoryview() as view:
+            return view.tobytes()
+
+    def tofile(self, file) -> None:
+        """
+        write raw bytes of the items to the binary file
+        with a single write() call
+        """
+        with self.memoryview() as view:
+            file.write(view)
+
+    def fromfile(self, file, amount: int) -> None:
+        """
+        read 'amount' items from the binary file and add them to back
+        of the list, the file is read into the list memory directly;
+        raise EOFError if there are less items, available ones are added
+        """
+        itemsize = self._data.itemsize
+        self._grow(amount)
+        start = self._length * itemsize
+        with memoryview(self._data) as view, view.cast('B') as view:
+            target = view[start:start + amount * itemsize]
+            read = 0
+            while read < target.nbytes:
+                chunk = file.readinto(target[read:])
+                if not chunk:
+                    break
+                read += chunk
+            target.release()
+        self._length += read // itemsize
+        if read < amount * itemsize:
+            raise EOFError('ArrayList: file has not enough items')
+
+    def readinto(self, file) -> int:
+        """
+        overwrite the items with bytes read from the binary file,
+        return amount of read bytes
+        """
+        with self.memoryview() as view, view.cast('B') as view:
+            return file.readinto(view)
+
+    def _numpy(self):
+        """
+        return NumPy array sharing memory with the items,
+        None if NumPy backend can't be used
+        """
+        if not self.use_numpy or self._typecode == 'u':
+            return None
+        return np.frombuffer(self._data, dtype=self._typecode,
+                             count=self._length)
+
+    def _items(self):
+        return islice(self._data, self._length)
+
+    def _from_values(self, values) -> 'ArrayList':
+        """
+        return new list of the values (ndarray or list), typecode
+        of this list is kept if the values fit it, 'd' is used otherwise
+        """
+        if np is not None and isinstance(values, np.ndarray):
+            result = ArrayList(values.dtype.char)
+            result.extend_from_buffer(np.ascontiguousarray(values))
+            return result
+        try:
+            return ArrayList(self._typecode, values)
+        except (TypeError, OverflowError):
+            return ArrayList('d', values)
+
+    def sum(self):
+        """
+        return sum of the items, 0 for empty list
+        """
+        view = self._numpy()
+        if view is None:
+            return sum(self._items())
+        return view.sum().item()
+
+    def min(self):
+        """
+        return the smallest item, raise ValueError if list is empty
+        """
+        if not self._length:
+            raise ValueError('ArrayList: is empty')
+        view = self._numpy()
+        if view is None:
+            return min(self._items())
+        return view.min().item()
+
+    def max(self):
+        """
+        return the largest item, raise ValueError if list is empty
+        """
+        if not self._length:
+            raise ValueError('ArrayList: is empty')
+        view = self._numpy()
+        if view is None:
+            return max(self._items())
+        return view.max().item()
+
+    def mean(self) -> float:
+        """
+        return arithmetic mean of the items,
+        raise ValueError if list is empty
+        """
+        if not self._length:
+            raise ValueError('ArrayList: is empty')
+        view = self._numpy()
+        if view is None:
+            return sum(self._items()) / self._length
+        return view.mean(dtype=np.float64).item()
+
+    def sort(self, reverse=False) -> None:
+        """
+        sort the items in place
+        """
+        view = self._numpy()
+        if view is None:
+            self._data[:self._length] = array(
+                self._typecode, sorted(self._items(), reverse=reverse))
+        elif reverse:
+            view[::-1].sort()
+        else:
+            view.sort()
+
+    def search_sorted(self, value, side='left') -> int:
+        """
+        return index where value has to be inserted into sorted list
+        to keep it sorted, 'side' is 'left' or 'right' (see bisect)
+        """
+        if side not in ('left', 'right'):
+            raise ValueError("ArrayList: side must be 'left' or 'right'")
+        view = self._numpy()
+        if view is None:
+            search = bisect_left if side == 'left' else bisect_right
+            return search(self._data, value, 0, self._length)
+        return int(np.searchsorted(view, value, side))
+
+    def count(self, value) -> int:
+        """
+        return amount of items equal to value
+        """
+        view = self._numpy()
+        if view is None:
+            return operator.countOf(self._items(), value)
+        return int(np.count_nonzero(view == value))
+
+    def index(self, value) -> int:
+        """
+        return index of the first item equal to value,
+        raise ValueError if there is no such item
+        """
+        view = self._numpy()
+        if view is None:
+            try:
+                return operator.indexOf(self._items(), value)
+            except ValueError:
+                raise ValueError('ArrayList: value is not in list') from None
+        found = np.flatnonzero(view == value)
+        if not found.size:
+            raise ValueError('ArrayList: value is not in list')
+        return int(found[0])
+
+    def filter(self, mask) -> 'ArrayList':
+        """
+        return new list of items where mask (iterable of booleans
+        of the same length) is true
+        """
+        if len(mask) != self._length:
+            raise ValueError('ArrayList: mask length differs')
+        view = self._numpy()
+        if view is None:
+            return ArrayList(self._typecode, compress(self._items(), mask))
+        if isinstance(mask, ArrayList) and mask._numpy() is not None:
+            mask = mask._numpy()
+        return self._from_values(view[np.asarray(mask, dtype=bool)])
+
+    def _operand(self, other, numpy: bool):
+        """
+        return the other operand of elementwise operation:
+        scalar, NumPy view or iterator of the other list items
+        """
+        if not isinstance(other, ArrayList):
+            return other if numpy else repeat(other)
+        if len(other) != self._length:
+            raise ValueError('ArrayList: lengths differ')
+        if not numpy:
+            return other._items()
+        view = other._numpy()
+        return np.array(list(other)) if view is None else view
+
+    def _elementwise(self, other, function) -> 'ArrayList':
+        view = self._numpy()
+        if view is None:
+            return self._from_values(
+                list(map(function, self._items(),
+                         self._operand(other, False))))
+        return self._from_values(function(view, self._operand(other, True)))
+
+    def _elementwise_inplace(self, other, function) -> 'ArrayList':
+        result = self._elementwise(other, function)
+        if result._typecode != self._typecode:
+            raise TypeError('ArrayList: result type differs, '
+                            'in place operation is impossible')
+        self._data[:self._length] = result._data[:result._length]
+        return self
+
+    def __add__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.add)
+
+    def __sub__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.sub)
+
+    def __mul__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.mul)
+
+    def __truediv__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.truediv)
+
+    def __radd__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.add)
+
+    def __rmul__(self, other) -> 'ArrayList':
+        return self._elementwise(other, operator.mul)
+
+    def __iadd__(self, other) -> 'ArrayList':
+        return self._elementwise_inplace(other, operator.add)
+
+    def __isub__(self, other) -> 'ArrayList':
+        return self._elementwise_inplace(other, operator.sub)
+
+    def __imul__(self, other) -> 'ArrayList':
+        return self._elementwise_inplace(other, operator.mul)
 
     def __iter__(self):
-        self._iterator = iter(self._data)
+        self._iterator = islice(self._data, self._length)
         return self._iterator
 
     def __next__(self):
@@ -101,6 +504,191 @@ def test_arraylist() -> None:
     assert len(t_arraylist) == 1
     assert t_arraylist.head() == 2
     assert list(t_arraylist) == [2]
+    t_arraylist.add_back(4)
+    assert list(t_arraylist) == [2, 4]
+    assert t_arraylist.tail() == 4
+
+
+def test_arraylist_capacity() -> None:
+    t_arraylist = ArrayList('q')
+    assert t_arraylist.capacity == 0
+    t_arraylist.reserve(100)
+    assert t_arraylist.capacity == 100
+    assert len(t_arraylist) == 0
+    for i in range(1000):
+        t_arraylist.add_back(i)
+    assert list(t_arraylist) == list(range(1000))
+    assert t_arraylist.capacity >= 1000
+    for _ in range(990):
+        t_arraylist.pop()
+    t_arraylist.shrink_to_fit()
+    assert t_arraylist.capacity == 10
+    assert list(t_arraylist) == list(range(10))
+    t_arraylist.insert(-1, 0)
+    t_arraylist.insert(100, 11)
+    t_arraylist.insert(55, -1)
+    assert list(t_arraylist) == [-1] + list(range(10)) + [55, 100]
+    assert t_arraylist.pop(0) == -1
+    assert t_arraylist.pop(-2) == 55
+    assert t_arraylist.pop(5) == 5
+    assert list(t_arraylist) == [0, 1, 2, 3, 4, 6, 7, 8, 9, 100]
+    try:
+        t_arraylist.pop(10)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('Test ArrayList: pop out of range')
+    try:
+        t_arraylist.add_back('x')
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('Test ArrayList: add_back type check')
+    assert len(t_arraylist) == 10
+
+
+def test_arraylist_memoryview() -> None:
+    t_arraylist = ArrayList('i', range(10))
+    t_arraylist.reserve(20)
+    view = t_arraylist.memoryview()
+    assert view.format == 'i'
+    assert view.tolist() == list(range(10))
+    view[0] = 100
+    assert t_arraylist.head() == 100
+    t_arraylist.add_back(10)  # fits into capacity
+    try:
+        t_arraylist.extend(range(100))
+    except BufferError:
+        pass
+    else:
+        raise AssertionError('Test ArrayList: resize with exported view')
+    view.release()
+    t_arraylist.extend(range(100))
+    assert len(t_arraylist) == 111
+
+
+def test_arraylist_slices() -> None:
+    t_arraylist = ArrayList('d', [0.0, 1.0, 2.0, 3.0, 4.0])
+    part = t_arraylist[1:4]
+    assert part.tolist() == [1.0, 2.0, 3.0]
+    part[0] = 10.0
+    assert t_arraylist[1] == 10.0
+    part.release()
+    assert t_arraylist[::2].tolist() == [0.0, 2.0, 4.0]
+    assert t_arraylist[-1] == 4.0
+    t_arraylist[3:5] = [7, 8]
+    t_arraylist[0] = 5.0
+    assert list(t_arraylist) == [5.0, 10.0, 2.0, 7.0, 8.0]
+    try:
+        t_arraylist[5]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('Test ArrayList: index out of range')
+
+
+def test_arraylist_files(tmp_path) -> None:
+    path = tmp_path / 'items.bin'
+    t_arraylist = ArrayList('q', range(1000))
+    with open(path, 'wb') as file:
+        t_arraylist.tofile(file)
+    assert path.stat().st_size == 8000
+    assert t_arraylist.tobytes() == path.read_bytes()
+    loaded = ArrayList('q', [-1])
+    with open(path, 'rb') as file:
+        loaded.fromfile(file, 500)
+        assert list(loaded) == [-1] + list(range(500))
+        try:
+            loaded.fromfile(file, 600)
+        except EOFError:
+            pass
+        else:
+            raise AssertionError('Test ArrayList: fromfile EOFError')
+    assert list(loaded) == [-1] + list(range(1000))
+    with open(path, 'rb') as file:
+        assert loaded.readinto(file) == 8000
+    assert list(loaded) == list(range(1000)) + [999]
+
+
+def test_arraylist_bulk() -> None:
+    for use_numpy in {False, ArrayList.use_numpy}:
+        t_arraylist = ArrayList('i', [5, 3, 1, 4, 3])
+        t_arraylist.use_numpy = use_numpy
+        assert t_arraylist.sum() == 16
+        assert t_arraylist.min() == 1
+        assert t_arraylist.max() == 5
+        assert t_arraylist.mean() == 3.2
+        assert t_arraylist.count(3) == 2
+        assert t_arraylist.index(3) == 1
+        try:
+            t_arraylist.index(7)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Test ArrayList: index of absent value')
+        assert list(t_arraylist.filter([1, 0, 1, 0, 1])) == [5, 1, 3]
+        t_arraylist.sort()
+        assert list(t_arraylist) == [1, 3, 3, 4, 5]
+        assert t_arraylist.search_sorted(3) == 1
+        assert t_arraylist.search_sorted(3, 'right') == 3
+        t_arraylist.sort(reverse=True)
+        assert list(t_arraylist) == [5, 4, 3, 3, 1]
+        empty = ArrayList('d')
+        empty.use_numpy = use_numpy
+        assert empty.sum() == 0
+        try:
+            empty.max()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Test ArrayList: max of empty list')
+
+
+def test_arraylist_arithmetic() -> None:
+    for use_numpy in {False, ArrayList.use_numpy}:
+        t_arraylist = ArrayList('q', [1, 2, 3])
+        t_arraylist.use_numpy = use_numpy
+        other = ArrayList('q', [10, 20, 30])
+        assert list(t_arraylist + other) == [11, 22, 33]
+        assert list(other - t_arraylist) == [9, 18, 27]
+        assert list(t_arraylist * 2) == [2, 4, 6]
+        assert list(2 * t_arraylist) == [2, 4, 6]
+        assert list(t_arraylist / 2) == [0.5, 1.0, 1.5]
+        assert list(t_arraylist * 0.5) == [0.5, 1.0, 1.5]
+        t_arraylist += other
+        t_arraylist *= 2
+        assert list(t_arraylist) == [22, 44, 66]
+        try:
+            t_arraylist += ArrayList('q', [1])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Test ArrayList: lengths check')
+        try:
+            t_arraylist *= 0.5
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('Test ArrayList: in place type check')
+
+
+def test_arraylist_extend() -> None:
+    t_arraylist = ArrayList('i', [1])
+    t_arraylist.extend([2, 3])
+    t_arraylist.extend(x for x in (4, 5))
+    t_arraylist.extend(array('i', [6]))
+    t_arraylist.extend_from_buffer(array('i', [7, 8]).tobytes())
+    assert list(t_arraylist) == [1, 2, 3, 4, 5, 6, 7, 8]
+    try:
+        t_arraylist.extend_from_buffer(b'123')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Test ArrayList: buffer size check')
+    t_arraylist = ArrayList('d')
+    t_arraylist.extend(range(3))
+    assert list(t_arraylist) == [0.0, 1.0, 2.0]
+    assert t_arraylist.tail() == 2.0
 
 
 class LinkedListItem:
@@ -108,6 +696,8 @@ class LinkedListItem:
     Item of the linked list, contains data and link to the next
     element of the list
     """
+    __slots__ = ('data', 'link')
+
     def __init__(self, data: Any) -> None:
         self.data = data
         self.link = None  # Link to the next LinkedListItem
@@ -116,21 +706,14 @@ class LinkedListItem:
 class LinkedList:
     def __init__(self) -> None:
         """
-        Initiate linked list
+        Initiate linked list, the list keeps pointers to both ends,
+        so add_front, add_back, head and tail are O(1)
         :return: None
         """
         self._head = None
+        self._tail = None
         self._length = 0
 
-    def _last_item(self):
-        """
-        Return pointer to the last item of the list
-        """
-        pointer = self._head
-        while pointer.link:
-            pointer = pointer.link
-        return pointer
-
     def add_front(self, item):
         """
         add item to front of the list (create new head)
@@ -138,6 +721,8 @@ class LinkedList:
         new_head = LinkedListItem(item)
         new_head.link = self._head
         self._head = new_head
+        if self._tail is None:
+            self._tail = new_head
         self._length += 1
 
     def add_back(self, item):
@@ -145,11 +730,11 @@ class LinkedList:
         add item to back of the list (create new tail)
         """
         new_tail = LinkedListItem(item)
-        if self._head:
-            pointer = self._last_item()
-            pointer.link = new_tail
-        else:
+        if self._tail is None:
             self._head = new_tail
+        else:
+            self._tail.link = new_tail
+        self._tail = new_tail
         self._length += 1
 
     def insert(self, item, index):
@@ -157,17 +742,20 @@ class LinkedList:
         add new item to the middle of linked list
         raise exception if index is out of list size
         """
-        if self._length < index < 0:
+        if not 0 <= index <= self._length:
             raise IndexError('LinkedList: insert index error')
+        if index == 0:
+            self.add_front(item)
+            return
+        if index == self._length:
+            self.add_back(item)
+            return
         new_item = LinkedListItem(item)
-        if self._head:
-            pointer = self._head
-            for _ in range(index - 1):
-                pointer = pointer.link
-            new_item.link = pointer.link
-            pointer.link = new_item
-        else:
-            self._head = new_item
+        pointer = self._head
+        for _ in range(index - 1):
+            pointer = pointer.link
+        new_item.link = pointer.link
+        pointer.link = new_item
         self._length += 1
 
     def head(self):
@@ -182,9 +770,9 @@ class LinkedList:
         """
         return tail of linked list
         """
-        if not self._head:
+        if not self._tail:
             raise IndexError('LinkedList: is empty')
-        return self._last_item().data
+        return self._tail.data
 
     def __len__(self):
         return self._length
@@ -241,79 +829,885 @@ def test_linkedlist_insert() -> None:
     t_linkedlist.insert('2', 1)
     assert len(t_linkedlist) == 3
     assert list(t_linkedlist) == ['1', '2', '3']
+    t_linkedlist.insert('0', 0)
+    t_linkedlist.insert('4', 4)
+    assert list(t_linkedlist) == ['0', '1', '2', '3', '4']
+    assert t_linkedlist.tail() == '4'
+    t_linkedlist.add_back('5')
+    assert t_linkedlist.tail() == '5'
+    for index in (-1, 7):
+        try:
+            t_linkedlist.insert('x', index)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('IndexError expected')
+    assert len(t_linkedlist) == 6
+
+
+def _identity(value):
+    return value
+
+
+class DoublyLinkedListItem:
+    """
+    Item of the doubly linked list, contains data and links
+    to the previous and the next elements of the list
+    """
+    __slots__ = ('data', 'prev', 'link')
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        self.prev = None  # Link to the previous DoublyLinkedListItem
+        self.link = None  # Link to the next DoublyLinkedListItem
+
+
+class DoublyLinkedList:
+    """
+    Circular doubly linked list with a sentinel item. add and insert
+    methods return the new item: the item is a handle which removes
+    or inserts next to it in O(1), both ends are O(1) as well.
+    Handles must belong to this list, detached ones are rejected
+    """
+    def __init__(self, initializer=None) -> None:
+        """
+        Initiate doubly linked list
+        :param initializer: optional, iterable
+        :return: None
+        """
+        self._root = DoublyLinkedListItem(None)
+        self._clear()
+        if initializer:
+            for item in initializer:
+                self.add_back(item)
+
+    def _clear(self) -> None:
+        self._root.prev = self._root.link = self._root
+        self._length = 0
+
+    def _link_before(self, node: DoublyLinkedListItem,
+                     item) -> DoublyLinkedListItem:
+        new_item = DoublyLinkedListItem(item)
+        previous = node.prev
+        new_item.prev, new_item.link = previous, node
+        previous.link = node.prev = new_item
+        self._length += 1
+        return new_item
+
+    def _unlink(self, node: DoublyLinkedListItem) -> Any:
+        node.prev.link = node.link
+        node.link.prev = node.prev
+        node.prev = node.link = None
+        self._length -= 1
+        return node.data
+
+    def _check_node(self, node: DoublyLinkedListItem) -> None:
+        if node.link is None or node is self._root:
+            raise ValueError('DoublyLinkedList: item is not in the list')
+
+    def _node_at(self, index: int) -> DoublyLinkedListItem:
+        """
+        return item by index, walk starts from the nearer end
+        """
+        if index < self._length // 2:
+            node = self._root.link
+            for _ in range(index):
+                node = node.link
+        else:
+            node = self._root
+            for _ in range(self._length - index):
+                node = node.prev
+        return node
+
+    def add_front(self, item) -> DoublyLinkedListItem:
+        """
+        add item to front of the list (create new head)
+        """
+        return self._link_before(self._root.link, item)
+
+    def add_back(self, item) -> DoublyLinkedListItem:
+        """
+        add item to back of the list (create new tail)
+        """
+        return self._link_before(self._root, item)
+
+    def insert(self, item, index) -> DoublyLinkedListItem:
+        """
+        add new item to the middle of linked list
+        raise exception if index is out of list size
+        """
+        if not 0 <= index <= self._length:
+            raise IndexError('DoublyLinkedList: insert index error')
+        return self._link_before(self._node_at(index), item)
+
+    def insert_before(self, node: DoublyLinkedListItem,
+                      item) -> DoublyLinkedListItem:
+        """
+        add item in front of the list item 'node'
+        """
+        self._check_node(node)
+        return self._link_before(node, item)
+
+    def insert_after(self, node: DoublyLinkedListItem,
+                     item) -> DoublyLinkedListItem:
+        """
+        add item behind the list item 'node'
+        """
+        self._check_node(node)
+        return self._link_before(node.link, item)
+
+    def remove(self, node: DoublyLinkedListItem) -> Any:
+        """
+        remove the list item 'node' and return its data
+        """
+        self._check_node(node)
+        return self._unlink(node)
+
+    def pop_front(self):
+        """
+        remove head of the list and return it
+        """
+        if not self._length:
+            raise IndexError('DoublyLinkedList: is empty')
+        return self._unlink(self._root.link)
+
+    def pop_back(self):
+        """
+        remove tail of the list and return it
+        """
+        if not self._length:
+            raise IndexError('DoublyLinkedList: is empty')
+        return self._unlink(self._root.prev)
+
+    def head(self):
+        """
+        return head of linked list
+        """
+        if not self._length:
+            raise IndexError('DoublyLinkedList: is empty')
+        return self._root.link.data
+
+    def tail(self):
+        """
+        return tail of linked list
+        """
+        if not self._length:
+            raise IndexError('DoublyLinkedList: is empty')
+        return self._root.prev.data
+
+    def find(self, item) -> DoublyLinkedListItem | None:
+        """
+        return the first list item with data equal to item,
+        None if there is no such item
+        """
+        node = self._root.link
+        while node is not self._root:
+            if node.data == item:
+                return node
+            node = node.link
+        return None
+
+    def splice(self, other: 'DoublyLinkedList',
+               node: DoublyLinkedListItem | None = None) -> None:
+        """
+        move all items of the other list in front of the list item
+        'node' (to back of the list if node is None) in O(1),
+        the other list becomes empty
+        """
+        if other is self:
+            raise ValueError('DoublyLinkedList: can not splice itself')
+        if node is None:
+            node = self._root
+        else:
+            self._check_node(node)
+        if not other._length:
+            return
+        first, last = other._root.link, other._root.prev
+        previous = node.prev
+        previous.link, first.prev = first, previous
+        last.link, node.prev = node, last
+        self._length += other._length
+        other._clear()
+
+    def merge(self, other: 'DoublyLinkedList', key=None) -> None:
+        """
+        move items of the other sorted list into this sorted list
+        keeping it sorted, items are relinked without copying,
+        items of this list go first among equal ones;
+        the other list becomes empty
+        """
+        if other is self:
+            raise ValueError('DoublyLinkedList: can not merge itself')
+        if key is None:
+            key = _identity
+        root = self._root
+        current = root.link
+        node = other._root.link
+        while node is not other._root:
+            following = node.link
+            node_key = key(node.data)
+            while current is not root and key(current.data) <= node_key:
+                current = current.link
+            previous = current.prev
+            node.prev, node.link = previous, current
+            previous.link = current.prev = node
+            node = following
+        self._length += other._length
+        other._clear()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        node = self._root.link
+        while node is not self._root:
+            yield node.data
+            node = node.link
+
+    def __reversed__(self):
+        node = self._root.prev
+        while node is not self._root:
+            yield node.data
+            node = node.prev
+
+
+def test_doublylinkedlist() -> None:
+    t_list = DoublyLinkedList()
+    assert len(t_list) == 0
+    assert list(t_list) == []
+    t_list.add_back(2)
+    t_list.add_front(1)
+    t_list.insert(4, 2)
+    t_list.insert(3, 2)
+    assert list(t_list) == [1, 2, 3, 4]
+    assert list(reversed(t_list)) == [4, 3, 2, 1]
+    assert t_list.head() == 1
+    assert t_list.tail() == 4
+    assert t_list.pop_back() == 4
+    assert t_list.pop_front() == 1
+    assert list(t_list) == [2, 3]
+    assert len(t_list) == 2
+    t_list.pop_back()
+    t_list.pop_back()
+    for method in (t_list.pop_back, t_list.pop_front, t_list.head):
+        try:
+            method()
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('IndexError expected')
+
+
+def test_doublylinkedlist_nodes() -> None:
+    t_list = DoublyLinkedList('ace')
+    node = t_list.find('c')
+    t_list.insert_before(node, 'b')
+    t_list.insert_after(node, 'd')
+    assert ''.join(t_list) == 'abcde'
+    assert t_list.remove(node) == 'c'
+    assert ''.join(t_list) == 'abde'
+    assert t_list.find('c') is None
+    try:
+        t_list.remove(node)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError expected')
+    tail = t_list.add_back('f')
+    t_list.remove(tail)
+    assert t_list.tail() == 'e'
+    assert len(t_list) == 4
+
+
+def test_doublylinkedlist_splice_merge() -> None:
+    t_list = DoublyLinkedList([1, 4])
+    other = DoublyLinkedList([2, 3])
+    t_list.splice(other, t_list.find(4))
+    assert list(t_list) == [1, 2, 3, 4]
+    assert len(t_list) == 4 and len(other) == 0
+    other.add_back(5)
+    t_list.splice(other)
+    assert list(t_list) == [1, 2, 3, 4, 5]
+    assert list(reversed(t_list)) == [5, 4, 3, 2, 1]
+    evens = DoublyLinkedList([0, 2, 6, 8])
+    t_list.merge(evens)
+    assert list(t_list) == [0, 1, 2, 2, 3, 4, 5, 6, 8]
+    assert list(reversed(t_list)) == [8, 6, 5, 4, 3, 2, 2, 1, 0]
+    assert len(t_list) == 9 and list(evens) == []
+    words = DoublyLinkedList(['bb', 'dddd'])
+    words.merge(DoublyLinkedList(['a', 'cc', 'eeeee']), key=len)
+    assert list(words) == ['a', 'bb', 'cc', 'dddd', 'eeeee']
+
+
+class UnrolledLinkedListItem:
+    """
+    Item of the unrolled linked list, contains block of elements
+    (list or typed array) and link to the next item of the list
+    """
+    __slots__ = ('items', 'link')
+
+    def __init__(self, items) -> None:
+        self.items = items
+        self.link = None  # Link to the next UnrolledLinkedListItem
+
+
+class UnrolledLinkedList:
+    """
+    Linked list of blocks: every list item holds up to 'block_size'
+    elements, so there is one Python object and one pointer chase
+    per block instead of per element. Blocks are Python lists,
+    or typed arrays (no object per element) if 'typecode' is set.
+    Full block is split in halves on insert, block which becomes
+    less than half full on pop is merged with the next one.
+    Indexed insert, pop and access cost O(n / block_size + block_size).
+    By default block size follows the length, about sqrt(n) (not less
+    than 'min_block_size'), so they are O(sqrt(n)): it's recounted on
+    extend and when a block gets full or is about to be merged.
+    Fixed 'block_size' makes them O(n / block_size); both ends are O(1)
+    """
+    min_block_size = 16
+
+    def __init__(self, typecode: str | None = None, block_size=None,
+                 initializer=None) -> None:
+        """
+        Initiate unrolled linked list
+        :param typecode: optional, b|B|u|h|H|i|I|l|L|q|Q|f|d,
+            blocks are typed arrays if it's set, lists otherwise
+        :param block_size: optional, int, fixed number of elements
+            per block, at least 2; sqrt of the length if it's not set
+        :param initializer: optional, iterable
+        :return: None
+        """
+        if block_size is not None and block_size < 2:
+            raise ValueError('UnrolledLinkedList: block size must be '
+                             'at least 2')
+        self._typecode = typecode
+        self._auto_size = block_size is None
+        self.block_size = block_size or self.min_block_size
+        self._head = None
+        self._tail = None
+        self._length = 0
+        if initializer:
+            self.extend(initializer)
+
+    def _resize_blocks(self, length: int) -> None:
+        """
+        set block size for the list of 'length' elements,
+        unless it's fixed
+        """
+        if self._auto_size:
+            self.block_size = max(self.min_block_size, isqrt(length))
+
+    def _is_full(self, items) -> bool:
+        """
+        return whether the block can't take one more element,
+        block size is recounted before a block is reported full
+        """
+        if len(items) < self.block_size:
+            return False
+        self._resize_blocks(self._length + 1)
+        return len(items) >= self.block_size
+
+    def _block(self, items):
+        """
+        return new block of the items, typed array is created
+        (and items are checked) before any change of the list
+        """
+        if self._typecode is None:
+            return list(items)
+        return array(self._typecode, items)
+
+    def _link_back(self, node: UnrolledLinkedListItem) -> None:
+        if self._tail is None:
+            self._head = node
+        else:
+            self._tail.link = node
+        self._tail = node
+
+    def _locate(self, index: int) -> tuple:
+        """
+        return (previous list item, list item, offset in its block)
+        of the element with non-negative index
+        """
+        previous, node = None, self._head
+        while index >= len(node.items):
+            index -= len(node.items)
+            previous, node = node, node.link
+        return previous, node, index
+
+    def _split(self, node: UnrolledLinkedListItem) -> None:
+        """
+        move the second half of the block to new list item behind it
+        """
+        half = len(node.items) // 2
+        new_item = UnrolledLinkedListItem(node.items[half:])
+        del node.items[half:]
+        new_item.link = node.link
+        node.link = new_item
+        if self._tail is node:
+            self._tail = new_item
+
+    def _unlink(self, previous, node: UnrolledLinkedListItem) -> None:
+        if previous is None:
+            self._head = node.link
+        else:
+            previous.link = node.link
+        if self._tail is node:
+            self._tail = previous
+
+    def add_front(self, item):
+        """
+        add item to front of the list (create new head)
+        """
+        head = self._head
+        if head is None or self._is_full(head.items):
+            new_head = UnrolledLinkedListItem(self._block((item,)))
+            new_head.link = head
+            self._head = new_head
+            if self._tail is None:
+                self._tail = new_head
+        else:
+            head.items.insert(0, item)
+        self._length += 1
+
+    def add_back(self, item):
+        """
+        add item to back of the list (create new tail)
+        """
+        tail = self._tail
+        if tail is None or self._is_full(tail.items):
+            self._link_back(UnrolledLinkedListItem(self._block((item,))))
+        else:
+            tail.items.append(item)
+        self._length += 1
+
+    def extend(self, items) -> None:
+        """
+        add all items to back of the list, blocks are filled up
+        """
+        if hasattr(items, '__len__'):
+            self._resize_blocks(self._length + len(items))
+        iterator = iter(items)
+        block_size = self.block_size
+        while True:
+            tail = self._tail
+            if tail is not None and len(tail.items) < block_size:
+                extra = self._block(
+                    islice(iterator, block_size - len(tail.items)))
+                tail.items.extend(extra)
+                self._length += len(extra)
+                if len(tail.items) < block_size:
+                    return
+            extra = self._block(islice(iterator, block_size))
+            if not extra:
+                return
+            self._link_back(UnrolledLinkedListItem(extra))
+            self._length += len(extra)
+            if self._auto_size and block_size ** 2 < self._length:
+                self._resize_blocks(self._length)
+                block_size = self.block_size
+
+    def insert(self, item, index):
+        """
+        add new item to the middle of linked list
+        raise exception if index is out of list size
+        """
+        if not 0 <= index <= self._length:
+            raise IndexError('UnrolledLinkedList: insert index error')
+        if index == self._length:
+            self.add_back(item)
+            return
+        _, node, offset = self._locate(index)
+        if self._is_full(node.items):
+            self._split(node)
+            if offset > len(node.items):
+                offset -= len(node.items)
+                node = node.link
+        node.items.insert(offset, item)
+        self._length += 1
+
+    def pop(self, index=-1):
+        """
+        remove element from position index and return it
+        """
+        length = self._length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('UnrolledLinkedList: pop index error')
+        tail = self._tail
+        start = length - len(tail.items)
+        if index >= start and len(tail.items) > 1:
+            self._length -= 1
+            return tail.items.pop(index - start)
+        previous, node, offset = self._locate(index)
+        item = node.items.pop(offset)
+        self._length -= 1
+        following = node.link
+        if not node.items:
+            self._unlink(previous, node)
+            return item
+        self._resize_blocks(self._length)
+        if len(node.items) < self.block_size // 2 and following and \
+                len(node.items) + len(following.items) <= self.block_size:
+            node.items.extend(following.items)
+            self._unlink(node, following)
+        return item
+
+    def __getitem__(self, index: int):
+        """
+        return element by index
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('UnrolledLinkedList: index error')
+        _, node, offset = self._locate(index)
+        return node.items[offset]
+
+    def __setitem__(self, index: int, value) -> None:
+        """
+        set element by index
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('UnrolledLinkedList: index error')
+        _, node, offset = self._locate(index)
+        node.items[offset] = value
+
+    def head(self):
+        """
+        return head of linked list
+        """
+        if not self._head:
+            raise IndexError('UnrolledLinkedList: is empty')
+        return self._head.items[0]
+
+    def tail(self):
+        """
+        return tail of linked list
+        """
+        if not self._tail:
+            raise IndexError('UnrolledLinkedList: is empty')
+        return self._tail.items[-1]
+
+    def _blocks(self):
+        node = self._head
+        while node is not None:
+            yield node.items
+            node = node.link
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks())
+
+
+def test_unrolledlinkedlist() -> None:
+    for typecode in (None, 'q'):
+        t_list = UnrolledLinkedList(typecode, block_size=4)
+        assert len(t_list) == 0
+        assert list(t_list) == []
+        t_list.add_back(2)
+        t_list.add_front(1)
+        t_list.insert(3, 2)
+        assert list(t_list) == [1, 2, 3]
+        assert t_list.head() == 1
+        assert t_list.tail() == 3
+        for item in range(4, 20):
+            t_list.add_back(item)
+        for item in range(0, -10, -1):
+            t_list.add_front(item)
+        expected = list(range(-9, 20))
+        assert list(t_list) == expected
+        assert len(t_list) == len(expected)
+        assert t_list[5] == expected[5]
+        assert t_list[-1] == 19
+        t_list[0] = 100
+        assert t_list.head() == 100
+        t_list[0] = -9
+        for index in (-1, len(t_list) + 1):
+            try:
+                t_list.insert(0, index)
+            except IndexError:
+                pass
+            else:
+                raise AssertionError('IndexError expected')
+
+
+def test_unrolledlinkedlist_blocks() -> None:
+    for typecode in (None, 'i'):
+        t_list = UnrolledLinkedList(typecode, block_size=4,
+                                    initializer=range(10))
+        assert [len(block) for block in t_list._blocks()] == [4, 4, 2]
+        t_list.insert(-1, 1)
+        assert [len(block) for block in t_list._blocks()] == [3, 2, 4, 2]
+        expected = [0, -1] + list(range(1, 10))
+        assert list(t_list) == expected
+        while len(t_list) > 2:
+            index = len(t_list) // 2
+            assert t_list.pop(index) == expected.pop(index)
+            assert list(t_list) == expected
+            assert all(t_list._blocks())
+        assert t_list.pop() == expected[-1]
+        assert t_list.pop(0) == expected[0]
+        assert list(t_list._blocks()) == []
+        t_list.add_back(5)
+        assert t_list.head() == t_list.tail() == 5
+        try:
+            t_list.pop(1)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('IndexError expected')
+    t_list = UnrolledLinkedList('b')
+    try:
+        t_list.extend([1, 2, 1000])
+    except OverflowError:
+        pass
+    else:
+        raise AssertionError('OverflowError expected')
+    assert len(t_list) == 0 and list(t_list) == []
+
+
+def test_unrolledlinkedlist_auto_size() -> None:
+    t_list = UnrolledLinkedList(initializer=range(10000))
+    assert t_list.block_size == 100
+    assert max(len(block) for block in t_list._blocks()) == 100
+    t_list = UnrolledLinkedList('q', initializer=iter(range(10000)))
+    assert t_list.block_size <= 100
+    assert len(list(t_list._blocks())) < 2 * 100
+    t_list = UnrolledLinkedList()
+    for item in range(10000):
+        t_list.insert(item, item // 2)
+    assert 90 <= t_list.block_size <= 100
+    assert len(list(t_list._blocks())) < 4 * 100
+    while len(t_list) > 100:
+        t_list.pop(len(t_list) // 3)
+    assert t_list.block_size == UnrolledLinkedList.min_block_size
+    assert UnrolledLinkedList(block_size=4, initializer=range(100)) \
+        .block_size == 4
 
 
 class Deque:
-    def __init__(self, initializer=None, maxlength=None) -> None:
+    """
+    Deque on a circular buffer: the buffer is a list which capacity
+    is a power of two, head index and length select the items,
+    so adding and removing at both ends and indexed access are O(1).
+    The buffer doubles when it's full (never beyond maxlength
+    rounded up to a power of two).
+    If 'maxlength' is reached adding raises BufferError, or with
+    'overwrite' the item on the opposite end is dropped, so the deque
+    is a sliding window over the last 'maxlength' items
+    """
+    min_capacity = 8
+
+    def __init__(self, initializer=None, maxlength=None,
+                 overwrite=False) -> None:
         """
         Initiate data and iterator objects
         :param initializer: optional, iterable
         :param maxlength: optional, integer
+        :param overwrite: bool, drop the oldest items instead
+            of raising BufferError when maxlength is reached
         :return: None
         """
         self.maxlength = maxlength
-        self._check_capacity(len(initializer))
-        self._data = list(initializer if initializer else [])
+        self.overwrite = overwrite
+        items = list(initializer) if initializer is not None else []
+        if self.maxlength and len(items) > self.maxlength:
+            if not overwrite:
+                raise BufferError('Deque: max length exceeded')
+            items = items[len(items) - self.maxlength:]
+        capacity = self.min_capacity
+        while capacity < len(items):
+            capacity *= 2
+        self._data = items + [None] * (capacity - len(items))
+        self._mask = capacity - 1
+        self._head = 0
+        self._length = len(items)
 
-    def _check_capacity(self, length):
-        if self.maxlength and length > self.maxlength:
-            raise BufferError('Deque: max length exceeded')
+    def _ordered(self) -> list:
+        """
+        return list of the items from head to tail
+        """
+        end = self._head + self._length
+        if end <= len(self._data):
+            return self._data[self._head:end]
+        return self._data[self._head:] + self._data[:end & self._mask]
+
+    def _make_room(self, at_back: bool) -> None:
+        """
+        prepare room for one more item: drop the item of the other end
+        if maxlength is reached and the deque overwrites,
+        grow the buffer if it's full
+        """
+        if self.maxlength and self._length >= self.maxlength:
+            if not self.overwrite:
+                raise BufferError('Deque: max length exceeded')
+            if at_back:
+                self._pop_front()
+            else:
+                self._pop_back()
+        if self._length == len(self._data):
+            items = self._ordered()
+            self._data = items + [None] * len(items)
+            self._mask = len(self._data) - 1
+            self._head = 0
 
     def add_front(self, item):
         """
         add item to front of the deque (create new head)
         """
-        self._check_capacity(len(self) + 1)
-        self._data.insert(0, item)
+        if self._length == len(self._data) or self.maxlength and \
+                self._length >= self.maxlength:
+            self._make_room(False)
+        self._head = (self._head - 1) & self._mask
+        self._data[self._head] = item
+        self._length += 1
 
     def add_back(self, item):
         """
         add item to back of the deque (create new tail)
         """
-        self._check_capacity(len(self) + 1)
-        self._data.append(item)
+        if self._length == len(self._data) or self.maxlength and \
+                self._length >= self.maxlength:
+            self._make_room(True)
+        self._data[(self._head + self._length) & self._mask] = item
+        self._length += 1
+
+    def extend(self, items) -> None:
+        """
+        add all items to back of the deque
+        """
+        add_back = self.add_back
+        for item in items:
+            add_back(item)
+
+    def extend_front(self, items) -> None:
+        """
+        add all items to front of the deque one by one,
+        so they end up in reversed order
+        """
+        add_front = self.add_front
+        for item in items:
+            add_front(item)
+
+    def _pop_front(self):
+        item = self._data[self._head]
+        self._data[self._head] = None
+        self._head = (self._head + 1) & self._mask
+        self._length -= 1
+        return item
+
+    def _pop_back(self):
+        index = (self._head + self._length - 1) & self._mask
+        item = self._data[index]
+        self._data[index] = None
+        self._length -= 1
+        return item
 
     def pop_front(self):
         """
         remove head item from the deque and return it
         """
-        try:
-            return self._data.pop(0)
-        except IndexError:
+        if not self._length:
             raise IndexError('Deque: is empty')
+        return self._pop_front()
 
     def pop_back(self):
         """
         remove tail item from the deque and return it
         """
-        try:
-            return self._data.pop()
-        except IndexError:
+        if not self._length:
             raise IndexError('Deque: is empty')
+        return self._pop_back()
+
+    def pop_many(self, amount: int) -> list:
+        """
+        remove up to 'amount' items from front of the deque
+        and return list of them from head
+        """
+        amount = max(min(amount, self._length), 0)
+        head, capacity = self._head, len(self._data)
+        end = min(head + amount, capacity)
+        items = self._data[head:end]
+        self._data[head:end] = [None] * (end - head)
+        rest = amount - (end - head)
+        if rest:
+            items += self._data[:rest]
+            self._data[:rest] = [None] * rest
+        self._head = (head + amount) & self._mask
+        self._length -= amount
+        return items
+
+    def rotate(self, steps=1) -> None:
+        """
+        rotate the deque 'steps' to the right (tail items move
+        to front), negative steps rotate to the left
+        """
+        if self._length < 2:
+            return
+        steps %= self._length
+        if self._length == len(self._data):
+            self._head = (self._head - steps) & self._mask
+        elif steps <= self._length // 2:
+            for _ in range(steps):
+                item = self._pop_back()
+                self._head = (self._head - 1) & self._mask
+                self._data[self._head] = item
+                self._length += 1
+        else:
+            for _ in range(self._length - steps):
+                item = self._pop_front()
+                self._data[(self._head + self._length) & self._mask] = item
+                self._length += 1
 
     def head(self):
         """
         return head of the deque
         """
-        try:
-            return self._data[0]
-        except IndexError:
+        if not self._length:
             raise IndexError('Deque: is empty')
+        return self._data[self._head]
 
     def tail(self):
         """
         return tail of the deque
         """
-        try:
-            return self._data[-1]
-        except IndexError:
+        if not self._length:
             raise IndexError('Deque: is empty')
+        return self._data[(self._head + self._length - 1) & self._mask]
+
+    def _index(self, index: int) -> int:
+        """
+        return buffer index of the item, negative index counts from tail
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Deque: index error')
+        return (self._head + index) & self._mask
+
+    def __getitem__(self, index: int):
+        """
+        return item by index
+        """
+        return self._data[self._index(index)]
+
+    def __setitem__(self, index: int, value) -> None:
+        """
+        set item by index
+        """
+        self._data[self._index(index)] = value
 
     def __len__(self):
-        return len(self._data)
+        return self._length
 
     def __iter__(self):
-        self._iterator = iter(self._data)
+        self._iterator = iter(self._ordered())
         return self._iterator
 
     def __next__(self):
@@ -340,3 +1734,78 @@ def test_deque() -> None:
     assert t_deque.pop_front() == 1
     assert t_deque.pop_back() == 5
     assert list(t_deque) == [2, 3, 4]
+
+
+def test_deque_ring() -> None:
+    import collections
+    import random
+    assert list(Deque()) == []
+    t_deque = Deque(item * 2 for item in range(3))
+    assert list(t_deque) == [0, 2, 4]
+    expected = collections.deque([0, 2, 4])
+    rng = random.Random(5)
+    for step in range(2000):
+        operation = rng.randrange(4)
+        if operation == 0:
+            t_deque.add_back(step)
+            expected.append(step)
+        elif operation == 1:
+            t_deque.add_front(step)
+            expected.appendleft(step)
+        elif operation == 2 and expected:
+            assert t_deque.pop_back() == expected.pop()
+        elif operation == 3 and expected:
+            assert t_deque.pop_front() == expected.popleft()
+        if expected:
+            index = rng.randrange(-len(expected), len(expected))
+            assert t_deque[index] == expected[index]
+    assert list(t_deque) == list(expected)
+    assert len(t_deque) == len(expected)
+    t_deque[0] = 'first'
+    assert t_deque.head() == 'first'
+    try:
+        assert t_deque[len(expected)]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('IndexError expected')
+
+
+def test_deque_overwrite() -> None:
+    window = Deque(range(10), maxlength=4, overwrite=True)
+    assert list(window) == [6, 7, 8, 9]
+    window.extend(range(10, 13))
+    assert list(window) == [9, 10, 11, 12]
+    window.add_front(8)
+    assert list(window) == [8, 9, 10, 11]
+    window.extend_front([7, 6])
+    assert list(window) == [6, 7, 8, 9]
+    assert len(window) == 4
+    try:
+        Deque(range(10), maxlength=4)
+    except BufferError:
+        pass
+    else:
+        raise AssertionError('BufferError expected')
+
+
+def test_deque_rotate_pop_many() -> None:
+    import collections
+    for length in (0, 1, 5, 8, 13):
+        for steps in (-9, -1, 0, 1, 3, 7, 20):
+            t_deque = Deque(range(length))
+            t_deque.add_front(-1)
+            t_deque.pop_front()
+            expected = collections.deque(range(length))
+            t_deque.rotate(steps)
+            expected.rotate(steps)
+            assert list(t_deque) == list(expected)
+    t_deque = Deque(range(8))
+    t_deque.pop_many(6)
+    t_deque.extend(range(8, 14))
+    assert t_deque.pop_many(5) == [6, 7, 8, 9, 10]
+    assert t_deque.pop_many(0) == []
+    assert t_deque.pop_many(10) == [11, 12, 13]
+    assert len(t_deque) == 0
+    t_deque.add_back(1)
+    assert list(t_deque) == [1]
@@ -0,0 +1,220 @@
+"""
+ArrayList stored in a memory-mapped file
+
+File layout (header numbers are little-endian, items are native):
+    header  64 bytes: magic, version, typecode, byte order, length
+    items   'capacity' slots of the typecode, the first 'length' are used
+
+The items are never read as a whole: pages are loaded from disk only
+when they are touched, so opening is O(1) and memory use follows
+the working set, the OS page cache is shared by all processes mapping
+the file. The file grows in large chunks ('grow_bytes' at least, then
+1.5x of the capacity), close() cuts the spare capacity off.
+The length is written to the header by flush() and close().
+One writer and any amount of read-only readers may map the same file,
+readers see the flushed items appended later after refresh()
+
+usage:
+    with MappedArrayList(path, 'd', mode='w+') as column:
+        column.extend(values)
+    with MappedArrayList(path) as column:
+        total = column.sum()
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import wraps
+
+from data_structures.list import ArrayList
+
+MAGIC = b'DSARRY\x00\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sIccxxQ')
+HEADER_SIZE = 64
+GROW_BYTES = 1 << 24
+_BYTEORDER = sys.byteorder[0].encode('ascii')
+_FILE_MODES = {'r': 'rb', 'r+': 'r+b', 'w+': 'w+b'}
+
+
+def _writing(method):
+    """
+    wrap ArrayList method which changes the items: read-only list
+    raises TypeError before the method touches the mapped memory
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._readonly:
+            raise TypeError('MappedArrayList: is read-only')
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class MappedArrayList(ArrayList):
+    """
+    ArrayList with the items in a memory-mapped file, all ArrayList
+    methods work on the mapped memory; results of the bulk arithmetic
+    are new in-memory ArrayLists
+    :param path: str, path of the file
+    :param typecode: b|B|h|H|i|I|l|L|q|Q|f|d, required for 'w+' mode,
+        for existing file it's checked if provided
+    :param mode: 'r' read-only shared mapping of existing file,
+        'r+' read and write existing file, 'w+' create (truncate) file
+    :param grow_bytes: int, the file grows at least by this amount
+    :return: None
+    """
+    def __init__(self, path: str, typecode: str | None = None, mode='r',
+                 grow_bytes=GROW_BYTES) -> None:
+        if mode not in _FILE_MODES:
+            raise ValueError(f'MappedArrayList: unknown mode {mode}')
+        if mode == 'w+' and typecode is None:
+            raise ValueError('MappedArrayList: typecode is required '
+                             'for new file')
+        self.path = path
+        self._readonly = mode == 'r'
+        self._mmap = None
+        self._file = open(path, _FILE_MODES[mode])
+        try:
+            if mode == 'w+':
+                self._typecode, self._length = typecode, 0
+                self._check_typecode()
+                self._file.write(self._header().ljust(HEADER_SIZE, b'\0'))
+                self._file.flush()
+            else:
+                self._read_header(typecode)
+            self._itemsize = array(self._typecode).itemsize
+            self.min_capacity = max(grow_bytes // self._itemsize, 1)
+            capacity = self._file_capacity()
+            if capacity < self._length:
+                raise ValueError(f'MappedArrayList: {path} is truncated')
+            self._map(capacity)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def _check_typecode(self) -> None:
+        if self._typecode == 'u':
+            raise ValueError('MappedArrayList: typecode u is not supported')
+        array(self._typecode)
+
+    def _header(self) -> bytes:
+        return HEADER.pack(MAGIC, VERSION, self._typecode.encode('ascii'),
+                           _BYTEORDER, self._length)
+
+    def _read_header(self, typecode: str | None) -> None:
+        data = self._file.read(HEADER.size)
+        if len(data) != HEADER.size:
+            raise ValueError(f'MappedArrayList: {self.path} has wrong format')
+        magic, version, stored, byteorder, self._length = HEADER.unpack(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'MappedArrayList: {self.path} has wrong format')
+        if byteorder != _BYTEORDER:
+            raise ValueError('MappedArrayList: file has other byte order')
+        self._typecode = stored.decode('ascii')
+        if typecode is not None and typecode != self._typecode:
+            raise ValueError(f'MappedArrayList: file has typecode '
+                             f'{self._typecode}, not {typecode}')
+        self._check_typecode()
+
+    def _file_capacity(self) -> int:
+        size = os.fstat(self._file.fileno()).st_size
+        return (size - HEADER_SIZE) // self._itemsize
+
+    def _map(self, capacity: int) -> None:
+        """
+        map header and 'capacity' item slots, the file must be that long
+        """
+        access = mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE
+        size = HEADER_SIZE + capacity * self._itemsize
+        self._mmap = mmap.mmap(self._file.fileno(), size, access=access)
+        self._data = self._items_view()
+
+    def _items_view(self) -> memoryview:
+        with memoryview(self._mmap) as view:
+            return view[HEADER_SIZE:].cast(self._typecode)
+
+    def _unmap(self) -> None:
+        """
+        close the mapping, raise BufferError if views of the list exist
+        """
+        self._data.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            self._data = self._items_view()
+            raise BufferError('MappedArrayList: can not remap while '
+                              'memoryview of the list exists') from None
+
+    def _set_capacity(self, capacity: int) -> None:
+        """
+        resize the file to 'capacity' item slots and map it again
+        """
+        if self._readonly:
+            raise TypeError('MappedArrayList: is read-only')
+        if capacity == len(self._data):
+            return
+        self._unmap()
+        os.ftruncate(self._file.fileno(),
+                     HEADER_SIZE + capacity * self._itemsize)
+        self._map(capacity)
+
+    insert = _writing(ArrayList.insert)
+    add_back = _writing(ArrayList.add_back)
+    extend = _writing(ArrayList.extend)
+    extend_from_buffer = _writing(ArrayList.extend_from_buffer)
+    pop = _writing(ArrayList.pop)
+    __setitem__ = _writing(ArrayList.__setitem__)
+    fromfile = _writing(ArrayList.fromfile)
+    readinto = _writing(ArrayList.readinto)
+    sort = _writing(ArrayList.sort)
+    _elementwise_inplace = _writing(ArrayList._elementwise_inplace)
+
+    @property
+    def readonly(self) -> bool:
+        return self._readonly
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def flush(self) -> None:
+        """
+        write the length to the header and changed pages to disk
+        """
+        if self._readonly:
+            return
+        self._mmap[:HEADER.size] = self._header()
+        self._mmap.flush()
+
+    def refresh(self) -> int:
+        """
+        read the length flushed by the writer, map the grown file
+        if needed, return the new length
+        """
+        length = HEADER.unpack_from(self._mmap, 0)[-1]
+        if length > len(self._data):
+            self._unmap()
+            self._map(self._file_capacity())
+        self._length = length
+        return length
+
+    def close(self) -> None:
+        """
+        flush the list, cut spare capacity off and close the file,
+        raise BufferError if views of the list exist
+        """
+        if self.closed:
+            return
+        self.flush()
+        self._unmap()
+        if not self._readonly:
+            os.ftruncate(self._file.fileno(),
+                         HEADER_SIZE + self._length * self._itemsize)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,28 +1,55 @@
 """
 Queue and PrioritizingQueue types implementation
 """
+import operator
+from array import array
+from heapq import nlargest, nsmallest
+from itertools import count, islice
 from typing import Any
 
 
 class Queue:
     """
-    Queue type implementation using list as a data storage
+    Queue type implementation using list as a data storage, or typed
+    array for numeric items if 'typecode' is set. Removed items stay
+    in front of the head index until they are more than half of the
+    storage, then the storage is compacted, so put and remove are
+    amortized O(1)
     :param initializer: optional, iterable
     :param maxlength: optional, integer
+    :param typecode: optional, b|B|u|h|H|i|I|l|L|q|Q|f|d
     :return: None
     """
-    def __init__(self, initializer=None, maxlength=None) -> None:
+    min_compaction = 32  # removed items which are always kept
+    repr_items = 10  # items shown by str() and repr()
+
+    def __init__(self, initializer=None, maxlength=None,
+                 typecode=None) -> None:
         self.maxlength = maxlength
-        if initializer:
-            self._check_capacity(len(initializer))
-            self._data = list(initializer)
-        else:
-            self._data = []
+        self.typecode = typecode
+        self._data = self._storage(initializer if initializer else ())
+        self._check_capacity(len(self._data))
+        self._head = 0
+
+    def _storage(self, items):
+        if self.typecode is None:
+            return list(items)
+        return array(self.typecode, items)
 
     def _check_capacity(self, length):
         if self.maxlength and length > self.maxlength:
             raise BufferError('Queue: max length exceeded')
 
+    def _compact(self) -> None:
+        """
+        drop removed items if they take at least half of the storage
+        """
+        head = self._head
+        if head == len(self._data) or \
+                head >= self.min_compaction and 2 * head >= len(self._data):
+            del self._data[:head]
+            self._head = 0
+
     def put(self, item) -> None:
         """
         put element to the queue
@@ -30,53 +57,94 @@ class Queue:
         self._check_capacity(len(self) + 1)
         self._data.append(item)
 
+    def put_many(self, items) -> None:
+        """
+        put all elements to the queue, nothing is put if they
+        don't fit in maxlength or have wrong type
+        """
+        items = self._storage(items)
+        self._check_capacity(len(self) + len(items))
+        self._data.extend(items)
+
     def get(self) -> Any:
         """
         get element from queue, but doesn't remove it
         """
-        try:
-            return self._data[0]
-        except IndexError:
+        if not len(self):
             raise IndexError('Queue: is empty')
+        return self._data[self._head]
 
     def remove(self) -> Any:
         """
         remove element from queue
         """
-        try:
-            return self._data.pop(0)
-        except IndexError:
+        head = self._head
+        if head == len(self._data):
             raise IndexError('Queue: is empty')
+        item = self._data[head]
+        if self.typecode is None:
+            self._data[head] = None
+        self._head = head + 1
+        self._compact()
+        return item
+
+    def remove_many(self, amount: int) -> list:
+        """
+        remove up to 'amount' elements from queue, return list of them
+        """
+        amount = max(min(amount, len(self)), 0)
+        head = self._head
+        end = head + amount
+        items = self._data[head:end]
+        if self.typecode is None:
+            self._data[head:end] = [None] * amount
+        else:
+            items = items.tolist()
+        self._head = end
+        self._compact()
+        return items
+
+    def _format(self) -> str:
+        """
+        return string of the first 'repr_items' items
+        """
+        items = ' '.join(map(str, islice(self._data, self._head,
+                                         self._head + self.repr_items)))
+        if len(self) > self.repr_items:
+            items += f' ... ({len(self)} items)'
+        return f'<<{items}<'
 
     def __bool__(self) -> bool:
         """
         returns true if there is at least one element in queue
         """
-        return bool(self._data)
+        return len(self._data) > self._head
 
     def __str__(self) -> str:
         """
-        returns string representation of the queue
+        returns string representation of the queue,
+        only the first 'repr_items' items are shown
         """
-        return f'<<{" ".join([str(i) for i in self._data])}<'
+        return self._format()
 
     def __repr__(self) -> str:
         """
-        returns detailed representation of the queue object
+        returns detailed representation of the queue object,
+        only the first 'repr_items' items are shown
         """
-        return f'Queue object: <<{" ".join([str(i) for i in self._data])}<'
+        return f'Queue object: {self._format()}'
 
     def __len__(self) -> int:
         """
         returns length of the queue
         """
-        return len(self._data)
+        return len(self._data) - self._head
 
     def __iter__(self) -> object:
         """
         returns iterator object of the queue
         """
-        self._iterator = iter(self._data)
+        self._iterator = islice(self._data, self._head, None)
         return self._iterator
 
     def __next__(self) -> object:
@@ -120,94 +188,278 @@ def test_queue() -> None:
     assert list(t_queue) == [3]
 
 
+def test_queue_batch() -> None:
+    t_queue = Queue(item for item in range(5))
+    assert list(t_queue) == [0, 1, 2, 3, 4]
+    t_queue.put_many(range(5, 100))
+    for item in range(60):
+        assert t_queue.remove() == item
+    assert t_queue._head < 60
+    assert t_queue.get() == 60
+    assert t_queue.remove_many(30) == list(range(60, 90))
+    assert len(t_queue) == 10
+    assert t_queue.remove_many(20) == list(range(90, 100))
+    assert not t_queue
+    assert t_queue.remove_many(1) == []
+    t_queue = Queue(maxlength=3)
+    try:
+        t_queue.put_many([1, 2, 3, 4])
+    except BufferError:
+        pass
+    else:
+        raise AssertionError('Test Queue: put_many ignores maxlength')
+    assert len(t_queue) == 0
+
+
+def test_queue_typecode() -> None:
+    t_queue = Queue([1.5, 2.5], typecode='d')
+    t_queue.put(3)
+    t_queue.put_many([4.0, 5.0])
+    assert isinstance(t_queue._data, array)
+    assert t_queue.remove() == 1.5
+    assert t_queue.remove_many(2) == [2.5, 3.0]
+    assert list(t_queue) == [4.0, 5.0]
+    try:
+        t_queue.put('x')
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('Test Queue: typed queue accepts str')
+    try:
+        t_queue.put_many([6.0, 'x'])
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('Test Queue: typed queue accepts str')
+    assert list(t_queue) == [4.0, 5.0]
+
+
+def test_queue_repr() -> None:
+    t_queue = Queue([1, 2, 3])
+    assert str(t_queue) == '<<1 2 3<'
+    assert repr(t_queue) == 'Queue object: <<1 2 3<'
+    t_queue = Queue(range(1000000))
+    t_queue.remove()
+    assert str(t_queue) == '<<1 2 3 4 5 6 7 8 9 10 ... (999999 items)<'
+
+
 class PriorityQueue:
     """
-    PriorityQueue type implementation using list as a data storage
+    PriorityQueue type implementation using d-ary heap in a list:
+    put and remove are O(log n), get is O(1), initializer is
+    heapified in O(n). Heap entries are (key, order, item) tuples,
+    'order' counts puts, so items with equal priority are removed
+    in FIFO order and items themselves are never compared
     :param initializer: optional, iterable
     :param maxlength: optional, integer
-    :param revers: optional Boolean
+    :param revers: optional Boolean, the largest item goes first
+    :param key: optional, function of the item which gives its priority
+    :param d: int, children per heap node, by default=4
     :return: None
     """
-    def __init__(self,
-                 initializer=None, maxlength=None, revers=False) -> None:
+    repr_items = 10  # items shown by str() and repr()
+
+    def __init__(self, initializer=None, maxlength=None, revers=False,
+                 key=None, d=4) -> None:
+        if d < 2:
+            raise ValueError('PriorityQueue: d must be at least 2')
         self.maxlength = maxlength
         self.revers = revers
-        if initializer:
-            self._check_capacity(len(initializer))
-            self._data = list(initializer)
-        else:
-            self._data = []
+        self.key = key
+        self.d = d
+        # max-heap keeps FIFO order with negative order numbers
+        self._before = operator.gt if revers else operator.lt
+        self._order = count()
+        self._heap = self._entries(initializer if initializer else ())
+        self._check_capacity(len(self._heap))
+        self._heapify()
 
     def _check_capacity(self, length) -> None:
         if self.maxlength and length > self.maxlength:
             raise BufferError('PriorityQueue: max length exceeded')
 
+    def _entry(self, item) -> tuple:
+        order = next(self._order)
+        return (item if self.key is None else self.key(item),
+                -order if self.revers else order, item)
+
+    def _entries(self, items) -> list:
+        return [self._entry(item) for item in items]
+
+    def _sift_up(self, position: int) -> None:
+        heap, before, d = self._heap, self._before, self.d
+        entry = heap[position]
+        while position:
+            parent = (position - 1) // d
+            if not before(entry, heap[parent]):
+                break
+            heap[position] = heap[parent]
+            position = parent
+        heap[position] = entry
+
+    def _sift_down(self, position: int) -> None:
+        """
+        move the first child up until a leaf is reached, then sift
+        the entry up from there (as heapq does): entry taken from
+        the end of heap usually belongs near the leaves, so it saves
+        comparing it with the first child on every level
+        """
+        heap, before, d = self._heap, self._before, self.d
+        length = len(heap)
+        start = position
+        entry = heap[position]
+        first = d * position + 1
+        while first < length:
+            end = first + d
+            if end > length:
+                end = length
+            best, best_entry = first, heap[first]
+            for child in range(first + 1, end):
+                if before(heap[child], best_entry):
+                    best, best_entry = child, heap[child]
+            heap[position] = best_entry
+            position = best
+            first = d * position + 1
+        while position > start:
+            parent = (position - 1) // d
+            if not before(entry, heap[parent]):
+                break
+            heap[position] = heap[parent]
+            position = parent
+        heap[position] = entry
+
+    def _heapify(self) -> None:
+        for position in range((len(self._heap) - 2) // self.d, -1, -1):
+            self._sift_down(position)
+
+    def _pop_entry(self) -> tuple:
+        heap = self._heap
+        last = heap.pop()
+        if not heap:
+            return last
+        top = heap[0]
+        heap[0] = last
+        self._sift_down(0)
+        return top
+
     def put(self, item) -> None:
         """
         put element to the queue
         """
         self._check_capacity(len(self) + 1)
-        self._data.append(item)
+        self._heap.append(self._entry(item))
+        self._sift_up(len(self._heap) - 1)
 
-    def _get_priority_value(self) -> Any:
+    def put_many(self, items) -> None:
         """
-        return priority value depending on queue order
+        put all elements to the queue, big batch is added
+        by heapifying the whole heap again
         """
-        if self.revers:
-            return max(self._data)
+        entries = self._entries(items)
+        self._check_capacity(len(self) + len(entries))
+        start = len(self._heap)
+        self._heap.extend(entries)
+        if len(entries) > start // 2:
+            self._heapify()
         else:
-            return min(self._data)
+            for position in range(start, len(self._heap)):
+                self._sift_up(position)
 
     def get(self) -> Any:
         """
         get element from queue, but doesn't remove it
         """
-        if self._data:
-            return self._get_priority_value()
-        else:
-            raise IndexError('Queue: is empty')
+        if not self._heap:
+            raise IndexError('PriorityQueue: is empty')
+        return self._heap[0][-1]
 
     def remove(self) -> Any:
         """
         remove element from queue
         """
-        if self._data:
-            remove_value = self._get_priority_value()
-            self._data.remove(remove_value)
-            return remove_value
-        else:
-            raise IndexError('Queue: is empty')
+        if not self._heap:
+            raise IndexError('PriorityQueue: is empty')
+        return self._pop_entry()[-1]
+
+    def remove_many(self, amount: int) -> list:
+        """
+        remove up to 'amount' elements from queue,
+        return list of them in priority order
+        """
+        amount = min(amount, len(self._heap))
+        return [self._pop_entry()[-1] for _ in range(amount)]
+
+    def pushpop(self, item) -> Any:
+        """
+        put element and remove the first one, it's the element itself
+        if it goes before everything in the queue; faster than put()
+        followed by remove()
+        """
+        entry = self._entry(item)
+        heap = self._heap
+        if not heap or not self._before(heap[0], entry):
+            return item
+        top = heap[0]
+        heap[0] = entry
+        self._sift_down(0)
+        return top[-1]
+
+    def replace(self, item) -> Any:
+        """
+        remove the first element and put new one, faster than remove()
+        followed by put(); raise IndexError if queue is empty
+        """
+        if not self._heap:
+            raise IndexError('PriorityQueue: is empty')
+        top = self._heap[0]
+        self._heap[0] = self._entry(item)
+        self._sift_down(0)
+        return top[-1]
+
+    def _format(self) -> str:
+        """
+        return string of the first 'repr_items' items in priority order
+        """
+        first = nlargest if self.revers else nsmallest
+        items = ' '.join(str(entry[-1])
+                         for entry in first(self.repr_items, self._heap))
+        if len(self) > self.repr_items:
+            items += f' ... ({len(self)} items)'
+        return f'<<{items}<'
 
     def __bool__(self) -> bool:
         """
         returns true if there is at least one element in queue
         """
-        return bool(self._data)
+        return bool(self._heap)
 
     def __str__(self) -> str:
         """
-        returns string representation of the queue
+        returns string representation of the queue,
+        only the first 'repr_items' items are shown
         """
-        return f'<<{" ".join([str(i) for i in self._data])}<'
+        return self._format()
 
     def __repr__(self) -> str:
         """
-        returns detailed representation of the queue object
+        returns detailed representation of the queue object,
+        only the first 'repr_items' items are shown
         """
-        return ('PriorityQueue object: <<'
-                f'{" ".join([str(i) for i in self._data])}<')
+        return f'PriorityQueue object: {self._format()}'
 
     def __len__(self) -> int:
         """
         returns length of the queue
         """
-        return len(self._data)
+        return len(self._heap)
 
     def __iter__(self) -> object:
         """
-        returns iterator object of the queue
+        returns iterator object of the queue, items go
+        in priority order (sorted copy of the heap)
         """
-        self._iterator = iter(self._data)
+        entries = sorted(self._heap, reverse=self.revers)
+        self._iterator = map(operator.itemgetter(-1), entries)
         return self._iterator
 
     def __next__(self) -> object:
@@ -255,3 +507,58 @@ def test_priority_queue() -> None:
     assert t_priorityqueue.remove() == 9
     assert t_priorityqueue.remove() == 7
     assert list(t_priorityqueue) == [1]
+
+
+def test_priority_queue_heap() -> None:
+    import random
+    rng = random.Random(3)
+    priority = operator.itemgetter(0)
+    for d in (2, 4, 7):
+        items = [(rng.randrange(50), index) for index in range(500)]
+        t_priorityqueue = PriorityQueue(items[:200], key=priority, d=d)
+        for item in items[200:]:
+            t_priorityqueue.put(item)
+        # FIFO among equal priorities: stable sort gives the same order
+        expected = sorted(items, key=priority)
+        assert t_priorityqueue.get() == expected[0]
+        assert [t_priorityqueue.remove() for _ in items] == expected
+        t_priorityqueue = PriorityQueue(items, revers=True,
+                                        key=priority, d=d)
+        expected = sorted(items, key=lambda item: (-item[0], item[1]))
+        assert list(t_priorityqueue) == expected
+        assert t_priorityqueue.remove_many(len(items)) == expected
+    try:
+        PriorityQueue(d=1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Test PriorityQueue: d=1 is accepted')
+
+
+def test_priority_queue_batch() -> None:
+    t_priorityqueue = PriorityQueue([5, 3], maxlength=6)
+    t_priorityqueue.put_many([4, 1])
+    t_priorityqueue.put_many([2])
+    assert list(t_priorityqueue) == [1, 2, 3, 4, 5]
+    try:
+        t_priorityqueue.put_many([6, 7])
+    except BufferError:
+        pass
+    else:
+        raise AssertionError('Test PriorityQueue: put_many ignores maxlength')
+    assert t_priorityqueue.pushpop(0) == 0
+    assert t_priorityqueue.pushpop(6) == 1
+    assert t_priorityqueue.replace(0) == 2
+    assert t_priorityqueue.remove_many(2) == [0, 3]
+    assert t_priorityqueue.remove_many(10) == [4, 5, 6]
+    assert t_priorityqueue.pushpop(1) == 1
+    try:
+        t_priorityqueue.replace(1)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('Test PriorityQueue: replace on empty queue')
+    t_priorityqueue = PriorityQueue(range(100), revers=True)
+    assert str(t_priorityqueue) == \
+        '<<99 98 97 96 95 94 93 92 91 90 ... (100 items)<'
+    assert repr(PriorityQueue([2, 1])) == 'PriorityQueue object: <<1 2<'
@@ -0,0 +1,245 @@
+"""
+Persistent memory-mapped HashMap type implementation
+
+File layout (all numbers are little-endian):
+    header  64 bytes: magic, version, slots, entries, table offset
+    heap    records (key length u32, value length u32, key, value),
+            append-only, written while the builder streams the items
+    table   'slots' open addressing slots (hash u64, record offset u64),
+            offset 0 marks an empty slot
+
+The file is opened with read-only mmap: opening is O(1), pages are read
+from disk only when keys are touched, and every process opening the file
+shares the same pages of the OS page cache.
+"""
+import contextlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Iterable
+
+from data_structures.hashing import blake2_hash
+
+MAGIC = b'DSHMAP\x00\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQ')
+HEADER_SIZE = 64
+RECORD = struct.Struct('<II')
+SLOT = struct.Struct('<QQ')
+MAX_LOAD = 0.7
+
+
+def _to_bytes(value: Any) -> bytes:
+    """
+    keys and values are stored as bytes, str is encoded to utf-8,
+    other types raise TypeError (bytes(int) would give zero bytes)
+    """
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    raise TypeError(f'PersistentHashMap: {type(value).__name__} is not '
+                    f'supported, use str or bytes')
+
+
+def build(path: str, items: Iterable) -> int:
+    """
+    Write persistent HashMap file from (key, value) items.
+    Items are streamed to the heap, only 16 bytes per item are kept
+    in memory; the last value wins for duplicate keys.
+    The file is written next to 'path' and renamed at the end, so
+    readers never see half-written file
+    :param path: str, path of the file
+    :param items: iterable of (key, value), bytes or str
+    :return: int, amount of unique keys
+    """
+    temp_path = f'{path}.tmp'
+    hashes = array('Q')
+    offsets = array('Q')
+    try:
+        with open(temp_path, 'w+b') as file:
+            file.write(bytes(HEADER_SIZE))
+            offset = HEADER_SIZE
+            for key, value in items:
+                key, value = _to_bytes(key), _to_bytes(value)
+                file.write(RECORD.pack(len(key), len(value)))
+                file.write(key)
+                file.write(value)
+                hashes.append(blake2_hash(key))
+                offsets.append(offset)
+                offset += RECORD.size + len(key) + len(value)
+            table_offset = (offset + 7) // 8 * 8
+            file.write(bytes(table_offset - offset))
+            file.flush()
+
+            slots = 8
+            while len(hashes) > MAX_LOAD * slots:
+                slots *= 2
+            mask = slots - 1
+            table = array('Q', [0]) * (2 * slots)
+            entries = 0
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as heap:
+                for item_hash, offset in zip(hashes, offsets):
+                    key = _read_key(heap, offset)
+                    index = item_hash & mask
+                    while table[2 * index + 1]:
+                        stored = table[2 * index + 1]
+                        if (table[2 * index] == item_hash
+                                and _read_key(heap, stored) == key):
+                            break
+                        index = (index + 1) & mask
+                    else:
+                        entries += 1
+                    table[2 * index] = item_hash
+                    table[2 * index + 1] = offset
+            if sys.byteorder != 'little':
+                table.byteswap()
+            table.tofile(file)
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, 0, slots, entries,
+                                   table_offset))
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        # open() itself may fail, then there is no file to remove
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+    return entries
+
+
+def _read_key(buffer, offset: int) -> bytes:
+    key_length, _ = RECORD.unpack_from(buffer, offset)
+    start = offset + RECORD.size
+    return buffer[start:start + key_length]
+
+
+class PersistentHashMap:
+    """
+    Read-only HashMap stored in a memory-mapped file (see build())
+    Keys may be bytes or str, values are returned as bytes
+    :param path: str, path of the file
+    :return: None
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.size, self._length, self._table_offset = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'PersistentHashMap: {path} has wrong format')
+        self._mask = self.size - 1
+
+    def _find(self, key) -> int:
+        """
+        return record offset for the key, 0 if there is no such key
+        """
+        key = _to_bytes(key)
+        item_hash = blake2_hash(key)
+        index = item_hash & self._mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(
+                self._mmap, self._table_offset + index * SLOT.size)
+            if not offset:
+                return 0
+            if slot_hash == item_hash and _read_key(self._mmap,
+                                                    offset) == key:
+                return offset
+            index = (index + 1) & self._mask
+
+    def _record(self, offset: int) -> tuple:
+        key_length, value_length = RECORD.unpack_from(self._mmap, offset)
+        start = offset + RECORD.size
+        middle = start + key_length
+        return (self._mmap[start:middle],
+                self._mmap[middle:middle + value_length])
+
+    def get(self, key, default=None) -> Any:
+        """
+        return value for the provided key,
+        return 'default' if there is no value for key
+        """
+        offset = self._find(key)
+        return self._record(offset)[1] if offset else default
+
+    def __getitem__(self, key) -> bytes:
+        """
+        return value for the provided key,
+        raise KeyError if there is no value for key
+        """
+        offset = self._find(key)
+        if not offset:
+            raise KeyError(key)
+        return self._record(offset)[1]
+
+    def __contains__(self, key) -> bool:
+        return bool(self._find(key))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def _offsets(self):
+        for index in range(self.size):
+            _, offset = SLOT.unpack_from(
+                self._mmap, self._table_offset + index * SLOT.size)
+            if offset:
+                yield offset
+
+    def items(self):
+        """
+        return iterator over (key,value) tuples in table order
+        """
+        for offset in self._offsets():
+            yield self._record(offset)
+
+    def keys(self):
+        """
+        return iterator over map keys
+        """
+        for offset in self._offsets():
+            yield _read_key(self._mmap, offset)
+
+    def values(self):
+        """
+        return iterator over map values
+        """
+        for offset in self._offsets():
+            yield self._record(offset)[1]
+
+    def __iter__(self):
+        return self.keys()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def compact(source: str, destination: str | None = None) -> int:
+    """
+    Rewrite the file without overwritten (duplicate) records
+    :param source: str, path of the file
+    :param destination: optional str, path of the result, source by default
+    :return: int, amount of keys
+    """
+    with PersistentHashMap(source) as hash_map:
+        return build(destination or source, hash_map.items())
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 4) or sys.argv[1] != 'compact':
+        sys.exit('usage: python -m data_structures.persistent_hash_map '
+                 'compact SOURCE [DESTINATION]')
+    print(compact(*sys.argv[2:]), 'keys')
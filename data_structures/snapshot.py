@@ -0,0 +1,468 @@
+"""
+Streaming binary snapshot (dump/load) of the containers
+
+Stream layout:
+    magic   8 bytes
+    header  pickle frame: type name, format version, byte order, state
+    chunks  pickle frames (lists of objects) and array frames
+            (typecode, raw native-order buffer)
+    end     pickle frame of None
+
+Every chunk holds up to 'chunk_size' elements, so neither side keeps
+more than a chunk of serialized data in memory. Numeric chunks (all
+float or all int64 items), ArrayList, typed Queue and IntHashMap
+buffers and cached hashes are written as raw buffers straight from
+memory and read back with readinto(), no per-element work is done
+for them. PriorityQueue is written in heap order with the order
+numbers of its items, so it's neither sorted nor heapified. HashMaps are
+restored with the cached hashes: keys aren't hashed again when the hash
+strategy gives the same results in the loading process.
+
+usage:
+    with open(path, 'wb') as file:
+        dump(hash_map, file)
+    with open(path, 'rb') as file:
+        hash_map = load(file)
+"""
+import importlib
+import pickle
+import struct
+import sys
+from array import array
+from itertools import count, islice
+from operator import itemgetter
+from typing import Any, BinaryIO
+
+from data_structures.hash_map import (
+    HashMapCollision, HashMapCompact, HashMapIncremental,
+    HashMapOpenAddressing, HashMapRobinHood, HashMapSeparateChaining
+)
+from data_structures.hashing import DEFAULT_HASH, HashFunc
+from data_structures.int_hash_map import IntHashMap
+from data_structures.list import ArrayList, Deque
+from data_structures.my_queue import PriorityQueue, Queue
+from data_structures.stack import Stack
+
+MAGIC = b'DSSNAP\x00\x01'
+VERSION = 1
+PICKLE_FRAME = b'P'
+ARRAY_FRAME = b'A'
+FRAME = struct.Struct('<cQ')  # frame type, payload length in bytes
+CHUNK_SIZE = 1 << 16
+HASH_TOKEN = 'data_structures.snapshot'  # hashed to compare strategies
+
+
+def _write_object(file: BinaryIO, obj: Any) -> None:
+    payload = pickle.dumps(obj, protocol=5)
+    file.write(FRAME.pack(PICKLE_FRAME, len(payload)))
+    file.write(payload)
+
+
+def _write_array(file: BinaryIO, typecode: str, buffer) -> None:
+    """
+    write raw bytes of the buffer (array, ndarray or their slice)
+    """
+    view = memoryview(buffer).cast('B')
+    file.write(FRAME.pack(ARRAY_FRAME, view.nbytes))
+    file.write(typecode.encode('ascii'))
+    file.write(view)
+
+
+def _read_exact(file: BinaryIO, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise EOFError('snapshot: unexpected end of stream')
+    return data
+
+
+def _read_frame(file: BinaryIO, into: memoryview | None = None) -> Any:
+    """
+    return next object of the stream: unpickled object of pickle frame
+    or new array of array frame. If 'into' (memoryview of bytes)
+    is provided, array frame is read into its beginning and amount
+    of the read bytes is returned
+    """
+    kind, length = FRAME.unpack(_read_exact(file, FRAME.size))
+    if kind == PICKLE_FRAME:
+        return pickle.loads(_read_exact(file, length))
+    if kind != ARRAY_FRAME:
+        raise ValueError('snapshot: broken frame')
+    typecode = _read_exact(file, 1).decode('ascii')
+    if into is None:
+        itemsize = array(typecode).itemsize
+        result = array(typecode, bytes(itemsize)) * (length // itemsize)
+        into = memoryview(result).cast('B')
+    else:
+        result = length
+        into = into[:length]
+    if into.nbytes != length or file.readinto(into) != length:
+        raise ValueError('snapshot: broken array frame')
+    return result
+
+
+def _read_into(file: BinaryIO, buffer) -> None:
+    """
+    fill preallocated buffer by the following array frames
+    """
+    view = memoryview(buffer).cast('B')
+    offset = 0
+    while offset < view.nbytes:
+        read = _read_frame(file, view[offset:])
+        if not isinstance(read, int):
+            raise ValueError('snapshot: buffer is incomplete')
+        offset += read
+
+
+def _write_values(file: BinaryIO, values: list) -> None:
+    """
+    write chunk as float64 or int64 array if all items allow it
+    """
+    types = set(map(type, values))
+    if types == {float}:
+        _write_array(file, 'd', array('d', values))
+        return
+    if types == {int}:
+        try:
+            packed = array('q', values)
+        except OverflowError:
+            pass
+        else:
+            _write_array(file, 'q', packed)
+            return
+    _write_object(file, values)
+
+
+def _to_list(values, byteorder: str) -> list | None:
+    """
+    return list of the chunk read by _read_frame()
+    """
+    if isinstance(values, array):
+        if byteorder != sys.byteorder:
+            values.byteswap()
+        return values.tolist()
+    return values
+
+
+def _chunks(iterable, chunk_size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _hash_name(hash_func: HashFunc) -> str:
+    return f'{hash_func.__module__}:{hash_func.__qualname__}'
+
+
+def _resolve_hash(name: str) -> HashFunc | None:
+    """
+    return hash strategy by its qualified name, None if it's unknown
+    """
+    module, _, qualname = name.partition(':')
+    try:
+        obj = importlib.import_module(module)
+        for attribute in qualname.split('.'):
+            obj = getattr(obj, attribute)
+    except (ImportError, AttributeError):
+        return None
+    return obj
+
+
+def _hash_token(hash_func: HashFunc) -> int | None:
+    """
+    return hash of the str token, None for strategies of int keys,
+    equal tokens mean that stored hashes are valid
+    """
+    try:
+        return hash_func(HASH_TOKEN)
+    except TypeError:
+        return None
+
+
+def _map_state(hash_map) -> dict:
+    state = {
+        'size': hash_map._min_size,
+        'length': len(hash_map),
+        'max_load': hash_map.max_load,
+        'min_load': hash_map.min_load,
+        'hash_func': _hash_name(hash_map.hash_func),
+        'hash_token': _hash_token(hash_map.hash_func),
+    }
+    if isinstance(hash_map, HashMapIncremental):
+        state['rehash_step'] = hash_map.rehash_step
+    return state
+
+
+def _dump_map(hash_map, file: BinaryIO, chunk_size: int) -> None:
+    for chunk in _chunks(hash_map._stored_entries(), chunk_size):
+        _write_values(file, list(map(itemgetter(0), chunk)))
+        _write_values(file, list(map(itemgetter(1), chunk)))
+        _write_array(file, 'Q', array('Q', map(itemgetter(-1), chunk)))
+
+
+def _load_map(cls, state: dict, file: BinaryIO, byteorder: str,
+              hash_func: HashFunc | None):
+    if hash_func is None:
+        hash_func = _resolve_hash(state['hash_func']) or DEFAULT_HASH
+    options = {'max_load': state['max_load'], 'min_load': state['min_load']}
+    if 'rehash_step' in state:
+        options['rehash_step'] = state['rehash_step']
+    hash_map = cls(state['size'], hash_func, **options)
+    hash_map.reserve(state['length'])
+    same_hashes = _hash_token(hash_func) == state['hash_token']
+    while True:
+        keys = _to_list(_read_frame(file), byteorder)
+        if keys is None:
+            return hash_map
+        values = _to_list(_read_frame(file), byteorder)
+        hashes = _read_frame(file)
+        if not same_hashes:
+            hashes = map(hash_func, keys)
+        elif byteorder != sys.byteorder:
+            hashes.byteswap()
+        hash_map._restore(zip(keys, values, hashes))
+
+
+def _array_list_state(array_list: ArrayList) -> dict:
+    return {'typecode': array_list._data.typecode,
+            'length': len(array_list)}
+
+
+def _dump_array_list(array_list: ArrayList, file: BinaryIO,
+                     chunk_size: int) -> None:
+    data = array_list._data
+    with memoryview(data) as view:
+        for start in range(0, len(array_list), chunk_size):
+            end = min(start + chunk_size, len(array_list))
+            _write_array(file, data.typecode, view[start:end])
+
+
+def _load_array_list(cls, state: dict, file: BinaryIO, byteorder: str,
+                     hash_func: HashFunc | None) -> ArrayList:
+    typecode = state['typecode']
+    data = array(typecode, bytes(array(typecode).itemsize)) * state['length']
+    _read_into(file, data)
+    if _read_frame(file) is not None:
+        raise ValueError('snapshot: broken ArrayList')
+    if byteorder != sys.byteorder:
+        data.byteswap()
+    array_list = cls(typecode)
+    array_list._data = data
+    array_list._length = len(data)
+    return array_list
+
+
+def _int_hash_map_state(int_map: IntHashMap) -> dict:
+    return {'size': int_map.size, 'length': len(int_map),
+            'dtype': int_map.dtype.str}
+
+
+def _dump_int_hash_map(int_map: IntHashMap, file: BinaryIO,
+                       chunk_size: int) -> None:
+    for buffer in (int_map._keys, int_map._values, int_map._used):
+        for start in range(0, int_map.size, chunk_size):
+            _write_array(file, buffer.dtype.char,
+                         buffer[start:start + chunk_size])
+
+
+def _load_int_hash_map(cls, state: dict, file: BinaryIO, byteorder: str,
+                       hash_func: HashFunc | None) -> IntHashMap:
+    int_map = cls(state['size'], state['dtype'])
+    for buffer in (int_map._keys, int_map._values, int_map._used):
+        _read_into(file, buffer)
+        if byteorder != sys.byteorder:
+            buffer.byteswap(inplace=True)
+    if _read_frame(file) is not None:
+        raise ValueError('snapshot: broken IntHashMap')
+    int_map._length = state['length']
+    return int_map
+
+
+def _sequence_state(sequence) -> dict:
+    if isinstance(sequence, Stack):
+        return {}
+    state = {'maxlength': sequence.maxlength}
+    if isinstance(sequence, Deque):
+        state['overwrite'] = sequence.overwrite
+    if isinstance(sequence, Queue):
+        state['typecode'] = sequence.typecode
+    if isinstance(sequence, PriorityQueue):
+        state['revers'] = sequence.revers
+        state['d'] = sequence.d
+        if sequence.key is not None:
+            state['key'] = _hash_name(sequence.key)
+            if _resolve_hash(state['key']) is not sequence.key:
+                raise TypeError('snapshot: key function of PriorityQueue '
+                                'must be importable')
+    return state
+
+
+def _deque_chunks(deque: Deque, chunk_size: int):
+    """
+    yield items of the ring buffer from head to tail as slices
+    of up to 'chunk_size' items, the buffer isn't copied at once
+    """
+    data, mask = deque._data, deque._mask
+    for start in range(0, len(deque), chunk_size):
+        first = (deque._head + start) & mask
+        amount = min(chunk_size, len(deque) - start)
+        chunk = data[first:first + amount]
+        if len(chunk) < amount:
+            chunk += data[:amount - len(chunk)]
+        yield chunk
+
+
+def _dump_sequence(sequence, file: BinaryIO, chunk_size: int) -> None:
+    if isinstance(sequence, Deque):
+        chunks = _deque_chunks(sequence, chunk_size)
+    else:
+        chunks = _chunks(sequence._data, chunk_size)
+    for chunk in chunks:
+        _write_values(file, chunk)
+
+
+def _extend_stack(stack: Stack, items: list) -> None:
+    stack._data.extend(items)
+
+
+# class -> bulk method that appends a loaded chunk to the sequence
+_SEQUENCE_EXTENDERS = {Deque: Deque.extend, Stack: _extend_stack}
+
+
+def _load_sequence(cls, state: dict, file: BinaryIO, byteorder: str,
+                   hash_func: HashFunc | None):
+    sequence = cls(**state)
+    extend = _SEQUENCE_EXTENDERS[cls]
+    while True:
+        chunk = _to_list(_read_frame(file), byteorder)
+        if chunk is None:
+            return sequence
+        extend(sequence, chunk)
+
+
+def _dump_queue(queue: Queue, file: BinaryIO, chunk_size: int) -> None:
+    """
+    typed queue is written as raw buffer slices of its array
+    """
+    data, head = queue._data, queue._head
+    if queue.typecode is None:
+        for chunk in _chunks(islice(data, head, None), chunk_size):
+            _write_values(file, chunk)
+        return
+    with memoryview(data) as view:
+        for start in range(head, len(data), chunk_size):
+            _write_array(file, data.typecode, view[start:start + chunk_size])
+
+
+def _load_queue(cls, state: dict, file: BinaryIO, byteorder: str,
+                hash_func: HashFunc | None) -> Queue:
+    queue = cls(**state)
+    while True:
+        chunk = _read_frame(file)
+        if chunk is None:
+            queue._check_capacity(len(queue))
+            return queue
+        if queue.typecode is None:
+            queue._data.extend(_to_list(chunk, byteorder))
+            continue
+        if not isinstance(chunk, array) or \
+                chunk.typecode != queue.typecode:
+            raise ValueError('snapshot: broken typed Queue')
+        if byteorder != sys.byteorder:
+            chunk.byteswap()
+        queue._data.extend(chunk)
+
+
+def _dump_priority_queue(queue: PriorityQueue, file: BinaryIO,
+                         chunk_size: int) -> None:
+    """
+    the heap is written as is, in chunks of items and their order
+    numbers, so it needs neither sorting nor heapify on load
+    """
+    heap = queue._heap
+    for start in range(0, len(heap), chunk_size):
+        entries = heap[start:start + chunk_size]
+        _write_values(file, list(map(itemgetter(-1), entries)))
+        _write_values(file, list(map(itemgetter(1), entries)))
+
+
+def _load_priority_queue(cls, state: dict, file: BinaryIO, byteorder: str,
+                         hash_func: HashFunc | None) -> PriorityQueue:
+    if 'key' in state:
+        state = dict(state, key=_resolve_hash(state['key']))
+        if state['key'] is None:
+            raise ValueError('snapshot: key function is not importable')
+    queue = cls(**state)
+    key, heap = queue.key, queue._heap
+    last_order = -1
+    while True:
+        items = _to_list(_read_frame(file), byteorder)
+        if items is None:
+            queue._check_capacity(len(heap))
+            queue._order = count(last_order + 1)
+            return queue
+        orders = _to_list(_read_frame(file), byteorder)
+        keys = items if key is None else map(key, items)
+        heap.extend(zip(keys, orders, items))
+        last_order = max(last_order, max(map(abs, orders)))
+
+
+_DUMPERS = {}  # class -> (state function, chunks writer)
+_LOADERS = {}  # class name -> (class, loader)
+for _cls in (HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+             HashMapRobinHood, HashMapIncremental, HashMapCompact):
+    _DUMPERS[_cls] = (_map_state, _dump_map)
+    _LOADERS[_cls.__name__] = (_cls, _load_map)
+for _cls in (Deque, Stack):
+    _DUMPERS[_cls] = (_sequence_state, _dump_sequence)
+    _LOADERS[_cls.__name__] = (_cls, _load_sequence)
+_DUMPERS[Queue] = (_sequence_state, _dump_queue)
+_LOADERS['Queue'] = (Queue, _load_queue)
+_DUMPERS[PriorityQueue] = (_sequence_state, _dump_priority_queue)
+_LOADERS['PriorityQueue'] = (PriorityQueue, _load_priority_queue)
+_DUMPERS[ArrayList] = (_array_list_state, _dump_array_list)
+_LOADERS['ArrayList'] = (ArrayList, _load_array_list)
+_DUMPERS[IntHashMap] = (_int_hash_map_state, _dump_int_hash_map)
+_LOADERS['IntHashMap'] = (IntHashMap, _load_int_hash_map)
+
+
+def dump(obj, file: BinaryIO, chunk_size=CHUNK_SIZE) -> None:
+    """
+    Write snapshot of the container to the binary file object
+    :param obj: HashMap from hash_map.py, IntHashMap, ArrayList, Deque,
+        Queue, PriorityQueue or Stack
+    :param file: binary file object opened for writing
+    :param chunk_size: int, elements per chunk
+    :return: None
+    """
+    try:
+        state, write_chunks = _DUMPERS[type(obj)]
+    except KeyError:
+        raise TypeError(
+            f'snapshot: {type(obj).__name__} is not supported') from None
+    file.write(MAGIC)
+    _write_object(file, {'type': type(obj).__name__, 'version': VERSION,
+                         'byteorder': sys.byteorder, 'state': state(obj)})
+    write_chunks(obj, file, chunk_size)
+    _write_object(file, None)
+
+
+def load(file: BinaryIO, hash_func: HashFunc | None = None) -> Any:
+    """
+    Read container written by dump()
+    :param file: binary file object opened for reading
+    :param hash_func: optional, hash strategy of the loaded HashMap,
+        strategy of the dumped map is used if it's importable
+    :return: new container
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError('snapshot: wrong format')
+    header = _read_frame(file)
+    if header['version'] != VERSION or header['type'] not in _LOADERS:
+        raise ValueError(f'snapshot: unsupported {header["type"]} '
+                         f'version {header["version"]}')
+    cls, loader = _LOADERS[header['type']]
+    return loader(cls, header['state'], file, header['byteorder'],
+                  hash_func)
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from data_structures.blocking import BlockingDeque, BlockingQueue, QueueClosed
+
+
+@pytest.mark.parametrize("test_class", [BlockingQueue, BlockingDeque])
+def test_blocking_basic(test_class):
+    queue = test_class([1, 2], maxlength=3)
+    assert len(queue) == 2
+    queue.put(3)
+    assert not queue.try_put(4)
+    with pytest.raises(TimeoutError):
+        queue.put(4, timeout=0.01)
+    assert queue.remove() == 1
+    assert queue.try_put(4)
+    assert queue.drain(2) == [2, 3]
+    assert queue.try_remove() == 4
+    assert queue.try_remove('empty') == 'empty'
+    with pytest.raises(TimeoutError):
+        queue.remove(timeout=0.01)
+    assert queue.drain(timeout=0.01) == []
+    assert not queue
+
+
+@pytest.mark.parametrize("test_class", [BlockingQueue, BlockingDeque])
+def test_blocking_close(test_class):
+    queue = test_class([1, 2, 3], maxlength=3)
+    errors = []
+
+    def producer():
+        try:
+            queue.put(4)
+        except QueueClosed:
+            errors.append('put')
+
+    def consumer():
+        try:
+            queue.remove()
+        except QueueClosed:
+            errors.append('remove')
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    time.sleep(0.05)
+    queue.close()
+    thread.join(1)
+    assert errors == ['put']
+    assert queue.closed
+    assert queue.drain() == [1, 2, 3]
+    threads = [threading.Thread(target=consumer) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(1)
+    assert errors == ['put'] + ['remove'] * 3
+    with pytest.raises(QueueClosed):
+        queue.drain()
+    with pytest.raises(QueueClosed):
+        queue.try_put(1)
+
+
+@pytest.mark.parametrize("test_class", [BlockingQueue, BlockingDeque])
+def test_blocking_producers_consumers(test_class):
+    queue = test_class(maxlength=16)
+    received = []
+    lock = threading.Lock()
+
+    def producer(start):
+        for item in range(start, start + 500):
+            queue.put(item)
+
+    def consumer():
+        while True:
+            try:
+                batch = queue.drain(7)
+            except QueueClosed:
+                return
+            with lock:
+                received.extend(batch)
+
+    producers = [threading.Thread(target=producer, args=(i * 500,))
+                 for i in range(4)]
+    consumers = [threading.Thread(target=consumer) for _ in range(3)]
+    for thread in producers + consumers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    queue.close()
+    for thread in consumers:
+        thread.join()
+    assert sorted(received) == list(range(2000))
+
+
+def test_blocking_deque_ends():
+    deque = BlockingDeque([2])
+    deque.put_front(1)
+    deque.put(3)
+    assert deque.remove_back() == 3
+    assert deque.remove() == 1
+    assert deque.remove_back(timeout=0.01) == 2
+    with pytest.raises(TimeoutError):
+        deque.remove_back(timeout=0.01)
@@ -0,0 +1,125 @@
+import pytest
+
+from data_structures.cache import Cache, LFUPolicy, memoize
+from data_structures.hash_map import HashMapCompact, HashMapRobinHood
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "map_class",
+    [HashMapCompact, HashMapRobinHood]
+)
+def test_cache_basic(map_class):
+    cache = Cache(map_class=map_class)
+    assert not cache
+    assert cache.get(1) is None
+    with pytest.raises(KeyError):
+        assert cache[1]
+    cache[1] = 'one'
+    cache.put(2, None)
+    assert cache[1] == 'one'
+    assert cache.get(2, 'default') is None
+    assert 2 in cache
+    assert len(cache) == 2
+    assert cache.pop(1) == 'one'
+    assert cache.pop(1, 'default') == 'default'
+    assert len(cache) == 1
+
+
+def test_cache_lru():
+    cache = Cache(max_entries=2)
+    cache[1], cache[2] = 1, 2
+    assert cache[1] == 1
+    cache[3] = 3
+    assert 2 not in cache
+    assert 1 in cache and 3 in cache
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_fifo():
+    cache = Cache(max_entries=2, policy='fifo')
+    cache[1], cache[2] = 1, 2
+    assert cache[1] == 1
+    cache[3] = 3
+    assert 1 not in cache
+    assert 2 in cache and 3 in cache
+
+
+def test_cache_lfu():
+    cache = Cache(max_entries=3, policy=LFUPolicy())
+    cache[1], cache[2], cache[3] = 1, 2, 3
+    for _ in range(3):
+        assert cache[1] == 1
+    assert cache[3] == 3
+    cache[4] = 4
+    assert 2 not in cache
+    cache.pop(4)
+    cache[5] = 5
+    cache[6] = 6
+    assert 5 not in cache
+    assert 1 in cache and 3 in cache and 6 in cache
+
+
+def test_cache_max_bytes():
+    cache = Cache(max_bytes=10, size_func=lambda key, value: len(value))
+    cache['a'] = 'xxxx'
+    cache['b'] = 'yyyy'
+    assert cache.bytes == 8
+    cache['c'] = 'zzzz'
+    assert 'a' not in cache
+    assert cache.bytes == 8
+    cache['d'] = 'too big value'
+    assert 'd' not in cache
+    assert len(cache) == 2
+
+
+def test_cache_ttl():
+    clock = FakeClock()
+    cache = Cache(ttl=10, clock=clock)
+    cache['a'] = 1
+    cache.put('b', 2, ttl=100)
+    clock.now = 50
+    assert cache.get('a') is None
+    assert cache['b'] == 2
+    assert cache.stats() == {
+        'entries': 1, 'bytes': cache.bytes, 'hits': 1, 'misses': 1,
+        'evictions': 0, 'expirations': 1,
+    }
+    clock.now = 100
+    assert 'b' not in cache
+    assert len(cache) == 0
+
+
+def test_memoize():
+    calls = []
+
+    @memoize(max_entries=2)
+    def square(value, power=2):
+        calls.append(value)
+        return value ** power
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(3, power=3) == 27
+    assert calls == [3, 3]
+    assert square.cache.hits == 1
+    assert square.__name__ == 'square'
+
+
+def test_memoize_kwargs_key():
+    @memoize()
+    def echo(*args, **kwargs):
+        return args, kwargs
+
+    assert echo(x=1) == ((), {'x': 1})
+    assert echo((), (('x', 1),)) == (((), (('x', 1),)), {})
+    assert echo(1, x=1) == ((1,), {'x': 1})
+    assert echo(1, ('x', 1)) == ((1, ('x', 1)), {})
+    assert echo.cache.hits == 0
@@ -0,0 +1,103 @@
+from threading import Thread
+
+import pytest
+
+from data_structures.concurrent_hash_map import ConcurrentHashMap
+from data_structures.hash_map import (
+    HashMapIncremental, HashMapOpenAddressing, HashMapRobinHood,
+    HashMapSeparateChaining
+)
+
+
+@pytest.mark.parametrize(
+    "shard_class",
+    [HashMapSeparateChaining, HashMapOpenAddressing, HashMapRobinHood,
+     HashMapIncremental]
+)
+def test_concurrent_hashmap_basic(shard_class):
+    hm = ConcurrentHashMap(shards=4, shard_class=shard_class)
+    assert not hm
+    with pytest.raises(KeyError):
+        assert hm[1]
+    assert hm.put(1, 10) is None
+    assert hm.put(1, 11) == 10
+    hm[2] = 20
+    assert hm[1] == 11
+    assert hm.get(3, 'default') == 'default'
+    assert 2 in hm
+    assert 3 not in hm
+    assert len(hm) == 2
+    assert set(hm.items()) == {(1, 11), (2, 20)}
+    assert set(hm) == {1, 2}
+    assert set(hm.values()) == {11, 20}
+    assert hm.pop(1) == (1, 11)
+    assert hm.pop(1) is None
+    assert len(hm) == 1
+
+
+def test_concurrent_hashmap_locked_reads():
+    # lookups of HashMapIncremental migrate buckets, so they wait
+    # for the writer instead of racing with it
+    hm = ConcurrentHashMap(shards=1, shard_class=HashMapIncremental)
+    hm.put_many((i, i) for i in range(100))
+    result = []
+    with hm._locks[0]:
+        reader = Thread(target=lambda: result.append(hm.get(5)))
+        reader.start()
+        reader.join(0.05)
+        assert reader.is_alive()
+    reader.join()
+    assert result == [5]
+    assert not ConcurrentHashMap()._locked_reads
+
+
+def test_concurrent_hashmap_compute_if_absent():
+    hm = ConcurrentHashMap()
+    calls = []
+
+    def factory(key):
+        calls.append(key)
+        return key * 2
+
+    assert hm.compute_if_absent(5, factory) == 10
+    assert hm.compute_if_absent(5, factory) == 10
+    assert calls == [5]
+
+
+def test_concurrent_hashmap_merge():
+    hm = ConcurrentHashMap()
+    assert hm.merge('a', 1, lambda old, new: old + new) == 1
+    assert hm.merge('a', 2, lambda old, new: old + new) == 3
+    assert hm['a'] == 3
+    assert hm.merge('a', 0, lambda old, new: None) is None
+    assert 'a' not in hm
+    assert len(hm) == 0
+
+
+def test_concurrent_hashmap_threads():
+    hm = ConcurrentHashMap(shards=4)
+    keys = 200
+
+    def worker():
+        for i in range(keys):
+            hm.merge(i, 1, lambda old, new: old + new)
+            assert hm.get(i) is not None
+            hm.compute_if_absent(('const', i), lambda key: key)
+
+    threads = [Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(hm) == keys * 2
+    assert all(hm[i] == 8 for i in range(keys))
+
+
+def test_concurrent_hashmap_bulk():
+    hm = ConcurrentHashMap(shards=4)
+    assert hm.put_many([(i, i) for i in range(100)]) == [None] * 100
+    assert hm.put_many([(0, 'a'), (1, 'b')]) == [0, 1]
+    hm.update({2: 'c'})
+    assert hm.get_many([0, 1, 2, 3, 1000], 'x') == ['a', 'b', 'c', 3, 'x']
+    assert hm.pop_many([0, 1000]) == [(0, 'a'), None]
+    assert len(hm) == 99
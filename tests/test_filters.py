@@ -0,0 +1,116 @@
+import pytest
+
+from data_structures.filters import BloomFilter, CuckooFilter, FilteredMap
+from data_structures.hash_map import (
+    HashMapCompact, HashMapOpenAddressing, HashMapRobinHood,
+    HashMapSeparateChaining
+)
+from data_structures.hashing import fnv1a_hash
+
+
+@pytest.mark.parametrize("test_class", [BloomFilter, CuckooFilter])
+def test_filter_no_false_negatives(test_class):
+    bf = test_class(1000, 0.01)
+    for i in range(1000):
+        bf.add(f'key{i}')
+    assert len(bf) == 1000
+    assert all(f'key{i}' in bf for i in range(1000))
+
+
+@pytest.mark.parametrize("test_class", [BloomFilter, CuckooFilter])
+@pytest.mark.parametrize("error_rate", [0.05, 0.01, 0.001])
+def test_filter_error_rate(test_class, error_rate):
+    bf = test_class(5000, error_rate)
+    for i in range(5000):
+        bf.add(i)
+    false_positives = sum(i in bf for i in range(5000, 105000))
+    assert false_positives / 100000 < 2 * error_rate
+    assert bf.estimated_error_rate() < 2 * error_rate
+
+
+@pytest.mark.parametrize("test_class", [BloomFilter, CuckooFilter])
+def test_filter_stats(test_class):
+    stats = test_class(1000, 0.01, fnv1a_hash).stats()
+    assert stats['capacity'] == 1000
+    assert stats['keys'] == 0
+    assert stats['bits_per_key'] == 8 * stats['nbytes'] / 1000
+    assert stats['bits_per_key'] < 40
+    assert stats['estimated_error_rate'] == 0
+    assert (test_class(1000, 0.0001).stats()['bits_per_key']
+            > stats['bits_per_key'])
+
+
+@pytest.mark.parametrize("test_class", [BloomFilter, CuckooFilter])
+def test_filter_error_rate_range(test_class):
+    with pytest.raises(ValueError):
+        test_class(100, 0)
+    with pytest.raises(ValueError):
+        test_class(100, 1.5)
+
+
+def test_cuckoo_filter_remove():
+    cf = CuckooFilter(1000, seed=1)
+    for i in range(1000):
+        cf.add(i)
+    for i in range(0, 1000, 2):
+        assert cf.remove(i)
+    assert len(cf) == 500
+    assert all(i in cf for i in range(1, 1000, 2))
+    assert sum(i in cf for i in range(0, 1000, 2)) < 20
+    assert not cf.remove('absent')
+
+
+def test_cuckoo_filter_full():
+    cf = CuckooFilter(8, max_kicks=10, seed=1)
+    with pytest.raises(OverflowError):
+        for i in range(1000):
+            cf.add(i)
+    added = len(cf)
+    assert all(i in cf for i in range(added))
+    cf.remove(0)
+    cf.add(0)
+    assert all(i in cf for i in range(added))
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapRobinHood,
+     HashMapCompact]
+)
+@pytest.mark.parametrize("filter_class", [BloomFilter, CuckooFilter])
+def test_filtered_map(test_class, filter_class):
+    fm = FilteredMap(test_class(), filter_class, capacity=16)
+    for i in range(500):
+        fm[i] = i * 2
+    assert len(fm) == 500
+    assert fm.filter.capacity >= 500
+    assert all(fm[i] == i * 2 for i in range(500))
+    assert fm.get(1000) is None
+    with pytest.raises(KeyError):
+        assert fm[1000]
+    assert fm.pop(10) == (10, 20)
+    assert fm.pop(10) is None
+    assert 10 not in fm
+    assert fm.put(11, 0) == 22
+    for i in range(1000, 11000):
+        assert i not in fm
+    stats = fm.stats()
+    assert stats['rejections'] + stats['false_positives'] >= 10000
+    assert stats['rejections'] > 9000
+    assert sorted(fm.keys()) == sorted(set(range(500)) - {10})
+
+
+def test_filtered_map_existing_items():
+    hm = HashMapSeparateChaining.from_items((i, i) for i in range(100))
+    fm = FilteredMap(hm, BloomFilter, capacity=10)
+    assert fm.filter.capacity == 100
+    assert all(i in fm for i in range(100))
+    for i in range(100):
+        fm.pop(i)
+    for i in range(100):
+        fm[i + 100] = i
+    # popped keys were dropped from the filter instead of growing it
+    assert fm.filter.capacity == 100
+    assert len(fm.filter) == 100
+    fm[200] = 0
+    assert fm.filter.capacity == 202
@@ -1,13 +1,16 @@
 import pytest
 
 from data_structures.hash_map import (
-    HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining
+    HashMapCollision, HashMapCompact, HashMapIncremental,
+    HashMapOpenAddressing, HashMapRobinHood, HashMapSeparateChaining
 )
+from data_structures.hashing import fnv1a_hash
 
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood]
 )
 def test_hashmap_init(test_class):
     hm = test_class(size=2)
@@ -17,7 +20,8 @@ def test_hashmap_init(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_key_error(test_class):
     hm = test_class(size=5)
@@ -27,7 +31,8 @@ def test_hashmap_key_error(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_set(test_class):
     hm = test_class(size=5)
@@ -45,16 +50,18 @@ def test_hashmap_set(test_class):
     [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
 )
 def test_hashmap_extend(test_class):
-    size = 5
-    hm = test_class(size=size)
-    hm[0], hm[1], hm[2] = 0, 1, 2
-    assert hm.size == size
-    hm[3] = 3
-    assert hm.size == size * 2
+    hm = test_class(size=5)
+    assert hm.size == 8
+    hm[0], hm[1], hm[2], hm[3], hm[4] = 0, 1, 2, 3, 4
+    assert hm.size == 8
+    hm[5] = 5
+    assert hm.size == 8 * 2
     assert hm[0] == 0
     assert hm[2] == 2
-    hm[3], hm[4], hm[5], hm[6], hm[7], hm[8], hm[9] = 3, 4, 5, 6, 7, 8, 9
-    assert hm.size == size * 2 * 2
+    hm[5], hm[6], hm[7], hm[8], hm[9], hm[10] = 5, 6, 7, 8, 9, 10
+    assert hm.size == 8 * 2
+    hm[11] = 11
+    assert hm.size == 8 * 2 * 2
     assert hm[0] == 0
     assert hm[2] == 2
     assert hm[6] == 6
@@ -62,7 +69,8 @@ def test_hashmap_extend(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_get(test_class):
     hm = test_class(size=5)
@@ -75,7 +83,8 @@ def test_hashmap_get(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_put(test_class):
     hm = test_class(size=5)
@@ -87,7 +96,8 @@ def test_hashmap_put(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_pop(test_class):
     hm = test_class(size=5)
@@ -100,7 +110,8 @@ def test_hashmap_pop(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_items(test_class):
     hm = test_class(size=5)
@@ -111,7 +122,8 @@ def test_hashmap_items(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_keys(test_class):
     hm = test_class(size=5)
@@ -122,7 +134,8 @@ def test_hashmap_keys(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_values(test_class):
     hm = test_class(size=5)
@@ -133,10 +146,430 @@ def test_hashmap_values(test_class):
 
 @pytest.mark.parametrize(
     "test_class",
-    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining]
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
 )
 def test_hashmap_iter(test_class):
     hm = test_class(size=5)
     hm[0] = 10
     hm[2] = 20
     assert set(hm) == {0, 2}
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_hash_func(test_class):
+    hm = test_class(size=5, hash_func=fnv1a_hash)
+    hm['ab'] = 1
+    hm['ba'] = 2
+    assert hm['ab'] == 1
+    assert hm['ba'] == 2
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_distribution(test_class):
+    hm = test_class(size=5)
+    hm[0], hm[1] = 0, 1
+    report = hm.distribution()
+    assert report['keys'] == 2
+    assert report['max_chain'] == 1
+
+
+def test_hashmap_compact_order():
+    hm = HashMapCompact()
+    for key in [5, 'b', 3, 'a']:
+        hm[key] = str(key)
+    hm[3] = 'three'
+    assert list(hm.keys()) == [5, 'b', 3, 'a']
+    assert list(hm.values()) == ['5', 'b', 'three', 'a']
+    hm.pop('b')
+    hm['b'] = 'b'
+    assert list(hm.keys()) == [5, 3, 'a', 'b']
+    assert len(hm) == 4
+
+
+def test_hashmap_compact_grow():
+    hm = HashMapCompact()
+    assert hm._indices.typecode == 'b'
+    for i in range(1000):
+        hm[i] = i * 2
+    assert len(hm) == 1000
+    assert hm._indices.typecode == 'h'
+    assert all(hm[i] == i * 2 for i in range(1000))
+    assert list(hm.keys()) == list(range(1000))
+
+
+def test_hashmap_compact_pop_and_compact():
+    hm = HashMapCompact()
+    for i in range(100):
+        hm[i] = i
+    for i in range(0, 100, 2):
+        assert hm.pop(i) == (i, i)
+    assert hm.pop(0) is None
+    for i in range(100, 200):
+        hm[i] = i
+    assert len(hm) == 150
+    assert hm.filled < 200
+    assert list(hm.keys()) == list(range(1, 100, 2)) + list(range(100, 200))
+
+
+def test_hashmap_incremental_rehash():
+    hm = HashMapIncremental(size=8, rehash_step=1)
+    for i in range(6):
+        hm[i] = i
+    assert hm.rehashing
+    assert hm.size == 8
+    hm[0] = 'zero'
+    assert hm.pop(5) == (5, 5)
+    assert hm.pop(5) is None
+    assert set(hm.keys()) == {0, 1, 2, 3, 4}
+    while hm.rehashing:
+        assert hm[1] == 1
+    assert hm.size == 16
+    assert hm[0] == 'zero'
+    assert len(hm) == 5
+    assert set(hm.items()) == {(0, 'zero'), (1, 1), (2, 2), (3, 3), (4, 4)}
+
+
+def test_hashmap_incremental_many():
+    hm = HashMapIncremental(rehash_step=2)
+    for i in range(2000):
+        hm[i] = i
+        assert hm[i // 2] == i // 2
+    for i in range(0, 2000, 3):
+        assert hm.pop(i) == (i, i)
+    assert len(hm) == 2000 - 667
+    assert all(hm.get(i) == (None if i % 3 == 0 else i) for i in range(2000))
+
+
+def test_hashmap_incremental_latency():
+    hm = HashMapIncremental(track_latency=True)
+    assert HashMapIncremental().latency is None
+    for i in range(100):
+        hm[i] = i
+    hm.get(1)
+    hm.pop(1)
+    assert hm.latency['operations'] == 102
+    assert 0 < hm.latency['max'] <= hm.latency['total']
+
+
+def test_hashmap_robin_hood_distances():
+    hm = HashMapRobinHood(size=8, hash_func=lambda key: key // 10)
+    # 0, 1, 2 share home slot 0, 10 has home slot 1
+    for key in [0, 1, 10, 2]:
+        hm[key] = key
+    assert [slot[2] for slot in hm.hash_map[:4]] == [0, 1, 2, 2]
+    assert hm.hash_map[3][0] == 10
+    assert hm[10] == 10
+    assert hm.pop(1) == (1, 1)
+    assert [slot[2] for slot in hm.hash_map[:3]] == [0, 1, 1]
+    assert hm.hash_map[3] is None
+    assert hm[2] == 2
+    assert hm[10] == 10
+    assert len(hm) == 3
+
+
+def test_hashmap_robin_hood_load():
+    hm = HashMapRobinHood(size=128)
+    for i in range(115):
+        hm[i * 7] = i
+    assert hm.size == 128
+    hm[0] = 'zero'
+    assert hm.size == 128
+    assert len(hm) == 115
+    hm[1000] = 1000
+    assert hm.size == 256
+    for i in range(0, 115, 2):
+        assert hm.pop(i * 7) == (i * 7, 'zero' if i == 0 else i)
+    assert len(hm) == 58
+    assert all(hm[i * 7] == i for i in range(1, 115, 2))
+    assert hm.get(0) is None
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_reserve(test_class):
+    hm = test_class(size=5)
+    hm[1] = 1
+    hm.reserve(100)
+    size = hm.size
+    assert size >= 100
+    for i in range(90):
+        hm[i] = i
+    assert hm.size == size
+    assert hm[1] == 1
+    hm.reserve(10)
+    assert hm.size == size
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapIncremental,
+     HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_bulk(test_class):
+    hm = test_class.from_items((i, str(i)) for i in range(50))
+    assert hm.size >= 50
+    assert hm.get_many([0, 49, 50], 'x') == ['0', '49', 'x']
+    assert hm.put_many([(0, 'zero'), (50, '50')]) == ['0', None]
+    hm.update({1: 'one'})
+    hm.update(test_class.from_items([(2, 'two')]))
+    assert hm.get_many([0, 1, 2, 50]) == ['zero', 'one', 'two', '50']
+    assert hm.pop_many([0, 1, 100]) == [(0, 'zero'), (1, 'one'), None]
+    assert len(hm.keys()) == 49
+    assert test_class.from_items([], size=64).size == 64
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_hashes_once(test_class):
+    hashed = []
+
+    def counting_hash(key):
+        hashed.append(key)
+        return hash(key)
+
+    hm = test_class(hash_func=counting_hash)
+    assert hm.put_many([(i, i) for i in range(100)]) == [None] * 100
+    assert hm.put(5, 'five') == 5
+    assert hm.get_many(range(98, 102)) == [98, 99, None, None]
+    assert hm.get(5) == 'five' and 5 in hm
+    assert hashed == list(range(100)) + [5] + list(range(98, 102)) + [5, 5]
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_views(test_class):
+    hm = test_class(size=5)
+    keys, values, items = hm.keys(), hm.values(), hm.items()
+    assert len(keys) == 0
+    hm[0], hm[2] = 10, 20
+    assert len(keys) == len(values) == len(items) == len(hm) == 2
+    assert 0 in keys and 1 not in keys
+    assert (2, 20) in items and (2, 10) not in items
+    assert 20 in values and 30 not in values
+    assert keys == {0, 2}
+    assert keys & {2, 3} == {2}
+    hm.pop(0)
+    assert list(keys) == [2]
+    assert list(items) == [(2, 20)]
+    assert 0 not in hm and 2 in hm
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapCollision, HashMapOpenAddressing, HashMapSeparateChaining,
+     HashMapIncremental, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_iter_modified(test_class):
+    hm = test_class(size=5)
+    hm[0], hm[1] = 0, 1
+    for key in hm:
+        hm[key] = 'value'  # overwrite doesn't change the map size
+    assert set(hm.values()) == {'value'}
+    with pytest.raises(RuntimeError):
+        for key in hm:
+            hm[key + 100] = key
+    with pytest.raises(RuntimeError):
+        for key in hm.keys():
+            hm.pop(key)
+
+
+def test_hashmap_collision_pop_other_key():
+    hm = HashMapCollision(size=5)
+    hm[0] = 0
+    assert hm.pop(5) is None
+    assert hm.get(5) is None
+    assert hm[0] == 0
+    assert len(hm) == 1
+
+
+def test_hashmap_open_addressing_pop():
+    hm = HashMapOpenAddressing(size=16)
+    # 0, 16, 32 share home slot 0, 1 has home slot 1,
+    # 15 and 31 wrap around the table end
+    for key in [15, 31, 0, 16, 1, 32]:
+        hm[key] = key
+    assert hm.pop(0) == (0, 0)
+    assert hm.pop(15) == (15, 15)
+    assert all(hm[key] == key for key in [31, 16, 1, 32])
+    assert len(hm) == 4
+    assert hm.filled == 4
+    for key in [31, 16, 1, 32]:
+        assert hm.pop(key) == (key, key)
+    assert not hm
+    assert hm.hash_map == [None] * 16
+
+
+def test_hashmap_incremental_iter_during_rehash():
+    hm = HashMapIncremental(size=64)
+    for i in range(48):
+        hm[i * 7] = i
+    assert hm.rehashing
+    seen = []
+    for key in hm:
+        seen.append(hm[key])  # lookups keep migrating buckets
+    assert sorted(seen) == list(range(48))
+    assert not hm.rehashing
+    for i in range(48, 96):
+        hm[i * 7] = i
+    assert hm.rehashing
+    abandoned = iter(hm)
+    next(abandoned)
+    while hm.rehashing:
+        assert hm[0] == 0
+    assert len(list(abandoned)) == 95
+
+
+class CountingKey:
+    """
+    key counting hash and __eq__ calls
+    """
+    hashes = 0
+    comparisons = 0
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        CountingKey.hashes += 1
+        return hash(self.value)
+
+    def __eq__(self, other) -> bool:
+        CountingKey.comparisons += 1
+        return self.value == other.value
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapIncremental,
+     HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_cached_hash(test_class):
+    hm = test_class(size=2)
+    keys = [CountingKey(i) for i in range(100)]
+    CountingKey.hashes = CountingKey.comparisons = 0
+    for key in keys:
+        hm[key] = key.value
+    # resize doesn't rehash keys and doesn't compare unique keys
+    assert CountingKey.hashes == 100
+    assert CountingKey.comparisons == 0
+    assert hm[CountingKey(50)] == 50
+    assert CountingKey.comparisons == 1
+    assert hm.size & (hm.size - 1) == 0
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapIncremental,
+     HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_stats(test_class):
+    hm = test_class(size=8, stats=True)
+    for i in range(100):
+        hm[i] = i
+    for i in range(150):
+        hm.get(i)
+    report = hm.stats_report()
+    assert report['length'] == 100
+    assert report['load_factor'] == 100 / hm.size
+    assert report['lookups'] == 150
+    assert sum(report['probes'].values()) == 150
+    assert report['max_probe'] == max(report['probes'])
+    assert report['resizes'] >= 1
+    assert report['resize_time'] >= 0
+    assert test_class().stats is None
+    assert 'lookups' not in test_class().stats_report()
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapIncremental,
+     HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_shrink(test_class):
+    hm = test_class(size=8)
+    for i in range(1000):
+        hm[i] = i
+    grown = hm.size
+    for i in range(990):
+        hm.pop(i)
+    assert hm.size < grown
+    assert len(hm) == 10
+    assert sorted(hm.keys()) == list(range(990, 1000))
+    assert hm.stats_report()['load_factor'] >= hm.min_load
+    for i in range(990, 1000):
+        hm.pop(i)
+    assert hm.size == test_class(size=8).size
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapRobinHood,
+     HashMapCompact]
+)
+def test_hashmap_load_thresholds(test_class):
+    hm = test_class(size=8, max_load=0.25, min_load=0)
+    assert hm.max_load == 0.25
+    for i in range(100):
+        hm[i] = i
+    assert len(hm) / hm.size <= 0.25
+    for i in range(100):
+        hm.pop(i)
+    assert hm.size >= 256
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapRobinHood, HashMapCompact]
+)
+def test_hashmap_load_limits(test_class):
+    for max_load in (0, -0.5, 1, 1.5):
+        with pytest.raises(ValueError):
+            test_class(size=8, max_load=max_load)
+    with pytest.raises(ValueError):
+        test_class(max_load=0.5, min_load=0.25)
+    with pytest.raises(ValueError):
+        test_class(min_load=-0.1)
+    hm = test_class(size=8, max_load=0.99, min_load=0)
+    for i in range(100):
+        hm[i] = i
+    assert hm.get(1000) is None
+    assert HashMapSeparateChaining(max_load=1.5).max_load == 1.5
+
+
+def test_hashmap_separate_chaining_filled():
+    hm = HashMapSeparateChaining(size=8, min_load=0)
+    for i in range(20000):
+        hm[i] = i
+    assert hm.filled == 20000
+    assert len(hm) / hm.size < hm.max_load
+    hm[0] = 'overwrite'
+    assert hm.filled == 20000
+    hm.pop(1)
+    assert hm.filled == 19999
+
+
+def test_hashmap_compact_tombstones():
+    hm = HashMapCompact(stats=True, min_load=0)
+    for i in range(5):
+        hm[i] = i
+    hm.pop(0)
+    hm.pop(1)
+    assert hm.stats_report()['tombstones'] == 2
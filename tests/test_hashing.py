@@ -0,0 +1,76 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from data_structures.hash_map import HashMapOpenAddressing
+from data_structures.hashing import (
+    blake2_hash, builtin_hash, distribution_report, fnv1a_hash, int_hash,
+    mix64, mixed_hash
+)
+
+
+@pytest.mark.parametrize(
+    "hash_func", [builtin_hash, mixed_hash, fnv1a_hash, blake2_hash]
+)
+def test_hash_range(hash_func):
+    for key in [0, -1, 12, 'ab', b'ab', (1, 2), 2 ** 70]:
+        assert 0 <= hash_func(key) < 2 ** 64
+        assert hash_func(key) == hash_func(key)
+
+
+@pytest.mark.parametrize(
+    "hash_func", [mixed_hash, fnv1a_hash, blake2_hash]
+)
+def test_hash_anagrams(hash_func):
+    assert hash_func('ab') != hash_func('ba')
+    assert hash_func(12) != hash_func(21)
+
+
+@pytest.mark.parametrize("hash_func", [fnv1a_hash, blake2_hash])
+def test_hash_equal_keys(hash_func):
+    # keys that are equal must hash equally, whatever their types
+    for keys in [(1, 1.0, True, Fraction(1), Decimal(1), 1 + 0j),
+                 (0.5, Fraction(1, 2), Decimal('0.5'), 0.5 + 0j),
+                 ((1, 'a'), (1.0, 'a'), (True, 'a'))]:
+        assert len({hash_func(key) for key in keys}) == 1
+    assert hash_func(2 ** 70) == hash_func(float(2 ** 70))
+    assert hash_func((1, 2)) != hash_func((12,))
+    hm = HashMapOpenAddressing(hash_func=hash_func)
+    hm[1] = 'x'
+    assert 1.0 in hm
+    assert hm[Fraction(1)] == 'x'
+    with pytest.raises(TypeError):
+        hash_func(object())
+
+
+def test_fnv1a_known_value():
+    # reference values of 64 bit FNV-1a
+    assert fnv1a_hash(b'') == 0xcbf29ce484222325
+    assert fnv1a_hash(b'a') == 0xaf63dc4c8601ec8c
+    assert fnv1a_hash('a') == fnv1a_hash(b'a')
+
+
+def test_int_hash():
+    assert int_hash(5) == mix64(5)
+    assert len({int_hash(i * 64) % 64 for i in range(64)}) > 32
+
+
+def test_distribution_report():
+    report = distribution_report(range(10), 20)
+    assert report['keys'] == 10
+    assert report['load_factor'] == 0.5
+    assert report['occupancy'] == {0: 10, 1: 10}
+    assert report['collisions'] == 0
+    assert report['max_chain'] == 1
+    assert report['max_probe'] == 0
+
+
+def test_distribution_report_clustering():
+    keys = [i * 8 for i in range(8)]
+    report = distribution_report(keys, 8)
+    assert report['max_chain'] == 8
+    assert report['max_probe'] == 7
+    assert report['collisions'] == 7
+    assert distribution_report(keys, 8, mixed_hash)['max_chain'] < 8
+    assert distribution_report(range(5), 2)['max_probe'] is None
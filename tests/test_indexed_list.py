@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from data_structures.indexed_list import IndexedList
+
+
+def _sizes_valid(node) -> bool:
+    if node is None:
+        return True
+    left = node.left.size if node.left else 0
+    right = node.right.size if node.right else 0
+    return node.size == left + right + 1 and \
+        _sizes_valid(node.left) and _sizes_valid(node.right)
+
+
+def test_indexed_list():
+    indexed = IndexedList()
+    assert len(indexed) == 0
+    assert list(indexed) == []
+    indexed.add_back(2)
+    indexed.add_front(0)
+    indexed.insert(1, 1)
+    assert list(indexed) == [0, 1, 2]
+    assert indexed.head() == 0
+    assert indexed.tail() == 2
+    assert indexed[1] == 1
+    assert indexed[-1] == 2
+    indexed[1] = 10
+    assert indexed.pop(1) == 10
+    assert indexed.pop() == 2
+    assert indexed.pop() == 0
+    with pytest.raises(IndexError):
+        indexed.pop()
+    with pytest.raises(IndexError):
+        indexed.head()
+    with pytest.raises(IndexError):
+        indexed.insert(1, 1)
+    with pytest.raises(IndexError):
+        assert indexed[0]
+
+
+def test_indexed_list_random():
+    rng = random.Random(1)
+    indexed = IndexedList(range(500), seed=2)
+    expected = list(range(500))
+    assert _sizes_valid(indexed._root)
+    for step in range(3000):
+        if rng.random() < 0.5:
+            index = rng.randint(0, len(expected))
+            indexed.insert(step, index)
+            expected.insert(index, step)
+        else:
+            index = rng.randrange(len(expected))
+            assert indexed.pop(index) == expected.pop(index)
+        index = rng.randrange(len(expected))
+        assert indexed[index] == expected[index]
+    assert _sizes_valid(indexed._root)
+    assert list(indexed) == expected
+    assert len(indexed) == len(expected)
+
+
+@pytest.mark.parametrize("index", [0, 1, 50, 99, 100])
+def test_indexed_list_split_concat(index):
+    indexed = IndexedList(range(100), seed=3)
+    rest = indexed.split(index)
+    assert list(indexed) == list(range(index))
+    assert list(rest) == list(range(index, 100))
+    assert _sizes_valid(indexed._root) and _sizes_valid(rest._root)
+    rest.add_back(100)
+    indexed.concat(rest)
+    assert list(indexed) == list(range(101))
+    assert len(rest) == 0
+    assert _sizes_valid(indexed._root)
+    with pytest.raises(ValueError):
+        indexed.concat(indexed)
+    with pytest.raises(IndexError):
+        indexed.split(102)
@@ -0,0 +1,87 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from data_structures.int_hash_map import (  # noqa: E402
+    IntHashMap, int_hash_many
+)
+from data_structures.hashing import int_hash  # noqa: E402
+
+
+def test_int_hash_many():
+    keys = np.array([0, 1, -1, 2 ** 62, -2 ** 63], dtype=np.int64)
+    expected = [int_hash(int(key)) for key in keys]
+    assert [int(h) for h in int_hash_many(keys)] == expected
+
+
+def test_int_hashmap_single():
+    hm = IntHashMap()
+    assert not hm
+    with pytest.raises(KeyError):
+        assert hm[1]
+    assert hm.put(1, 10) is None
+    assert hm.put(1, 11) == 10.0
+    hm[-5] = 2.5
+    assert hm[-5] == 2.5
+    assert hm.get(7) is None
+    assert hm.get(7, 0) == 0
+    assert 1 in hm and 7 not in hm
+    assert len(hm) == 2
+    assert set(hm.items()) == {(1, 11.0), (-5, 2.5)}
+    assert hm.pop(1) == (1, 11.0)
+    assert hm.pop(1) is None
+    assert list(hm) == [-5]
+
+
+def test_int_hashmap_grow_and_pop():
+    hm = IntHashMap(dtype=np.int64)
+    for i in range(1000):
+        hm[i * 16] = i
+    assert len(hm) == 1000
+    assert hm.size >= 2000
+    for i in range(0, 1000, 2):
+        assert hm.pop(i * 16) == (i * 16, i)
+    assert all(hm[i * 16] == i for i in range(1, 1000, 2))
+    assert all(i * 16 not in hm for i in range(0, 1000, 2))
+
+
+def test_int_hashmap_batch():
+    hm = IntHashMap(dtype=np.int64)
+    keys = np.arange(0, 30000, 3, dtype=np.int64)
+    hm.put_many(keys, keys * 2)
+    assert len(hm) == 10000
+    query = np.array([0, 3, 4, 29997, 30000], dtype=np.int64)
+    assert hm.get_many(query, default=-1).tolist() == [0, 6, -1, 59994, -1]
+    assert hm.contains_many(query).tolist() == [True, True, False, True,
+                                                False]
+    hm.put_many([3, 3, 5], [1, 2, 5])
+    assert hm[3] == 2
+    assert hm[5] == 5
+    assert len(hm) == 10001
+    assert hm.pop_many([3, 4]) == [(3, 2), None]
+    assert len(hm) == 10000
+    assert hm[6] == 12
+    with pytest.raises(ValueError):
+        hm.put_many([1, 2], [1])
+
+
+def test_int_hashmap_batch_matches_single():
+    rng = np.random.default_rng(1)
+    keys = rng.integers(-2 ** 40, 2 ** 40, 5000)
+    values = rng.random(5000)
+    hm = IntHashMap.from_arrays(keys, values)
+    expected = dict(zip(keys.tolist(), values.tolist()))
+    assert len(hm) == len(expected)
+    assert all(hm[key] == value for key, value in expected.items())
+    assert dict(hm.items()) == expected
+    stored_keys, stored_values = hm.arrays()
+    stored = dict(zip(stored_keys.tolist(), stored_values.tolist()))
+    assert stored == expected
+
+
+def test_int_hashmap_iter_modified():
+    hm = IntHashMap()
+    hm.put_many([1, 2], [1, 2])
+    with pytest.raises(RuntimeError):
+        for key in hm:
+            hm[key + 100] = 0
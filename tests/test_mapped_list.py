@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from data_structures.list import ArrayList
+from data_structures.mapped_list import HEADER_SIZE, MappedArrayList
+
+
+def test_mapped_arraylist(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    with MappedArrayList(path, 'q', mode='w+', grow_bytes=64) as column:
+        assert len(column) == 0
+        for i in range(100):
+            column.add_back(i)
+        assert column.capacity >= 100
+        column.insert(-1, 0)
+        assert column.pop(0) == -1
+        assert column.pop() == 99
+        column.add_back(99)
+        column.extend(range(100, 1000))
+        assert column[999] == 999
+        assert column[-1] == 999
+        assert column.head() == 0
+        column[0] = 5
+        column[0] = 0
+        assert column.index(500) == 500
+        with pytest.raises(TypeError):
+            column.add_back(1.5)
+    assert os.path.getsize(path) == HEADER_SIZE + 1000 * 8
+    with MappedArrayList(path) as column:
+        assert column.readonly
+        assert len(column) == 1000
+        assert list(column) == list(range(1000))
+        assert column.sum() == sum(range(1000))
+        assert column[10:13].tolist() == [10, 11, 12]
+        assert isinstance(column * 2, ArrayList)
+        with pytest.raises(TypeError):
+            column.add_back(1)
+        with pytest.raises(TypeError):
+            column[0] = 1
+        with pytest.raises(TypeError):
+            column.pop()
+
+
+def test_mapped_arraylist_bulk(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    for use_numpy in {False, ArrayList.use_numpy}:
+        with MappedArrayList(path, 'd', mode='w+') as column:
+            column.use_numpy = use_numpy
+            column.extend([3.0, 1.0, 2.0])
+            column.sort()
+            assert list(column) == [1.0, 2.0, 3.0]
+            assert column.search_sorted(2.5) == 2
+            assert column.mean() == 2.0
+            column += 1
+            assert list(column) == [2.0, 3.0, 4.0]
+
+
+def test_mapped_arraylist_reopen(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    MappedArrayList(path, 'i', mode='w+').close()
+    with MappedArrayList(path, 'i', mode='r+', grow_bytes=16) as column:
+        assert len(column) == 0
+        column.extend(range(10))
+    with MappedArrayList(path, mode='r+') as column:
+        column.add_back(10)
+        assert list(column) == list(range(11))
+    with pytest.raises(ValueError):
+        MappedArrayList(path, 'd')
+    with pytest.raises(ValueError):
+        MappedArrayList(path, mode='a')
+    with pytest.raises(ValueError):
+        MappedArrayList(path, 'u', mode='w+')
+    with open(path, 'wb') as file:
+        file.write(b'garbage')
+    with pytest.raises(ValueError):
+        MappedArrayList(path)
+
+
+def test_mapped_arraylist_shared(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    writer = MappedArrayList(path, 'H', mode='w+', grow_bytes=8)
+    writer.extend([1, 2])
+    writer.flush()
+    first, second = MappedArrayList(path), MappedArrayList(path)
+    assert list(first) == list(second) == [1, 2]
+    writer.extend(range(3, 100))
+    assert len(first) == 2
+    writer.flush()
+    assert first.refresh() == 99
+    assert first.tail() == 99
+    for reader in (first, second, writer):
+        reader.close()
+    assert first.closed
+
+
+def test_mapped_arraylist_readonly(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    writer = MappedArrayList(path, 'd', mode='w+', grow_bytes=1024)
+    writer.extend([2.0, 1.0])
+    writer.flush()
+    # spare capacity of the file: no resize before the write
+    reader = MappedArrayList(path)
+    for change in (lambda: reader.add_back(3.0),
+                   lambda: reader.add_front(3.0),
+                   lambda: reader.extend([3.0]),
+                   lambda: reader.__setitem__(0, 3.0),
+                   lambda: reader.pop(),
+                   lambda: reader.sort(),
+                   lambda: reader.__iadd__(1),
+                   lambda: reader.reserve(1000)):
+        with pytest.raises(TypeError, match='read-only'):
+            change()
+    assert list(reader) == [2.0, 1.0]
+    reader.close()
+    writer.close()
+
+
+def test_mapped_arraylist_views(tmp_path):
+    path = str(tmp_path / 'column.bin')
+    column = MappedArrayList(path, 'b', mode='w+', grow_bytes=4)
+    column.extend([1, 2, 3, 4])
+    view = column.memoryview()
+    with pytest.raises(BufferError):
+        column.add_back(5)
+    assert view.tolist() == [1, 2, 3, 4]
+    view.release()
+    column.add_back(5)
+    assert list(column) == [1, 2, 3, 4, 5]
+    column.close()
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from data_structures.persistent_hash_map import (
+    PersistentHashMap, build, compact
+)
+
+
+def test_persistent_hashmap(tmp_path):
+    path = str(tmp_path / 'map.bin')
+    items = ((f'key{i}', f'value{i}') for i in range(1000))
+    assert build(path, items) == 1000
+    with PersistentHashMap(path) as hm:
+        assert len(hm) == 1000
+        assert hm['key0'] == b'value0'
+        assert hm[b'key999'] == b'value999'
+        assert hm.get('missing') is None
+        assert hm.get('missing', b'default') == b'default'
+        assert 'key5' in hm
+        assert 'key1000' not in hm
+        with pytest.raises(KeyError):
+            assert hm['missing']
+        assert set(hm.keys()) == {f'key{i}'.encode() for i in range(1000)}
+        assert dict(hm.items())[b'key7'] == b'value7'
+        assert sum(1 for _ in hm.values()) == 1000
+
+
+def test_persistent_hashmap_shared(tmp_path):
+    path = str(tmp_path / 'map.bin')
+    build(path, [(b'a', b'1')])
+    first, second = PersistentHashMap(path), PersistentHashMap(path)
+    assert first['a'] == second['a'] == b'1'
+    first.close()
+    second.close()
+
+
+def test_persistent_hashmap_empty(tmp_path):
+    path = str(tmp_path / 'map.bin')
+    assert build(path, []) == 0
+    with PersistentHashMap(path) as hm:
+        assert not hm
+        assert list(hm) == []
+        assert hm.get('a') is None
+
+
+def test_persistent_hashmap_wrong_file(tmp_path):
+    path = tmp_path / 'map.bin'
+    path.write_bytes(bytes(100))
+    with pytest.raises(ValueError):
+        PersistentHashMap(str(path))
+
+
+def test_persistent_hashmap_compact(tmp_path):
+    path = str(tmp_path / 'map.bin')
+    items = [(b'a', b'1'), (b'b', b'2'), (b'a', b'3' * 1000)]
+    assert build(path, items) == 2
+    with PersistentHashMap(path) as hm:
+        assert hm['a'] == b'3' * 1000
+        assert len(hm) == 2
+    build(path, [(b'a', b'1'), (b'b', b'2')] * 100)
+    size = os.path.getsize(path)
+    assert compact(path) == 2
+    assert os.path.getsize(path) < size
+    with PersistentHashMap(path) as hm:
+        assert dict(hm.items()) == {b'a': b'1', b'b': b'2'}
+
+
+def test_persistent_hashmap_rejects_int(tmp_path):
+    path = str(tmp_path / 'map.bin')
+    with pytest.raises(TypeError):
+        build(path, [(3, b'value')])
+    assert not os.path.exists(f'{path}.tmp')
+    build(path, [(b'\x00\x00\x00', b'value')])
+    with PersistentHashMap(path) as hm:
+        with pytest.raises(TypeError):
+            hm.get(3)
+        assert hm[b'\x00\x00\x00'] == b'value'
+
+
+def test_persistent_hashmap_build_open_error(tmp_path):
+    path = str(tmp_path / 'missing' / 'map.bin')
+    with pytest.raises(FileNotFoundError) as error:
+        build(path, [(b'key', b'value')])
+    # the error of open() itself, not of removing the temp file
+    assert error.value.__context__ is None
@@ -0,0 +1,210 @@
+import io
+import os
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+from data_structures.hash_map import (
+    HashMapCollision, HashMapCompact, HashMapIncremental,
+    HashMapOpenAddressing, HashMapRobinHood, HashMapSeparateChaining
+)
+from data_structures.hashing import builtin_hash, fnv1a_hash, int_hash
+from data_structures.list import ArrayList, Deque
+from data_structures.my_queue import PriorityQueue, Queue
+from data_structures.snapshot import MAGIC, _read_frame, dump, load
+from data_structures.stack import Stack
+
+
+def roundtrip(obj, **kwargs):
+    file = io.BytesIO()
+    dump(obj, file, **kwargs)
+    file.seek(0)
+    return load(file)
+
+
+@pytest.mark.parametrize(
+    "test_class",
+    [HashMapOpenAddressing, HashMapSeparateChaining, HashMapIncremental,
+     HashMapRobinHood, HashMapCompact]
+)
+@pytest.mark.parametrize(
+    "items",
+    [[(i, i * 1.5) for i in range(1000)],
+     [(f'key{i}', i) for i in range(1000)],
+     [((i, 'tuple'), [i]) for i in range(1000)],
+     [(i, 2 ** 70 + i) for i in range(1000)],
+     []]
+)
+def test_snapshot_hash_map(test_class, items):
+    hm = test_class.from_items(items)
+    restored = roundtrip(hm, chunk_size=100)
+    assert type(restored) is test_class
+    assert len(restored) == len(hm)
+    assert sorted(restored.items(), key=repr) == sorted(hm.items(), key=repr)
+    assert all(restored[key] == value for key, value in items)
+    restored['new'] = 1
+    assert restored.pop(items[0][0] if items else 'new')
+
+
+def test_snapshot_hash_map_options():
+    hm = HashMapRobinHood(max_load=0.5, min_load=0.2, hash_func=fnv1a_hash)
+    hm.update((i, i) for i in range(100))
+    restored = roundtrip(hm)
+    assert restored.hash_func is fnv1a_hash
+    assert restored.max_load == 0.5
+    assert restored.min_load == 0.2
+    hm = HashMapIncremental(rehash_step=7, hash_func=int_hash)
+    hm.update((i, i) for i in range(100))
+    restored = roundtrip(hm)
+    assert restored.rehash_step == 7
+    assert sorted(restored.items()) == [(i, i) for i in range(100)]
+
+
+def test_snapshot_hash_map_collision():
+    hm = HashMapCollision(size=64)
+    for i in range(10):
+        hm[i] = str(i)
+    assert sorted(roundtrip(hm).items()) == sorted(hm.items())
+
+
+def test_snapshot_hash_map_compact_order():
+    hm = HashMapCompact()
+    for i in range(100):
+        hm[f'key{i}'] = i
+    for i in range(0, 100, 3):
+        hm.pop(f'key{i}')
+    restored = roundtrip(hm)
+    assert list(restored.items()) == list(hm.items())
+    assert restored.stats_report()['tombstones'] == 0
+
+
+def test_snapshot_hash_map_other_process(tmp_path):
+    path = tmp_path / 'map.snapshot'
+    script = (
+        'from data_structures.hash_map import HashMapSeparateChaining\n'
+        'from data_structures.snapshot import dump\n'
+        'hm = HashMapSeparateChaining.from_items('
+        '(f"key{i}", i) for i in range(500))\n'
+        f'dump(hm, open({str(path)!r}, "wb"))\n'
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', script], check=True,
+                   env={**os.environ, 'PYTHONHASHSEED': '1',
+                        'PYTHONPATH': root})
+    with open(path, 'rb') as file:
+        restored = load(file)
+    assert restored.hash_func is builtin_hash
+    # str hashes differ across processes, keys are hashed again
+    assert all(restored[f'key{i}'] == i for i in range(500))
+
+
+@pytest.mark.parametrize("typecode, items", [
+    ('i', range(-500, 500)),
+    ('d', [i / 3 for i in range(1000)]),
+    ('B', bytes(range(256))),
+    ('q', []),
+])
+def test_snapshot_array_list(typecode, items):
+    array_list = ArrayList(typecode, array(typecode, items))
+    restored = roundtrip(array_list, chunk_size=64)
+    assert list(restored) == list(items)
+    assert restored._data.typecode == typecode
+
+
+@pytest.mark.parametrize("test_class", [Deque, Queue, PriorityQueue])
+def test_snapshot_queues(test_class):
+    sequence = test_class([3, 1, 2], maxlength=10)
+    restored = roundtrip(sequence)
+    assert type(restored) is test_class
+    if test_class is PriorityQueue:
+        assert list(restored) == [1, 2, 3]
+    else:
+        assert list(restored) == [3, 1, 2]
+    assert restored.maxlength == 10
+    chunked = roundtrip(test_class(range(100), maxlength=100), chunk_size=7)
+    assert list(chunked) == list(range(100))
+    window = roundtrip(Deque(range(10), maxlength=3, overwrite=True))
+    assert list(window) == [7, 8, 9] and window.overwrite
+    typed = roundtrip(Queue([1.5, 2.5], typecode='d'))
+    assert list(typed) == [1.5, 2.5] and typed.typecode == 'd'
+    queue = roundtrip(PriorityQueue(['b', 'a'], revers=True))
+    assert queue.remove() == 'b'
+    queue = roundtrip(PriorityQueue(['bb', 'a', 'cc', 'd'], key=len, d=3))
+    assert list(queue) == ['a', 'd', 'bb', 'cc'] and queue.d == 3
+    words = [str(i) for i in range(200)]
+    queue = roundtrip(PriorityQueue(words, key=len), chunk_size=9)
+    assert [queue.remove() for _ in words] == words
+    with pytest.raises(TypeError):
+        dump(PriorityQueue(key=lambda item: item), io.BytesIO())
+
+
+def test_snapshot_sequences_chunked(monkeypatch):
+    # ring buffer and heap are read in slices, not copied by __iter__
+    monkeypatch.setattr(Deque, '__iter__', None)
+    monkeypatch.setattr(PriorityQueue, '__iter__', None)
+    deque = Deque(range(10))
+    deque.pop_many(6)
+    deque.extend(range(10, 16))
+    window = roundtrip(deque, chunk_size=3)
+    assert window._ordered() == list(range(6, 16))
+    words = [str(i % 7) for i in range(100)]
+    for revers in (False, True):
+        queue = PriorityQueue(words, revers=revers, d=3)
+        restored = roundtrip(queue, chunk_size=9)
+        assert restored._heap == queue._heap
+        restored.put('3')
+        queue.put('3')
+        assert [restored.remove() for _ in range(101)] == \
+            [queue.remove() for _ in range(101)]
+
+
+def test_snapshot_typed_queue():
+    queue = Queue(range(100), typecode='i')
+    for _ in range(30):
+        queue.remove()
+    file = io.BytesIO()
+    dump(queue, file, chunk_size=16)
+    file.seek(len(MAGIC))
+    _read_frame(file)
+    chunks = list(iter(lambda: _read_frame(file), None))
+    assert [len(chunk) for chunk in chunks] == [16] * 4 + [6]
+    assert all(isinstance(chunk, array) for chunk in chunks)
+    file.seek(0)
+    restored = load(file)
+    assert restored._data.typecode == 'i'
+    assert list(restored) == list(range(30, 100))
+    restored.put(100)
+    assert restored.remove() == 30
+
+
+def test_snapshot_stack():
+    stack = Stack([1, 'two', 3.0] * 1000)
+    restored = roundtrip(stack, chunk_size=7)
+    assert len(restored) == 3000
+    assert restored.pop() == 3.0
+    assert restored.pop() == 'two'
+
+
+def test_snapshot_int_hash_map():
+    np = pytest.importorskip('numpy')
+    from data_structures.int_hash_map import IntHashMap
+    int_map = IntHashMap.from_arrays(np.arange(1000) * 7,
+                                     np.arange(1000) / 2)
+    restored = roundtrip(int_map, chunk_size=100)
+    assert len(restored) == 1000
+    assert np.array_equal(restored.get_many(np.arange(1000) * 7),
+                          np.arange(1000) / 2)
+    assert restored.get(1) is None
+
+
+def test_snapshot_errors():
+    with pytest.raises(TypeError):
+        dump({}, io.BytesIO())
+    with pytest.raises(ValueError):
+        load(io.BytesIO(b'garbage!'))
+    file = io.BytesIO()
+    dump(ArrayList('i', [1, 2, 3]), file)
+    with pytest.raises((EOFError, ValueError)):
+        load(io.BytesIO(file.getvalue()[:-20]))